@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Benchmark PyHive hot paths against FakeHive and gate on regressions.
+
+Every benchmark runs against an in-process :class:`pyhive.testing.FakeHive`
+loaded with a seeded dataset, so results only depend on the client and the
+machine. Results are written as JSON and, with ``--compare``, checked against
+a baseline: a metric regresses when it is worse than the baseline by more than
+its tolerance (the baseline's per-metric ``tolerance``, else ``--tolerance``)
+plus its absolute ``slack``, if any (for metrics whose value is close to zero).
+The exit status is 1 if anything regressed.
+
+Usage:
+    python benchmarks/run.py --output results.json --compare benchmarks/baseline.json
+    python benchmarks/run.py --update-baseline        # after an intended change
+    python benchmarks/run.py --only scan_users_per_s --only get_user_by_name_ms
+
+Baselines are machine-specific; refresh ``benchmarks/baseline.json`` on the CI
+runner class that enforces it.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Literal
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+# pylint: disable=wrong-import-position
+from bench_import import measure as measure_import  # noqa: E402
+
+from pyhive.client import HiveClient  # noqa: E402
+from pyhive.testing import Dataset, FakeHive, generate_dataset  # noqa: E402
+from pyhive.types import (Assignment, AssignmentResponse, Exercise,  # noqa: E402
+                          User)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.30
+DEFAULT_REPEATS = 7
+IMPORT_RUNS = 11  # Fresh interpreters per import benchmark: the noisiest metrics
+PAGE_SIZE = 500
+
+
+class Context:
+    """Dataset and fake server shared by the benchmarks of one run."""
+
+    def __init__(self, scale: str, seed: int) -> None:
+        self.dataset: Dataset = generate_dataset(scale, seed=seed)
+        self.fake: FakeHive = self.dataset.to_fake_hive(page_size=PAGE_SIZE)
+
+    def client(self, **kwargs: Any) -> HiveClient:
+        return self.fake.client(**kwargs)
+
+
+Benchmark = Callable[[Context, int], float]
+BENCHMARKS: dict[str, tuple[Benchmark, str, Literal["higher", "lower"]]] = {}
+
+
+def benchmark(name: str, unit: str, better: Literal["higher", "lower"]):
+    """Register a benchmark returning one value in ``unit``."""
+
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = (func, unit, better)
+        return func
+
+    return register
+
+
+def median_seconds(func: Callable[[], Any], repeats: int) -> float:
+    """Median time of ``repeats`` runs of ``func``, so one disturbed run does not count."""
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return statistics.median(times)
+
+
+@benchmark("import_pyhive_ms", "ms", "lower")
+def bench_import_pyhive(_: Context, repeats: int) -> float:
+    return measure_import("import pyhive", max(repeats, IMPORT_RUNS))
+
+
+@benchmark("import_hive_client_ms", "ms", "lower")
+def bench_import_client(_: Context, repeats: int) -> float:
+    return measure_import("from pyhive import HiveClient", max(repeats, IMPORT_RUNS))
+
+
+@benchmark("client_construction_ms", "ms", "lower")
+def bench_client_construction(ctx: Context, repeats: int) -> float:
+    return median_seconds(ctx.client, repeats * 5) * 1000
+
+
+@benchmark("scan_assignments_per_s", "items/s", "higher")
+def bench_scan_assignments(ctx: Context, repeats: int) -> float:
+    client = ctx.client()
+    count = ctx.fake.count("assignments")
+    return count / median_seconds(lambda: sum(1 for _ in client.get_assignments()), repeats)
+
+
+@benchmark("scan_users_per_s", "items/s", "higher")
+def bench_scan_users(ctx: Context, repeats: int) -> float:
+    client = ctx.client()
+    count = ctx.fake.count("users")
+    return count / median_seconds(lambda: sum(1 for _ in client.get_users()), repeats)
+
+
+def _parse_rate(
+    ctx: Context,
+    repeats: int,
+    parse: Callable[[HiveClient, dict[str, Any]], Any],
+    records: list[dict[str, Any]],
+) -> float:
+    client = ctx.client(lazy=True)
+    return len(records) / median_seconds(lambda: [parse(client, r) for r in records], repeats)
+
+
+@benchmark("parse_user_per_s", "items/s", "higher")
+def bench_parse_user(ctx: Context, repeats: int) -> float:
+    return _parse_rate(
+        ctx, repeats, lambda c, r: User.from_dict(r, hive_client=c), ctx.fake.records("users")
+    )
+
+
+@benchmark("parse_exercise_per_s", "items/s", "higher")
+def bench_parse_exercise(ctx: Context, repeats: int) -> float:
+    return _parse_rate(
+        ctx, repeats, lambda c, r: Exercise.from_dict(r, hive_client=c),
+        ctx.fake.records("exercises"),
+    )
+
+
+@benchmark("parse_assignment_per_s", "items/s", "higher")
+def bench_parse_assignment(ctx: Context, repeats: int) -> float:
+    return _parse_rate(
+        ctx, repeats, lambda c, r: Assignment.from_dict(r, hive_client=c),
+        ctx.fake.records("assignments"),
+    )
+
+
+@benchmark("parse_assignment_response_per_s", "items/s", "higher")
+def bench_parse_assignment_response(ctx: Context, repeats: int) -> float:
+    records = [
+        r for rows in ctx.dataset.nested["assignment_responses"].values() for r in rows
+    ][:20000]
+    return _parse_rate(
+        ctx, repeats,
+        lambda c, r: AssignmentResponse.from_dict(r, assignment_id=1, hive_client=c),
+        records,
+    )
+
+
+@benchmark("get_user_by_name_ms", "ms", "lower")
+def bench_get_user_by_name(ctx: Context, repeats: int) -> float:
+    client = ctx.client()
+    step = max(1, ctx.fake.count("users") // 10)
+    names = [u["display_name"] for u in ctx.fake.records("users")[::step]]
+    return statistics.median(
+        median_seconds(lambda n=name: client.get_user_by_name(n), repeats) for name in names
+    ) * 1000
+
+
+@benchmark("course_tree_walk_ms", "ms", "lower")
+def bench_course_tree_walk(ctx: Context, repeats: int) -> float:
+    client = ctx.client()
+
+    def walk() -> int:
+        return sum(
+            1
+            for program in client.get_programs()
+            for subject in program
+            for module in subject
+            for _ in module
+        )
+
+    return median_seconds(walk, repeats) * 1000
+
+
+@benchmark("peak_memory_scan_assignments_mb", "MB", "lower")
+def bench_peak_memory(ctx: Context, repeats: int) -> float:
+    del repeats  # Deterministic enough to measure once.
+    client = ctx.client()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in client.get_assignments():
+            pass
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run(names: list[str], scale: str, seed: int, repeats: int) -> dict[str, Any]:
+    ctx = Context(scale, seed)
+    results = {}
+    for name in names:
+        func, unit, better = BENCHMARKS[name]
+        value = func(ctx, repeats)
+        results[name] = {"value": round(value, 3), "unit": unit, "better": better}
+        print(f"{name:36s} {value:14.2f} {unit}", file=sys.stderr)
+    return {
+        "metadata": {
+            "scale": scale,
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "counts": ctx.dataset.counts(),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return a message per metric that regressed beyond its tolerance."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        delta = result["value"] - base["value"]
+        worse = -delta if result["better"] == "higher" else delta
+        allowed = base.get("tolerance", tolerance) * abs(base["value"]) + base.get("slack", 0.0)
+        status = "REGRESSED" if worse > allowed else "ok"
+        print(
+            f"{status:9s} {name:36s} {base['value']:12.2f} -> {result['value']:12.2f} "
+            f"{result['unit']} ({delta:+.2f}, allowed {allowed:.2f})",
+            file=sys.stderr,
+        )
+        if worse > allowed:
+            regressions.append(f"{name}: {delta:+.2f} {result['unit']} (allowed {allowed:.2f})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS))
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to gate against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"write results to {DEFAULT_BASELINE.relative_to(ROOT)}")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    if baseline is not None and baseline["metadata"]["scale"] != args.scale:
+        parser.error(f"baseline was recorded at scale {baseline['metadata']['scale']!r}")
+
+    results = run(args.only or list(BENCHMARKS), args.scale, args.seed, args.repeats)
+    if args.update_baseline:
+        if DEFAULT_BASELINE.exists():
+            # Keep hand-tuned tolerances of the previous baseline.
+            previous = json.loads(DEFAULT_BASELINE.read_text())["results"]
+            for name, result in results["results"].items():
+                for key in ("tolerance", "slack"):
+                    if key in previous.get(name, {}):
+                        result[key] = previous[name][key]
+        DEFAULT_BASELINE.write_text(json.dumps(results, indent=2) + "\n")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Performance regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,30 @@
 
 Expose the public convenience symbol `HiveClient` at package level so users
 can do `from pyhive import HiveClient`.
+
+The client (and with it ``httpx`` and every model) is imported on first
+attribute access, so ``import pyhive`` itself stays cheap.
 """
 
 from __future__ import annotations
 
-# Import the implementation from the `pyhive` package (implementation
-# lives there) and expose the client at package level.
-from pyhive.client import HiveClient  # re-export
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pyhive.client import HiveClient
 
 __all__ = ["HiveClient"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "HiveClient":
+        # Import the implementation lazily and cache it on the package.
+        from pyhive.client import HiveClient  # pylint: disable=import-outside-toplevel
+
+        globals()["HiveClient"] = HiveClient
+        return HiveClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,59 @@
+"""Options and helpers shared by the CLI commands that talk to a Hive server."""
+
+import sys
+import time
+from typing import Annotated
+
+import typer
+
+from pyhive.client import HiveClient
+
+HiveUrlOption = Annotated[
+    str, typer.Option("--hive-url", envvar="HIVE_URL", help="Base URL of the Hive server.")
+]
+UsernameOption = Annotated[
+    str, typer.Option("--username", "-u", envvar="HIVE_USERNAME", help="Hive username.")
+]
+PasswordOption = Annotated[
+    str,
+    typer.Option(
+        "--password", envvar="HIVE_PASSWORD", prompt=True, hide_input=True, help="Hive password."
+    ),
+]
+
+
+def connect(hive_url: str, username: str, password: str) -> HiveClient:
+    """Return a client logged in to ``hive_url``."""
+    return HiveClient(username, password, hive_url)
+
+
+class Progress:
+    """Single-line progress with throughput and ETA, written to stderr."""
+
+    def __init__(self, total: int | None, unit: str, done: int = 0) -> None:
+        self.total = total
+        self.unit = unit
+        self.done = done
+        self._initial = done
+        self._start = time.monotonic()
+
+    def update(self, count: int) -> None:
+        """Count ``count`` more finished items and redraw the line."""
+        self.done += count
+        elapsed = time.monotonic() - self._start
+        rate = (self.done - self._initial) / elapsed if elapsed else 0.0
+        line = f"{self.done}"
+        if self.total:
+            line += f"/{self.total}"
+        line += f" {self.unit}, {rate:.1f}/s"
+        if self.total and rate:
+            line += f", ETA {max(self.total - self.done, 0) / rate:.0f}s"
+        if sys.stderr.isatty():
+            typer.echo(f"\r{line}\033[K", err=True, nl=False)
+        else:
+            typer.echo(line, err=True)
+
+    def finish(self) -> None:
+        """End the progress line."""
+        if sys.stderr.isatty():
+            typer.echo(err=True)
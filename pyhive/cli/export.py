@@ -0,0 +1,311 @@
+"""``pyhive export``: stream a list endpoint to an NDJSON or CSV file.
+
+Pages are requested by offset, ``concurrency`` at a time, and written in order
+as soon as they arrive, so memory use is bounded by the pages in flight. Each
+page is written as one block (a separate gzip member when compressing), and
+after each block a checkpoint records the next offset and the file size, so an
+interrupted export resumes by truncating the file to the last complete block.
+
+Pages are ordered by id unless an ``ordering`` filter says otherwise, so every
+page request sees the records in the same order. Offsets still shift when
+records are added or deleted during an export; export from a quiet server, or
+filter on fields that do not change.
+"""
+
+import csv
+import enum
+import gzip
+import io
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Annotated, Any, Optional, Union
+
+import httpx
+import typer
+
+from pyhive.client import HiveClient
+from pyhive.src import json_backend
+
+from . import common
+
+CHECKPOINT_VERSION = 1
+DEFAULT_ORDERING = "id"
+
+
+class IncompletePageError(RuntimeError):
+    """Raised when a page holds fewer or more records than its offset and the total imply."""
+
+
+class Resource(str, enum.Enum):
+    """Exportable list endpoints."""
+
+    ASSIGNMENTS = "assignments"
+    USERS = "users"
+    HELP = "help"
+    EXERCISES = "exercises"
+
+
+class Format(str, enum.Enum):
+    """Output formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+ENDPOINTS = {
+    Resource.ASSIGNMENTS: "/api/core/assignments/",
+    Resource.USERS: "/api/core/management/users/",
+    Resource.HELP: "/api/core/help/",
+    Resource.EXERCISES: "/api/core/course/exercises/",
+}
+
+
+def parse_filters(filters: list[str]) -> dict[str, str]:
+    """Turn ``key=value`` strings into query parameters."""
+    params = {}
+    for item in filters:
+        key, sep, value = item.partition("=")
+        if not sep or not key:
+            raise typer.BadParameter(f"Expected key=value, got {item!r}", param_hint="--filter")
+        params[key.strip()] = value.strip()
+    return params
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json_backend.dumps(value).decode("UTF-8")
+    return value
+
+
+class PageEncoder:
+    """Encode pages of records as NDJSON or CSV bytes."""
+
+    def __init__(self, fmt: Format, columns: Optional[list[str]] = None) -> None:
+        self.format = fmt
+        self.columns = columns
+
+    def header(self, first_record: dict[str, Any]) -> bytes:
+        """Bytes that start the file; fixes the CSV columns to ``first_record``'s keys."""
+        if self.format is not Format.CSV:
+            return b""
+        self.columns = list(first_record)
+        return self._csv_rows([self.columns])
+
+    def encode(self, records: list[dict[str, Any]]) -> bytes:
+        """Bytes of one page of records."""
+        if self.format is Format.NDJSON:
+            return b"".join(json_backend.dumps(record) + b"\n" for record in records)
+        assert self.columns is not None
+        return self._csv_rows(
+            [[_csv_value(record.get(column)) for column in self.columns] for record in records]
+        )
+
+    @staticmethod
+    def _csv_rows(rows: list[list[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("UTF-8")
+
+
+class Checkpoint:
+    """Progress of an export, saved as JSON next to the output."""
+
+    def __init__(self, path: Path, key: dict[str, Any]) -> None:
+        self.path = path
+        self.key = key
+        self.offset = 0
+        self.size = 0
+        self.columns: Optional[list[str]] = None
+
+    def load(self) -> bool:
+        """Restore saved progress; ``False`` if there is none for this export."""
+        if not self.path.exists():
+            return False
+        state = json_backend.loads(self.path.read_bytes())
+        if state.get("version") != CHECKPOINT_VERSION or state["key"] != self.key:
+            raise typer.BadParameter(
+                f"{self.path} belongs to a different export", param_hint="--checkpoint"
+            )
+        self.offset, self.size, self.columns = state["offset"], state["size"], state["columns"]
+        return True
+
+    def save(self) -> None:
+        """Write the current progress (atomically)."""
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "key": self.key,
+            "offset": self.offset,
+            "size": self.size,
+            "columns": self.columns,
+        }
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(json_backend.dumps(state))
+        tmp.replace(self.path)
+
+
+def fetch_page(
+    client: HiveClient, endpoint: str, params: dict[str, str], offset: int, limit: int
+) -> Union[dict[str, Any], list[Any]]:
+    """Return the raw JSON of the page at ``offset``, by id unless ``params`` say otherwise."""
+    query = httpx.QueryParams(
+        {"ordering": DEFAULT_ORDERING, **params, "limit": limit, "offset": offset}
+    )
+    return client.get(endpoint, params=query)
+
+
+def iter_pages(
+    client: HiveClient,
+    endpoint: str,
+    params: dict[str, str],
+    *,
+    start: int,
+    page_size: int,
+    concurrency: int,
+) -> Iterator[tuple[int, int, list[dict[str, Any]]]]:
+    """Yield ``(offset, total count, records)`` per page, in order, from ``start``.
+
+    The first page tells the total count; the following pages are fetched
+    ``concurrency`` at a time. An unpaginated response is yielded as one page.
+    Raises :class:`IncompletePageError` when a page does not hold the records
+    up to the next offset, e.g. because the server caps ``limit``.
+    """
+    first = fetch_page(client, endpoint, params, start, page_size)
+    if not isinstance(first, dict):
+        yield start, len(first), first
+        return
+    total = first["count"]
+
+    def checked(offset: int, page: dict[str, Any]) -> tuple[int, int, list[dict[str, Any]]]:
+        records = page["results"]
+        expected = max(min(page_size, total - offset), 0)
+        if len(records) != expected:
+            raise IncompletePageError(
+                f"Expected {expected} records at offset {offset} but got {len(records)}; "
+                "the server may cap the page size, try a smaller --page-size"
+            )
+        return offset, total, records
+
+    yield checked(start, first)
+    offsets = iter(range(start + page_size, total, page_size))
+    with ThreadPoolExecutor(concurrency, thread_name_prefix="pyhive-export") as pool:
+        in_flight: list[tuple[int, Future[Any]]] = []
+        for offset in offsets:
+            in_flight.append(
+                (offset, pool.submit(fetch_page, client, endpoint, params, offset, page_size))
+            )
+            if len(in_flight) >= concurrency:
+                offset, future = in_flight.pop(0)
+                yield checked(offset, future.result())
+        for offset, future in in_flight:
+            yield checked(offset, future.result())
+
+
+def export(  # pylint: disable=too-many-arguments,too-many-locals
+    client: HiveClient,
+    resource: Resource,
+    out: Path,
+    *,
+    params: dict[str, str],
+    fmt: Format,
+    compress: bool,
+    page_size: int,
+    concurrency: int,
+    checkpoint_path: Optional[Path],
+) -> int:
+    """Export ``resource`` to ``out``; return the number of records written."""
+    endpoint = ENDPOINTS[resource]
+    params = {"ordering": DEFAULT_ORDERING, **params}
+    key = {
+        "endpoint": endpoint,
+        "params": params,
+        "format": fmt.value,
+        "gzip": compress,
+        "page_size": page_size,
+    }
+    checkpoint = Checkpoint(checkpoint_path, key) if checkpoint_path is not None else None
+    resumed = checkpoint is not None and checkpoint.load() and out.exists()
+    encoder = PageEncoder(fmt, checkpoint.columns if resumed and checkpoint else None)
+    start = checkpoint.offset if resumed and checkpoint else 0
+    written = 0
+    progress: Optional[common.Progress] = None
+    with out.open("r+b" if resumed else "wb") as file:
+        if resumed and checkpoint:
+            file.truncate(checkpoint.size)  # Drop a block cut short by the interruption.
+            file.seek(checkpoint.size)
+        for offset, total, records in iter_pages(
+            client, endpoint, params, start=start, page_size=page_size, concurrency=concurrency
+        ):
+            if progress is None:
+                progress = common.Progress(total, "records", done=start)
+            block = b""
+            if not resumed and offset == 0 and records:
+                block = encoder.header(records[0])
+            block += encoder.encode(records)
+            file.write(gzip.compress(block) if compress else block)
+            file.flush()
+            written += len(records)
+            progress.update(len(records))
+            if checkpoint is not None:
+                checkpoint.offset = offset + page_size
+                checkpoint.size = file.tell()
+                checkpoint.columns = encoder.columns
+                checkpoint.save()
+    if progress is not None:
+        progress.finish()
+    if checkpoint is not None:
+        checkpoint.path.unlink(missing_ok=True)
+    return written
+
+
+def export_command(  # pylint: disable=too-many-arguments
+    resource: Annotated[Resource, typer.Argument(help="What to export.")],
+    hive_url: common.HiveUrlOption,
+    username: common.UsernameOption,
+    password: common.PasswordOption,
+    out: Annotated[Path, typer.Option("--out", "-o", dir_okay=False, help="Output file.")],
+    filters: Annotated[
+        Optional[list[str]],
+        typer.Option("--filter", "-f", help="Query filter as key=value, e.g. exercise__id=3."),
+    ] = None,
+    fmt: Annotated[
+        Optional[Format],
+        typer.Option("--format", help="Output format (default: from the file name, else ndjson)."),
+    ] = None,
+    compress: Annotated[
+        Optional[bool], typer.Option("--gzip/--no-gzip", help="Compress (default: if .gz).")
+    ] = None,
+    page_size: Annotated[int, typer.Option(min=1, help="Records per request.")] = 500,
+    concurrency: Annotated[int, typer.Option(min=1, help="Pages fetched in parallel.")] = 4,
+    checkpoint: Annotated[
+        Optional[Path],
+        typer.Option(help="Checkpoint file; rerun with it to resume (default: <out>.checkpoint)."),
+    ] = None,
+    resumable: Annotated[bool, typer.Option(help="Write a checkpoint after each page.")] = True,
+) -> None:
+    """Export assignments, users, help requests or exercises to NDJSON or CSV."""
+    suffixes = out.suffixes
+    if compress is None:
+        compress = bool(suffixes) and suffixes[-1] == ".gz"
+    if fmt is None:
+        plain = [s for s in suffixes if s != ".gz"]
+        fmt = Format.CSV if plain and plain[-1] == ".csv" else Format.NDJSON
+    if checkpoint is None and resumable:
+        checkpoint = out.with_name(out.name + ".checkpoint")
+    client = common.connect(hive_url, username, password)
+    try:
+        count = export(
+            client,
+            resource,
+            out,
+            params=parse_filters(filters or []),
+            fmt=fmt,
+            compress=compress,
+            page_size=page_size,
+            concurrency=concurrency,
+            checkpoint_path=checkpoint if resumable else None,
+        )
+    except IncompletePageError as exc:
+        typer.echo(f"Export of {resource.value} stopped: {exc}", err=True)
+        raise typer.Exit(1) from exc
+    typer.echo(f"Exported {count} {resource.value} to {out}")
@@ -4,7 +4,12 @@ import typer
 
 from pyhive.src._generated_versions import SUPPORTED_API_VERSIONS
 
+from .export import export_command
+from .users import users_app
+
 app = typer.Typer(help="PyHive CLI")
+app.add_typer(users_app, name="users")
+app.command("export")(export_command)
 
 
 @app.command()
@@ -0,0 +1,259 @@
+"""``pyhive users`` commands."""
+
+import csv
+import functools
+import json
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Annotated, Any, Optional
+
+import typer
+
+from pyhive.client import HiveClient
+from pyhive.client.bulk import BulkJournal
+from pyhive.src.types.enums.clearance_enum import ClearanceEnum
+from pyhive.src.types.enums.gender_enum import GenderEnum
+from pyhive.src.types.enums.status_enum import StatusEnum
+
+from . import common
+
+users_app = typer.Typer(help="Manage users.")
+
+RESULT_COLUMNS = ("row", "status", "username", "user_id", "error")
+_LIST_SEPARATOR = ";"
+
+
+def read_rows(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the rows of a CSV file, or the objects of a JSON-lines file."""
+    with path.open(encoding="utf-8-sig", newline="") as file:
+        if path.suffix in (".jsonl", ".ndjson"):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def count_rows(path: Path) -> int:
+    """Number of rows :func:`read_rows` yields, counted without keeping them."""
+    return sum(1 for _ in read_rows(path))
+
+
+def _parse_enum(enum: Any, value: Any) -> Any:
+    """Accept an enum member's value or (case-insensitive) name."""
+    try:
+        return enum(int(value) if isinstance(value, str) and value.isdigit() else value)
+    except ValueError:
+        pass
+    try:
+        return enum[str(value).strip().upper().replace(" ", "_")]
+    except KeyError:
+        raise ValueError(f"Unknown {enum.__name__} {value!r}") from None
+
+
+def _names(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return [name.strip() for name in str(value).split(_LIST_SEPARATOR) if name.strip()]
+
+
+class NameResolver:
+    """Resolve program, class, mentor and queue names to ids.
+
+    Each kind is listed once, on first use, into an index; numeric values are
+    taken to be ids already.
+    """
+
+    def __init__(self, client: HiveClient) -> None:
+        self.client = client
+
+    @staticmethod
+    def _unique(index: dict[Any, set[int]], key: Any, what: str) -> int:
+        ids = index.get(key)
+        if not ids:
+            raise ValueError(f"Unknown {what}")
+        if len(ids) > 1:
+            raise ValueError(f"Ambiguous {what} (ids {sorted(ids)})")
+        return next(iter(ids))
+
+    @staticmethod
+    def _index(pairs: Iterable[tuple[Any, int]]) -> dict[Any, set[int]]:
+        index: dict[Any, set[int]] = {}
+        for key, item_id in pairs:
+            index.setdefault(key, set()).add(item_id)
+        return index
+
+    @functools.cached_property
+    def _programs(self) -> dict[Any, set[int]]:
+        return self._index((p.name, p.id) for p in self.client.get_programs())
+
+    @functools.cached_property
+    def _classes(self) -> dict[Any, set[int]]:
+        return self._index(
+            pair
+            for c in self.client.get_classes()
+            for pair in (((c.program_id, c.name), c.id), ((None, c.name), c.id))
+        )
+
+    @functools.cached_property
+    def _users(self) -> dict[Any, set[int]]:
+        return self._index(
+            pair
+            for u in self.client.get_users()
+            for pair in ((u.username, u.id), (u.display_name, u.id))
+        )
+
+    @functools.cached_property
+    def _queues(self) -> dict[Any, set[int]]:
+        return self._index((q.name, q.id) for q in self.client.get_queues())
+
+    def program(self, name: Any) -> int:
+        """Id of the program called ``name``."""
+        if str(name).isdigit():
+            return int(name)
+        return self._unique(self._programs, name, f"program {name!r}")
+
+    def classes(self, names: Any, program_id: Optional[int] = None) -> list[int]:
+        """Ids of the ``;``-separated class names, preferring classes of ``program_id``."""
+        ids = []
+        for name in _names(names):
+            if name.isdigit():
+                ids.append(int(name))
+            elif program_id is not None and (program_id, name) in self._classes:
+                ids.append(self._unique(self._classes, (program_id, name), f"class {name!r}"))
+            else:
+                ids.append(self._unique(self._classes, (None, name), f"class {name!r}"))
+        return ids
+
+    def user(self, name: Any) -> int:
+        """Id of the user whose username or display name is ``name``."""
+        if str(name).isdigit():
+            return int(name)
+        return self._unique(self._users, name, f"user {name!r}")
+
+    def queue(self, name: Any) -> int:
+        """Id of the queue called ``name``."""
+        if str(name).isdigit():
+            return int(name)
+        return self._unique(self._queues, name, f"queue {name!r}")
+
+
+def row_to_record(row: Any, resolver: NameResolver) -> dict[str, Any]:
+    """Turn an input row into ``create_user`` keyword arguments.
+
+    Raises ``ValueError`` for malformed rows and missing or unknown values.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Expected a JSON object")
+    if None in row:  # Where csv.DictReader puts fields beyond the header
+        raise ValueError("More fields than the header has columns")
+    row = {key.strip(): value for key, value in row.items() if value not in (None, "")}
+    for column in ("username", "password", "gender"):
+        if column not in row:
+            raise ValueError(f"Missing {column!r}")
+    record: dict[str, Any] = {
+        "username": str(row["username"]),
+        "password": str(row["password"]),
+        "gender": _parse_enum(GenderEnum, row["gender"]),
+        "clearance": _parse_enum(ClearanceEnum, row.get("clearance", ClearanceEnum.HANICH)),
+    }
+    for column in ("first_name", "last_name", "hostname", "checkers_brief"):
+        if column in row:
+            record[column] = str(row[column])
+    if "number" in row:
+        record["number"] = int(row["number"])
+    if "status" in row:
+        record["status"] = _parse_enum(StatusEnum, row["status"])
+    if "program" in row:
+        record["program"] = resolver.program(row["program"])
+    if "classes" in row:
+        record["classes"] = resolver.classes(row["classes"], record.get("program"))
+    if "mentor" in row:
+        record["mentor"] = resolver.user(row["mentor"])
+    if "queue" in row:
+        record["queue"] = resolver.queue(row["queue"])
+    return record
+
+
+@users_app.command("import")
+def import_users(  # pylint: disable=too-many-arguments,too-many-locals
+    path: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="CSV or JSONL file.")],
+    hive_url: common.HiveUrlOption,
+    username: common.UsernameOption,
+    password: common.PasswordOption,
+    concurrency: Annotated[int, typer.Option(min=1, help="Parallel requests.")] = 8,
+    rate_limit: Annotated[
+        Optional[float], typer.Option(min=0.001, help="Maximum users created per second.")
+    ] = None,
+    results: Annotated[
+        Optional[Path], typer.Option(help="Results CSV (default: <input>.results.csv).")
+    ] = None,
+    journal: Annotated[
+        Optional[Path], typer.Option(help="Journal file; rerun with it to resume.")
+    ] = None,
+) -> None:
+    """Create the users listed in a CSV or JSON-lines file.
+
+    Columns: username, password, gender, and optionally clearance (default
+    HANICH), number, first_name, last_name, status, hostname, checkers_brief,
+    program, classes (";"-separated), mentor and queue. Programs, classes,
+    queues and mentors may be given by name or id.
+    """
+    client = common.connect(hive_url, username, password)
+    resolver = NameResolver(client)
+    results_path = results or path.with_name(path.stem + ".results.csv")
+    progress = common.Progress(count_rows(path), "rows")
+    counts: Counter[str] = Counter()
+    row_numbers: list[int] = []  # Input row of each record sent, by record index
+    invalid: deque[list[Any]] = deque()  # Result lines of invalid rows not written yet
+
+    def records() -> Iterator[dict[str, Any]]:
+        for row_number, row in enumerate(read_rows(path), start=1):
+            try:
+                record = row_to_record(row, resolver)
+            except Exception as exc:  # pylint: disable=broad-except
+                counts["invalid"] += 1
+                name = row.get("username", "") if isinstance(row, dict) else ""
+                invalid.append([row_number, "invalid", name, "", exc])
+            else:
+                row_numbers.append(row_number)
+                yield record
+
+    journal_context = BulkJournal(journal) if journal is not None else nullcontext()
+    with (
+        results_path.open("w", newline="", encoding="utf-8") as out,
+        journal_context as journal_file,
+    ):
+        writer = csv.writer(out)
+        writer.writerow(RESULT_COLUMNS)
+
+        def write(line: list[Any]) -> None:
+            writer.writerow(line)
+            out.flush()
+            progress.update(1)
+
+        for result in client.iter_bulk_create_users(
+            records(), concurrency=concurrency, rate_limit=rate_limit, journal=journal_file
+        ):
+            row_number = row_numbers[result.index]
+            while invalid and invalid[0][0] < row_number:  # Keep the input order
+                write(invalid.popleft())
+            counts[result.status] += 1
+            write(
+                [
+                    row_number,
+                    result.status,
+                    result.username,
+                    "" if result.user_id is None else result.user_id,
+                    "" if result.error is None else result.error,
+                ]
+            )
+        while invalid:
+            write(invalid.popleft())
+    progress.finish()
+    summary = ", ".join(f"{counts[s]} {s}" for s in ("created", "skipped", "invalid", "failed"))
+    typer.echo(f"{summary}; results in {results_path}")
+    if counts["invalid"] or counts["failed"]:
+        raise typer.Exit(1)
@@ -1,27 +1,48 @@
 """High-level Hive API client aggregator."""
 
+import contextlib
+import os
+import threading
+from collections.abc import Callable, Iterator
 from types import TracebackType
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Literal, Optional, Union
+
+import httpx
 
 from ..src.api_versions import (LATEST_API_VERSION, MIN_API_VERSION,
                                 SUPPORTED_API_VERSIONS)
+from ..src.tracing import Tracer
+from ..src.types.core_item import change_listener
 from .assignment_responses import AssignmentResponsesClientMixin
 from .assignments import AssignmentClientMixin
+from .budget import RequestBudget
 from .classes import ClassesClientMixin
 from .exercises import ExerciseClientMixin
+from .explain import ExplainReport, ExplainTransport
 from .fields import FieldsClientMixin
 from .help import HelpClientMixin
 from .modules import ModuleClientMixin
+from .n_plus_one import DEFAULT_N_PLUS_ONE_THRESHOLD, NPlusOneDetector
 from .programs import ProgramClientMixin
 from .queues import QueuesClientMixin
+from .reference_cache import ReferenceCache
+from .snapshot import load_snapshot, read_snapshot_header, save_snapshot
 from .subjects import SubjectClientMixin
 from .users import UserClientMixin
 from .version import VersionClientMixin
+from .version_cache import VersionCache
 
 if TYPE_CHECKING:
     from httpx import Timeout
     from httpx._types import ProxyTypes
 
+    # Imported where used, to keep them out of the import time of the client.
+    from .cassette import Cassette
+    from .faults import FaultInjectionTransport, FaultReport
+    from .unit_of_work import UnitOfWork
+
+DEFAULT_SNAPSHOT_CACHE_SOFT_TTL = 300.0
+
 
 class HiveClient(  # pylint: disable=too-many-ancestors,abstract-method
     ProgramClientMixin,
@@ -39,26 +60,65 @@ class HiveClient(  # pylint: disable=too-many-ancestors,abstract-method
 ):
     """Aggregated HTTP client for accessing Hive API resources."""
 
-    def __init__(
+    _trace_public_methods = False
+    _version_verified: bool = False
+    _version_check_owner: Optional[int] = None
+    _version_cache: Optional[VersionCache] = None
+
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         *args,
         skip_version_check: bool = False,
+        lazy: bool = False,
+        version_cache_ttl: Optional[float] = None,
+        version_cache_path: Optional[Union[str, "os.PathLike[str]"]] = None,
         timeout: Optional[Union["Timeout", float]] = None,
         headers: Optional[dict[str, str]] = None,
         verify: Optional[Union[bool, str]] = None,
         proxy: Optional["ProxyTypes"] = None,
+        cache_soft_ttl: Optional[float] = None,
+        cache_hard_ttl: Optional[float] = None,
+        stream_list_pages: bool = False,
         **kwargs,
     ):
+        """Create and authenticate a Hive client.
+
+        ``cache_soft_ttl``/``cache_hard_ttl`` (seconds) enable the
+        stale-while-revalidate cache for ``get_programs``, ``get_subjects``,
+        ``get_modules``, ``get_exercises``, ``get_users``, ``get_classes`` and
+        ``get_queues``: entries older than the soft TTL are served immediately
+        and refreshed in the background, and only entries older than the hard
+        TTL (if given) block on a reload.
+
+        With ``lazy`` the login and the API version check are postponed until
+        the first request, so construction performs no network I/O.
+
+        ``version_cache_ttl`` (seconds) remembers a verified server version per
+        base URL on disk (``version_cache_path``, by default
+        ``~/.cache/pyhive/versions.json``) and skips the version request while
+        the entry is fresh.
+
+        With ``stream_list_pages`` list responses are parsed incrementally, so
+        memory use is bounded by a single item instead of a whole page.
+        """
+        if cache_soft_ttl is not None:
+            self._reference_cache = ReferenceCache(cache_soft_ttl, cache_hard_ttl)
+        if version_cache_ttl is not None:
+            self._version_cache = VersionCache(version_cache_ttl, version_cache_path)
+        self._version_check_lock = threading.Lock()
+        self._stream_list_pages = stream_list_pages
+        self._version_verified = skip_version_check
         super().__init__(
             *args,
             timeout=timeout,
             headers=headers,
             verify=verify,
             proxy=proxy,
+            lazy_login=lazy,
             **kwargs,
         )
-        if not skip_version_check:
-            self._api_version_check()
+        if not lazy:
+            self._ensure_ready()
 
     def __repr__(self) -> str:
         """Return a short representation including username and hive_url.
@@ -91,6 +151,285 @@ class HiveClient(  # pylint: disable=too-many-ancestors,abstract-method
 
         self._session.__exit__(type_, value, traceback)
 
+    def clear_reference_cache(self) -> None:
+        """Drop every cached reference-data listing."""
+        if self._reference_cache is not None:
+            self._reference_cache.invalidate()
+
+    @contextlib.contextmanager
+    def budget(
+        self,
+        max_requests: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+    ) -> Iterator[RequestBudget]:
+        """Fail an operation that issues too many requests or takes too long.
+
+        Every request sent within the block counts, including logins, token
+        refreshes and retries. The request that would exceed ``max_requests``
+        raises ``BudgetExceededError`` instead of being sent; ``max_seconds`` is
+        checked before each request and when the block ends::
+
+            with client.budget(max_requests=20, max_seconds=5) as budget:
+                report = build_report(client)
+            print(budget.requests, "requests")
+        """
+        budget = RequestBudget(max_requests, max_seconds)
+        self.add_request_observer(budget)
+        try:
+            yield budget
+        finally:
+            self.remove_request_observer(budget)
+        budget.check()
+
+    @contextlib.contextmanager
+    def _intercept(
+        self, wrap: Callable[[httpx.BaseTransport], httpx.BaseTransport]
+    ) -> Iterator[None]:
+        """Send every request of the session through ``wrap(transport)``.
+
+        httpx uses a mounted transport instead of the default one when a mount
+        matches the URL, as proxies given with ``proxy=`` or taken from the
+        environment are; so the mounted transports are wrapped as well.
+        """
+        session = self._session
+        # pylint: disable=protected-access
+        transport, mounts = session._transport, session._mounts
+        session._transport = wrap(transport)
+        session._mounts = {
+            pattern: None if mounted is None else wrap(mounted)
+            for pattern, mounted in mounts.items()
+        }
+        try:
+            yield
+        finally:
+            session._transport, session._mounts = transport, mounts
+
+    @contextlib.contextmanager
+    def explain(self) -> Iterator[ExplainReport]:
+        """Record the requests issued within the block without executing writes.
+
+        Reads are sent as usual so the operation can walk the data it needs;
+        POST/PUT/PATCH/DELETE requests are recorded and answered with a
+        synthesized response built from their body (see ``explain.py``), and
+        leave the reference cache alone. The session is shared, so other
+        threads using this client during the block are recorded too::
+
+            with client.explain() as report:
+                client.get_user_by_name("alice")
+            print(report)
+        """
+        report = ExplainReport()
+        explaining, self._explaining = self._explaining, True
+        try:
+            with self._intercept(lambda inner: ExplainTransport(inner, report)):
+                yield report
+        finally:
+            self._explaining = explaining
+
+    @contextlib.contextmanager
+    def inject_faults(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        status_rates: Optional[dict[int, float]] = None,
+        expired_token_rate: float = 0.0,
+        reset_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_seconds: float = 1.0,
+        seed: Optional[int] = None,
+    ) -> Iterator["FaultReport"]:
+        """Inject server errors, expired tokens, resets and slow responses.
+
+        Within the block a share of requests fails as configured (see
+        ``FaultInjectionTransport``); the yielded report tells how many retries
+        and token refreshes that caused and how much latency they added::
+
+            with client.inject_faults(status_rates={502: 0.1}, seed=1) as report:
+                list(client.get_assignments())
+            print(report)
+        """
+        # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+        from .faults import FaultInjectionTransport, FaultReport
+
+        report = FaultReport()
+        first: Optional[FaultInjectionTransport] = None
+
+        def wrap(inner: httpx.BaseTransport) -> FaultInjectionTransport:
+            nonlocal first
+            if first is not None:
+                return first.wrap(inner)
+            first = FaultInjectionTransport(
+                inner,
+                status_rates=status_rates,
+                expired_token_rate=expired_token_rate,
+                reset_rate=reset_rate,
+                slow_rate=slow_rate,
+                slow_seconds=slow_seconds,
+                seed=seed,
+                report=report,
+            )
+            return first
+
+        self.add_request_observer(report)
+        try:
+            with self._intercept(wrap):
+                yield report
+        finally:
+            self.remove_request_observer(report)
+
+    @contextlib.contextmanager
+    def record(
+        self, path: Union[str, "os.PathLike[str]", None] = None
+    ) -> Iterator["Cassette"]:
+        """Record the requests issued within the block and their responses.
+
+        Credentials are scrubbed from what is recorded. With ``path`` the
+        cassette is saved when the block ends; replay it offline with
+        ``Cassette.load(path).replay_client()``::
+
+            with client.record("nightly-report.jsonl.gz"):
+                build_report(client)
+        """
+        # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+        from .cassette import Cassette, RecordingTransport
+
+        cassette = Cassette(str(self.hive_url), self.username)
+        try:
+            with self._intercept(lambda inner: RecordingTransport(inner, cassette)):
+                yield cassette
+        finally:
+            if path is not None:
+                cassette.save(path)
+
+    @contextlib.contextmanager
+    def trace(
+        self, path: Union[str, "os.PathLike[str]", None] = None
+    ) -> Iterator[Tracer]:
+        """Record spans for client method calls, HTTP calls and attempts.
+
+        With ``path`` the spans are written when the block ends: JSON lines for
+        a ``.jsonl`` file, otherwise a Chrome trace-event file for
+        ``chrome://tracing``, Perfetto or speedscope::
+
+            with client.trace("import.json"):
+                client.import_users_to_class(cls, users)
+        """
+        tracer = Tracer()
+        previous = self._tracer
+        self._tracer = tracer
+        self.add_request_observer(tracer)
+        try:
+            yield tracer
+        finally:
+            self.remove_request_observer(tracer)
+            self._tracer = previous
+            if path is not None:
+                tracer.export(path)
+
+    @contextlib.contextmanager
+    def detect_n_plus_one(
+        self,
+        threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+        action: Literal["warn", "raise"] = "warn",
+    ) -> Iterator[NPlusOneDetector]:
+        """Detect lazy model properties that fetch objects one by one in a loop.
+
+        Within the block, every single-object fetch made by a lazy property
+        (``Assignment.user``, ``Queue.module``, ...) is counted per property and
+        call site. More than ``threshold`` fetches emit an ``NPlusOneWarning``;
+        with ``action="raise"`` the fetch that would exceed ``threshold`` is not
+        sent and raises ``NPlusOneError`` instead::
+
+            with client.detect_n_plus_one(threshold=5) as detector:
+                for assignment in client.get_assignments():
+                    print(assignment.user.display_name)
+            print(detector.report())
+        """
+        detector = NPlusOneDetector(self, threshold, action)
+        self.add_request_observer(detector)
+        try:
+            yield detector
+        finally:
+            self.remove_request_observer(detector)
+
+    @contextlib.contextmanager
+    def unit_of_work(
+        self, *, concurrency: int = 8, rate_limit: Optional[float] = None
+    ) -> Iterator["UnitOfWork"]:
+        """Collect changes to users and classes and send them when the block ends.
+
+        Users and classes of this client whose fields are assigned within the
+        block (in this thread, or in threads started with its context) are
+        collected; each changed object is sent as one PATCH of just its changed
+        fields, ``concurrency`` at a time and at most ``rate_limit`` per second.
+        If the block raises, nothing is sent. The per-object results are in
+        ``uow.report`` afterwards::
+
+            with client.unit_of_work(rate_limit=20) as uow:
+                for user in client.get_users(program__id__in=[program.id]):
+                    uow.set_users_queue(user, queue)
+            print(uow.report)
+        """
+        # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+        from .unit_of_work import UnitOfWork
+
+        uow = UnitOfWork(self, concurrency=concurrency, rate_limit=rate_limit)
+        token = change_listener.set(uow._collect)  # pylint: disable=protected-access
+        try:
+            yield uow
+        finally:
+            change_listener.reset(token)
+        uow.flush()
+
+    def save_snapshot(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """Write the cached course tree, users, classes and queues to ``path``.
+
+        Load it again with :meth:`from_snapshot` to skip reloading reference data
+        on startup.
+        """
+        save_snapshot(self, path)
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        path: Union[str, "os.PathLike[str]"],
+        username: str,
+        password: str,
+        hive_url: Optional[str] = None,
+        *,
+        cache_soft_ttl: float = DEFAULT_SNAPSHOT_CACHE_SOFT_TTL,
+        **kwargs: Any,
+    ) -> "HiveClient":
+        """Create a client whose reference cache is primed from a snapshot file.
+
+        ``hive_url`` defaults to the URL the snapshot was taken from. Listings
+        are decoded lazily on first use and bound to the new client; those older
+        than ``cache_soft_ttl`` are refreshed in the background.
+        """
+        header = read_snapshot_header(path)
+        if hive_url is None:
+            hive_url = header["hive_url"]
+        client = cls(
+            username, password, hive_url, cache_soft_ttl=cache_soft_ttl, **kwargs
+        )
+        load_snapshot(client, path)
+        return client
+
+    def _ensure_ready(self) -> None:
+        """Log in and verify the server version if either is still pending."""
+        super()._ensure_ready()
+        if self._version_verified or self._version_check_owner == threading.get_ident():
+            # Requests made by the version check itself must not wait for it.
+            return
+        with self._version_check_lock:
+            if self._version_verified:
+                return
+            self._version_check_owner = threading.get_ident()
+            try:
+                self._api_version_check()
+            finally:
+                self._version_check_owner = None
+            self._version_verified = True
+
     def _api_version_check(self) -> None:
         """Validate that the Hive server API version is supported.
 
@@ -98,10 +437,16 @@ class HiveClient(  # pylint: disable=too-many-ancestors,abstract-method
         in ``SUPPORTED_API_VERSIONS``. If unsupported, raises a RuntimeError with
         guidance to align the client and server versions.
 
+        A fresh entry in the on-disk version cache (see ``version_cache_ttl``)
+        is used instead of asking the server.
+
         Raises:
             RuntimeError: If the server API version is not supported by this client.
         """
-        version_str = self.get_hive_version()
+        cached_version = None
+        if self._version_cache is not None:
+            cached_version = self._version_cache.get(self.hive_url)
+        version_str = cached_version or self.get_hive_version()
         if version_str not in SUPPORTED_API_VERSIONS:
             supported_range = f"{MIN_API_VERSION} .. {LATEST_API_VERSION}"
             raise RuntimeError(
@@ -110,3 +455,5 @@ class HiveClient(  # pylint: disable=too-many-ancestors,abstract-method
                     f"Please upgrade/downgrade the server or use a compatible client."
                 )
             )
+        if self._version_cache is not None and cached_version is None:
+            self._version_cache.put(self.hive_url, version_str)
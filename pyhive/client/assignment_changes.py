@@ -0,0 +1,101 @@
+"""Persistent state for delta polling of assignments.
+
+:class:`AssignmentWatermark` keeps the high-water mark on
+``Assignment.last_staff_updated`` together with a compact version (timestamp
+and status) of every seen assignment, so
+:meth:`HiveClient.iter_assignment_changes` can tell changed rows from
+re-scanned, unchanged ones across process restarts.
+"""
+
+import datetime
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from attrs import define, field
+
+from ..src.types.common import isoparse
+from ..src.types.enums.assignment_status_enum import AssignmentStatusEnum
+
+if TYPE_CHECKING:
+    from ..src.types.assignment import Assignment
+
+
+@define(frozen=True)
+class AssignmentVersion:
+    """What a watermark remembers of a seen assignment.
+
+    Attributes:
+        last_staff_updated: The assignment's ``last_staff_updated``.
+        assignment_status: The assignment's status.
+    """
+
+    last_staff_updated: datetime.datetime
+    assignment_status: AssignmentStatusEnum
+
+    @classmethod
+    def of(cls, assignment: "Assignment") -> "AssignmentVersion":
+        """The version of ``assignment``."""
+        return cls(assignment.last_staff_updated, assignment.assignment_status)
+
+    def to_json(self) -> list[str]:
+        return [self.last_staff_updated.isoformat(), self.assignment_status.value]
+
+    @classmethod
+    def from_json(cls, data: Any) -> "AssignmentVersion":
+        if isinstance(data, dict):  # Written by versions that kept whole assignments
+            data = [data["last_staff_updated"], data["assignment_status"]]
+        return cls(isoparse(data[0]), AssignmentStatusEnum(data[1]))
+
+
+@define
+class AssignmentWatermark:
+    """High-water mark and last known version of polled assignments.
+
+    Attributes:
+        last_staff_updated: Greatest ``last_staff_updated`` seen so far, or None
+            before the first poll.
+        known: Last seen version of each assignment, by id.
+    """
+
+    last_staff_updated: Optional[datetime.datetime] = None
+    known: dict[int, AssignmentVersion] = field(factory=dict)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "AssignmentWatermark":
+        """Load a watermark saved by :meth:`save`; missing files yield an empty one."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="UTF-8"))
+        last = data.get("last_staff_updated")
+        return cls(
+            last_staff_updated=None if last is None else isoparse(last),
+            known={
+                int(k): AssignmentVersion.from_json(v) for k, v in data.get("known", {}).items()
+            },
+        )
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Atomically write this watermark to ``path`` as JSON."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "last_staff_updated": (
+                        None
+                        if self.last_staff_updated is None
+                        else self.last_staff_updated.isoformat()
+                    ),
+                    "known": {str(k): v.to_json() for k, v in self.known.items()},
+                }
+            ),
+            encoding="UTF-8",
+        )
+        os.replace(tmp_path, path)
+
+    def previous(self, assignment_id: int) -> Optional[AssignmentVersion]:
+        """Return the last seen version of ``assignment_id``, if any."""
+        return self.known.get(assignment_id)
@@ -33,7 +33,7 @@ class AssignmentResponsesClientMixin(ClientCoreMixin):
         return self._get_core_items(
             f"/api/core/assignments/{assignment_id}/responses/",
             AssignmentResponse,
-            assignment_id=assignment_id,
+            extra_ctor_params={"assignment_id": assignment_id},
         )
 
     def get_assignment_response(self, assignment: "AssignmentLike", response_id: int):
@@ -43,13 +43,13 @@ class AssignmentResponsesClientMixin(ClientCoreMixin):
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
 
         assignment_id = resolve_item_or_id(assignment)
-        return AssignmentResponse.from_dict(
+        return self._build_item(
+            AssignmentResponse,
             cast(
                 dict[str, Any],
                 self.get(
                     f"/api/core/assignments/{assignment_id}/responses/{response_id}/"
                 ),
             ),
-            assignment_id=assignment_id,
-            hive_client=self,
+            {"assignment_id": assignment_id},
         )
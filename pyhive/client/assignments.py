@@ -5,9 +5,13 @@ Adds methods for listing and retrieving Assignment records via the Hive API. Mea
 for use as a mixin on HiveClient.
 """
 
-from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+import datetime
+import itertools
+import os
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional, Sequence
 
 from ..src.types.assignment import Assignment
+from .assignment_changes import AssignmentVersion, AssignmentWatermark
 from .client_shared import ClientCoreMixin
 from .utils import assert_mutually_exclusive_filters, resolve_item_or_id
 
@@ -16,6 +20,9 @@ if TYPE_CHECKING:
     from ..src.types.subject import SubjectLike
     from ..src.types.user import UserLike
 
+DEFAULT_CHANGES_PAGE_SIZE = 200
+DEFAULT_RESCAN_WINDOW = datetime.timedelta(minutes=5)
+
 
 class AssignmentClientMixin(ClientCoreMixin):
     """
@@ -27,6 +34,10 @@ class AssignmentClientMixin(ClientCoreMixin):
         List all or filtered assignments, supporting complex relational filters.
     get_assignment(assignment_id)
         Retrieve a single assignment by its id.
+    get_assignments_updated_since(since, ...)
+        List assignments whose ``last_staff_updated`` is at or after ``since``.
+    iter_assignment_changes(since, ...)
+        Yield ``(old, new)`` pairs for assignments changed since a watermark.
     """
 
     def get_assignments(  # pylint: disable=too-many-arguments,too-many-locals
@@ -48,6 +59,9 @@ class AssignmentClientMixin(ClientCoreMixin):
         parent_subject: Optional["SubjectLike"] = None,
         for_user: Optional["UserLike"] = None,
         for_mentees_of: Optional["UserLike"] = None,
+        # Pagination / ordering
+        ordering: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> Iterable[Assignment]:
         """Yield ``Assignment`` objects filtered by the provided criteria."""
         from ..client import HiveClient
@@ -102,6 +116,8 @@ class AssignmentClientMixin(ClientCoreMixin):
             user__mentor__id=user__mentor__id,
             user__mentor__id__in=user__mentor__id__in,
             user__program__id__in=user__program__id__in,
+            ordering=ordering,
+            limit=limit,
         )
 
     def get_assignment(self, assignment_id: int) -> Assignment:
@@ -111,7 +127,91 @@ class AssignmentClientMixin(ClientCoreMixin):
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
         data = self.get(f"/api/core/assignments/{assignment_id}/")
         assert isinstance(data, dict)
-        return Assignment.from_dict(
-            data,
-            hive_client=self,
+        return self._build_item(Assignment, data)
+
+    def get_assignments_updated_since(
+        self,
+        since: Optional[datetime.datetime],
+        *,
+        page_size: int = DEFAULT_CHANGES_PAGE_SIZE,
+        **filters: Any,
+    ) -> Iterator[Assignment]:
+        """Yield assignments whose ``last_staff_updated`` is at or after ``since``.
+
+        Requests pages ordered by ``-last_staff_updated`` and stops fetching at
+        the first older row, but only once a full first page shows the server
+        applied the ordering; otherwise every row is fetched and filtered
+        client-side. ``filters`` are forwarded to :meth:`get_assignments`.
+        """
+        rows = iter(
+            self.get_assignments(ordering="-last_staff_updated", limit=page_size, **filters)
+        )
+        first_page = list(itertools.islice(rows, page_size))
+        ordered = (
+            1 < len(first_page) == page_size
+            and all(
+                a.last_staff_updated >= b.last_staff_updated
+                for a, b in itertools.pairwise(first_page)
+            )
         )
+        previous: Optional[datetime.datetime] = None
+        for assignment in itertools.chain(first_page, rows):
+            updated = assignment.last_staff_updated
+            if previous is not None and updated > previous:
+                ordered = False
+            previous = updated
+            if since is None or updated >= since:
+                yield assignment
+            elif ordered:
+                return
+
+    def iter_assignment_changes(
+        self,
+        since: "datetime.datetime | AssignmentWatermark | None" = None,
+        *,
+        state_path: Optional[str | os.PathLike[str]] = None,
+        rescan_window: datetime.timedelta = DEFAULT_RESCAN_WINDOW,
+        page_size: int = DEFAULT_CHANGES_PAGE_SIZE,
+        **filters: Any,
+    ) -> Iterator[tuple[Optional[AssignmentVersion], Assignment]]:
+        """Yield ``(old, new)`` pairs for assignments changed since a watermark.
+
+        ``old`` is the previously seen version (timestamp and status) of the
+        assignment, None when it is new to the watermark. Rows updated within
+        ``rescan_window`` before the watermark are re-checked to tolerate clock
+        skew and equal timestamps; rows whose version did not change are not
+        yielded.
+
+        The watermark is taken from ``since`` (a timestamp or an
+        :class:`AssignmentWatermark`, which is updated in place) or loaded from
+        ``state_path``. When ``state_path`` is given the updated watermark is
+        written back once the iteration completes.
+        """
+        if isinstance(since, AssignmentWatermark):
+            state = since
+        elif state_path is not None and since is None:
+            state = AssignmentWatermark.load(state_path)
+        else:
+            state = AssignmentWatermark(last_staff_updated=since)
+
+        cutoff = (
+            None
+            if state.last_staff_updated is None
+            else state.last_staff_updated - rescan_window
+        )
+        high_water = state.last_staff_updated
+        for assignment in self.get_assignments_updated_since(
+            cutoff, page_size=page_size, **filters
+        ):
+            if high_water is None or assignment.last_staff_updated > high_water:
+                high_water = assignment.last_staff_updated
+            version = AssignmentVersion.of(assignment)
+            old = state.previous(assignment.id)
+            if old == version:
+                continue
+            state.known[assignment.id] = version
+            yield old, assignment
+
+        state.last_staff_updated = high_water
+        if state_path is not None:
+            state.save(state_path)
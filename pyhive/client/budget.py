@@ -0,0 +1,63 @@
+"""Request budgets that stop an operation once it issues too many requests."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import httpx
+
+from ..src.instrumentation import RequestObserver, endpoint_template
+
+
+class BudgetExceededError(RuntimeError):
+    """Raised when an operation exceeds its request or time budget."""
+
+
+class RequestBudget(RequestObserver):
+    """Count requests and elapsed time, and raise once either limit is exceeded.
+
+    The check runs before every request is sent (logins, token refreshes and
+    502 retries included), so the request that would exceed ``max_requests`` is
+    never sent. ``max_seconds`` is checked before each request and by
+    :meth:`check`.
+    """
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        max_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_requests is not None and max_requests < 0:
+            raise ValueError("max_requests must not be negative")
+        if max_seconds is not None and max_seconds < 0:
+            raise ValueError("max_seconds must not be negative")
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the budget was created."""
+        return self._clock() - self._started
+
+    def check(self) -> None:
+        """Raise :class:`BudgetExceededError` if the time budget is used up."""
+        if self.max_seconds is not None and self.elapsed > self.max_seconds:
+            raise BudgetExceededError(
+                f"Time budget of {self.max_seconds}s exceeded after "
+                f"{self.requests} requests ({self.elapsed:.2f}s)"
+            )
+
+    def on_send(self, request: httpx.Request) -> None:
+        self.check()
+        with self._lock:
+            if self.max_requests is not None and self.requests >= self.max_requests:
+                raise BudgetExceededError(
+                    f"Request budget of {self.max_requests} exceeded by "
+                    f"{request.method} {endpoint_template(str(request.url))}"
+                )
+            self.requests += 1
@@ -0,0 +1,168 @@
+"""Building blocks of bulk user creation: results, a rate limiter and a journal.
+
+See ``HiveClient.bulk_create_users``. The journal is a JSON-lines file with one
+line per record that was sent or found to exist already; a rerun with the same
+journal skips the records it lists as created.
+"""
+
+import contextlib
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Literal, Optional, get_args
+
+from attrs import define, field
+
+from ..src import json_backend
+from ..src.types.user import User
+
+BulkStatus = Literal["created", "skipped", "invalid", "failed"]
+
+
+@define
+class BulkUserResult:
+    """Outcome of one record passed to ``bulk_create_users``.
+
+    Attributes:
+        index: Position of the record in the input.
+        username: The record's username.
+        status: ``"created"``; ``"skipped"`` when a previous run (per the
+            journal) or someone else already created the user; ``"invalid"``
+            when the record failed validation and was not sent; ``"failed"``
+            when the server rejected it.
+        user: The created user, when this run created it.
+        user_id: Id of the created or previously created user, when known.
+        error: What went wrong, for invalid and failed records.
+    """
+
+    index: int
+    username: str
+    status: BulkStatus
+    user: Optional[User] = None
+    user_id: Optional[int] = None
+    error: Optional[Exception] = None
+
+
+@define
+class BulkCreateReport:
+    """Per-record results of ``bulk_create_users``, in input order."""
+
+    results: list[BulkUserResult] = field(factory=list)
+
+    @property
+    def created(self) -> list[User]:
+        """Users created by this run."""
+        return [r.user for r in self.results if r.user is not None]
+
+    @property
+    def errors(self) -> list[BulkUserResult]:
+        """Results of invalid and failed records."""
+        return [r for r in self.results if r.error is not None]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every record was created now or before."""
+        return not self.errors
+
+    def counts(self) -> dict[str, int]:
+        """Number of records per status."""
+        return dict(Counter(r.status for r in self.results))
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __str__(self) -> str:
+        counts = self.counts()
+        lines = [", ".join(f"{counts.get(s, 0)} {s}" for s in get_args(BulkStatus))]
+        for result in self.errors:
+            lines.append(f"  #{result.index} {result.username}: {result.error}")
+        return "\n".join(lines)
+
+
+class RateLimiter:  # pylint: disable=too-few-public-methods
+    """Spaces out calls to at most ``rate`` per second across threads."""
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1 / rate
+        self._clock = clock
+        self._sleep = sleep
+        self._next = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller may make its call."""
+        with self._lock:
+            now = self._clock()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            self._sleep(slot - now)
+
+
+class BulkJournal:
+    """Append-only JSON-lines record of bulk creation progress.
+
+    Attributes:
+        resumed: Whether the journal file existed when it was opened.
+        created: User ids by username of the users journaled as created.
+        server_users: User ids by username on the server, fetched once by
+            ``bulk_create_users`` when resuming.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self.resumed = self.path.exists()
+        self.created: dict[str, int] = {}
+        self.server_users: Optional[dict[str, int]] = None
+        complete = True
+        if self.resumed:
+            with self.path.open("rb") as file:
+                for line in file:
+                    complete = line.endswith(b"\n")
+                    try:
+                        entry = json_backend.loads(line)
+                    except ValueError:
+                        continue  # Blank, or cut short when the process died.
+                    if entry["status"] in ("created", "skipped"):
+                        self.created[entry["username"]] = entry["user_id"]
+        self._files = contextlib.ExitStack()
+        self._file = self._files.enter_context(self.path.open("ab"))
+        if not complete:
+            self._file.write(b"\n")
+        self._lock = threading.Lock()
+
+    def write(self, result: BulkUserResult) -> None:
+        """Append ``result`` and flush it to the OS."""
+        entry: dict[str, Any] = {
+            "index": result.index,
+            "username": result.username,
+            "status": result.status,
+            "user_id": result.user_id,
+        }
+        if result.error is not None:
+            entry["error"] = str(result.error)
+        with self._lock:
+            self._file.write(json_backend.dumps(entry) + b"\n")
+            self._file.flush()
+            if result.user_id is not None:
+                self.created[result.username] = result.user_id
+
+    def close(self) -> None:
+        self._files.close()
+
+    def __enter__(self) -> "BulkJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
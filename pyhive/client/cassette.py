@@ -0,0 +1,330 @@
+"""Record HTTP traffic of a live session and replay it offline.
+
+``client.record(path)`` wraps the client's transport with a
+:class:`RecordingTransport` that keeps every request/response pair, with its
+timing, in a :class:`Cassette`. Credentials are scrubbed before anything is
+stored: request headers are dropped, and passwords and tokens in JSON bodies
+are replaced with a placeholder. Cassettes are saved as gzip-compressed JSON
+lines.
+
+A :class:`ReplayTransport` serves a cassette back to a client, sleeping for
+each recorded response time multiplied by ``time_scale``::
+
+    cassette = Cassette.load("production.jsonl.gz")
+    client = cassette.replay_client(time_scale=0.1)
+"""
+
+import base64
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+import httpx
+from attrs import define, field, frozen
+
+from ..src import json_backend
+
+if TYPE_CHECKING:
+    import os
+
+    from ..client import HiveClient
+
+CASSETTE_FORMAT = "pyhive-cassette"
+CASSETTE_FORMAT_VERSION = 1
+SCRUBBED = "***"
+SECRET_KEYS = frozenset({"password", "access", "refresh"})
+_PASSWORD_KEYS = frozenset({"password"})
+_TOKEN_PREFIX = "/api/core/token/"
+# Describe the transfer, not the (already decoded) body that is stored.
+_DROPPED_RESPONSE_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+)
+
+
+class UnmatchedRequestError(RuntimeError):
+    """Raised on replay for a request that is not in the cassette."""
+
+
+def _scrub_json(value: Any, keys: frozenset[str]) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED if key in keys else _scrub_json(item, keys)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_scrub_json(item, keys) for item in value]
+    return value
+
+
+def scrub_body(path: str, body: bytes) -> bytes:
+    """Return ``body`` with secrets replaced when it is a JSON body that may hold any.
+
+    Token endpoint bodies lose passwords and tokens; other bodies only lose
+    ``password`` keys, so listings keep fields that merely share a token's name.
+    """
+    is_token_endpoint = path.startswith(_TOKEN_PREFIX)
+    if not body or (not is_token_endpoint and b'"password"' not in body):
+        return body
+    try:
+        data = json_backend.loads(body)
+    except ValueError:
+        return body
+    keys = SECRET_KEYS if is_token_endpoint else _PASSWORD_KEYS
+    return json_backend.dumps(_scrub_json(data, keys))
+
+
+def _request_key(method: str, url: httpx.URL, body: bytes) -> tuple[str, str, str]:
+    target = url.raw_path.decode("ascii")
+    if body:
+        try:
+            # Key order of JSON bodies is not significant.
+            text = json.dumps(json_backend.loads(body), sort_keys=True)
+        except ValueError:
+            text = body.decode("UTF-8", "replace")
+    else:
+        text = ""
+    return method, target, text
+
+
+def _encode_body(body: bytes) -> tuple[str, Optional[str]]:
+    try:
+        return body.decode("UTF-8"), None
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode("ascii"), "base64"
+
+
+def _decode_body(text: str, encoding: Optional[str]) -> bytes:
+    return base64.b64decode(text) if encoding == "base64" else text.encode("UTF-8")
+
+
+@frozen
+class Interaction:
+    """One recorded request/response pair.
+
+    Attributes:
+        method: HTTP method.
+        url: Full request URL.
+        request_body: Scrubbed request body.
+        status_code: Response status code.
+        headers: Response headers, minus transfer and cookie headers.
+        body: Scrubbed, decoded response body.
+        started: Seconds since the recording started when the request was sent.
+        seconds: Time until the whole response body was received.
+    """
+
+    method: str
+    url: str
+    request_body: bytes
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: bytes
+    started: float
+    seconds: float
+
+    def key(self) -> tuple[str, str, str]:
+        """What a replayed request must match: method, path with query, body."""
+        return _request_key(self.method, httpx.URL(self.url), self.request_body)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable dictionary."""
+        request_body, request_encoding = _encode_body(self.request_body)
+        body, body_encoding = _encode_body(self.body)
+        return {
+            "method": self.method,
+            "url": self.url,
+            "request_body": request_body,
+            "request_body_encoding": request_encoding,
+            "status_code": self.status_code,
+            "headers": [list(header) for header in self.headers],
+            "body": body,
+            "body_encoding": body_encoding,
+            "started": self.started,
+            "seconds": self.seconds,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Interaction":
+        """Inverse of :meth:`to_dict`."""
+        return cls(
+            data["method"],
+            data["url"],
+            _decode_body(data["request_body"], data.get("request_body_encoding")),
+            data["status_code"],
+            [tuple(h) for h in data["headers"]],
+            _decode_body(data["body"], data.get("body_encoding")),
+            data["started"],
+            data["seconds"],
+        )
+
+
+@define
+class Cassette:
+    """Recorded interactions of one session, in the order they were sent.
+
+    Attributes:
+        hive_url: Base URL of the recorded server.
+        username: User the session was recorded as.
+        interactions: The recorded request/response pairs.
+    """
+
+    hive_url: str
+    username: str
+    interactions: list[Interaction] = field(factory=list)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def save(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        """Write the cassette to ``path`` as gzip-compressed JSON lines."""
+        header = {
+            "format": CASSETTE_FORMAT,
+            "version": CASSETTE_FORMAT_VERSION,
+            "hive_url": self.hive_url,
+            "username": self.username,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+        with gzip.open(path, "wb") as file:
+            file.write(json_backend.dumps(header) + b"\n")
+            for interaction in self.interactions:
+                file.write(json_backend.dumps(interaction.to_dict()) + b"\n")
+
+    @classmethod
+    def load(cls, path: Union[str, "os.PathLike[str]"]) -> "Cassette":
+        """Read a cassette written by :meth:`save`."""
+        with gzip.open(path, "rb") as file:
+            header = json_backend.loads(file.readline())
+            if header.get("format") != CASSETTE_FORMAT:
+                raise ValueError(f"{path} is not a PyHive cassette")
+            if header["version"] != CASSETTE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported cassette format version {header['version']}")
+            interactions = [
+                Interaction.from_dict(json_backend.loads(line)) for line in file if line.strip()
+            ]
+        return cls(header["hive_url"], header["username"], interactions)
+
+    def replay_client(self, time_scale: float = 1.0, **kwargs: Any) -> "HiveClient":
+        """Return a :class:`HiveClient` served by a :class:`ReplayTransport` of this cassette.
+
+        Responses keep their recorded timings unless ``time_scale`` says
+        otherwise (0 answers immediately). The API version check is skipped unless ``skip_version_check=False``
+        is passed and the check was recorded.
+        """
+        from ..client import HiveClient  # pylint: disable=import-outside-toplevel
+
+        kwargs.setdefault("skip_version_check", True)
+        return HiveClient(
+            self.username,
+            SCRUBBED,
+            self.hive_url,
+            transport=ReplayTransport(self, time_scale=time_scale),
+            **kwargs,
+        )
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Transport that records every request/response pair into a cassette.
+
+    Response bodies are read completely before they are returned, so streamed
+    responses are buffered while recording.
+    """
+
+    def __init__(self, inner: httpx.BaseTransport, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request_body = request.read()
+        start = time.perf_counter()
+        response = self.inner.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        seconds = time.perf_counter() - start
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_RESPONSE_HEADERS
+        ]
+        path = request.url.path
+        interaction = Interaction(
+            request.method,
+            str(request.url),
+            scrub_body(path, request_body),
+            response.status_code,
+            headers,
+            scrub_body(path, body),
+            start - self._origin,
+            seconds,
+        )
+        with self._lock:
+            self.cassette.interactions.append(interaction)
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Transport that answers requests from a cassette.
+
+    A request is answered with the next unused recorded response for the same
+    method, path, query and (scrubbed) body. Once those are used up, the last
+    one is repeated, so a workload may issue a recorded read more often than
+    the original session did. Logins and token refreshes that were not
+    recorded are answered with placeholder tokens; any other request never
+    recorded raises :class:`UnmatchedRequestError`.
+
+    Each response is delayed by its recorded time multiplied by ``time_scale``:
+    1 reproduces the original timings, 0 answers immediately.
+    """
+
+    def __init__(self, cassette: Cassette, *, time_scale: float = 1.0):
+        if time_scale < 0:
+            raise ValueError("time_scale must not be negative")
+        self.cassette = cassette
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str, str], deque[Interaction]] = {}
+        self._last: dict[tuple[str, str, str], Interaction] = {}
+        for interaction in cassette.interactions:
+            self._pending.setdefault(interaction.key(), deque()).append(interaction)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = scrub_body(request.url.path, request.read())
+        key = _request_key(request.method, request.url, body)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                interaction = pending.popleft()
+                self._last[key] = interaction
+            elif key in self._last:
+                interaction = self._last[key]
+            elif request.url.path.startswith(_TOKEN_PREFIX):
+                tokens = {"access": SCRUBBED, "refresh": SCRUBBED}
+                return httpx.Response(
+                    httpx.codes.OK, content=json_backend.dumps(tokens), request=request
+                )
+            else:
+                raise UnmatchedRequestError(
+                    f"No recorded response for {request.method} {request.url}"
+                )
+        if self.time_scale:
+            time.sleep(interaction.seconds * self.time_scale)
+        return httpx.Response(
+            interaction.status_code,
+            headers=interaction.headers,
+            content=interaction.body,
+            request=request,
+        )
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Iterable, Optional, Sequence
 from ..src.types.class_ import Class
 from ..src.types.enums.class_type_enum import ClassTypeEnum
 from .client_shared import ClientCoreMixin
+from .reference_cache import reference_cached
 from .utils import resolve_item_or_id
 
 if TYPE_CHECKING:
@@ -29,6 +30,7 @@ class ClassesClientMixin(ClientCoreMixin):
         Retrieve a single class by id.
     """
 
+    @reference_cached
     def get_classes(
         self,
         *,
@@ -60,10 +62,7 @@ class ClassesClientMixin(ClientCoreMixin):
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
         data = self.get(f"/api/core/management/classes/{class_id}/")
         assert isinstance(data, dict)
-        return Class.from_dict(
-            data,
-            hive_client=self,
-        )
+        return self._build_item(Class, data)
 
     def create_class(
         self,
@@ -105,10 +104,12 @@ class ClassesClientMixin(ClientCoreMixin):
             payload["description"] = description
 
         response = self.post("/api/core/management/classes/", payload)
+        self._invalidate_reference_cache("get_classes")
         return Class.from_dict(response, hive_client=self)
 
     def delete_class(self, class_: "ClassLike") -> None:
         self.delete(f"/api/core/management/classes/{resolve_item_or_id(class_)}/")
+        self._invalidate_reference_cache("get_classes")
 
     def update_class(
         self,
@@ -138,6 +139,21 @@ class ClassesClientMixin(ClientCoreMixin):
                 ),
             },
         )
+        class_.mark_clean()
+        self._invalidate_reference_cache("get_classes")
+        return Class.from_dict(data, hive_client=self)
+
+    def save_class(self, class_: Class) -> Class:
+        """Send only the fields of ``class_`` changed since it was loaded, as a PATCH.
+
+        Returns ``class_`` itself, without a request, if nothing changed.
+        """
+        changes = class_.changes()
+        if not changes:
+            return class_
+        data = self.patch(f"/api/core/management/classes/{class_.id}/", changes)
+        class_.mark_clean()
+        self._invalidate_reference_cache("get_classes")
         return Class.from_dict(data, hive_client=self)
 
     def import_users_to_class(
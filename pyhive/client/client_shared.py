@@ -3,13 +3,29 @@
 - ``ClientCoreMixin``: base class that provides ``_get_core_items`` used by resource mixins.
 """
 
+import inspect
+import time
 from typing import Any, Iterable, Optional, Sequence
 
 import httpx
 
 from ..src.authenticated_hive_client import AuthenticatedHiveClient
+from ..src.json_stream import iter_json_list_items
+from ..src.tracing import traced_method
+from .reference_cache import ReferenceCache
 from .utils import CoreItemTypeT
 
+# Listings whose cached items embed data of another listing's items (names,
+# colors, member ids), or disappear with them on a cascading delete.
+_DEPENDENT_LISTINGS: dict[str, tuple[str, ...]] = {
+    "get_programs": ("get_subjects", "get_classes", "get_queues", "get_users"),
+    "get_subjects": ("get_modules", "get_exercises", "get_queues"),
+    "get_modules": ("get_exercises", "get_queues"),
+    "get_users": ("get_classes", "get_queues"),
+    "get_classes": ("get_users",),
+    "get_queues": ("get_users",),
+}
+
 
 class ClientCoreMixin(AuthenticatedHiveClient):
     """Common mixin base that exposes ``_get_core_items`` for list endpoints.
@@ -18,6 +34,60 @@ class ClientCoreMixin(AuthenticatedHiveClient):
     the composed ``HiveClient``.
     """
 
+    _reference_cache: Optional[ReferenceCache] = None
+    _explaining: bool = False
+    _stream_list_pages: bool = False
+    _trace_public_methods: bool = True
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Record a tracing span around each public method a mixin defines."""
+        super().__init_subclass__(**kwargs)
+        if not cls.__dict__.get("_trace_public_methods", True):
+            return
+        for name, value in list(cls.__dict__.items()):
+            if not name.startswith("_") and inspect.isfunction(value):
+                setattr(cls, name, traced_method(value))
+
+    def _invalidate_reference_cache(self, *method_names: str) -> None:
+        """Drop cached results of the given reference-data list methods.
+
+        The listings that depend on them (see ``_DEPENDENT_LISTINGS``) are
+        dropped too, so e.g. deleting a program also drops its cached subjects,
+        modules and exercises. Nothing is dropped within ``explain()``, where
+        writes are not sent.
+        """
+        if self._reference_cache is None or self._explaining:
+            return
+        pending = list(method_names)
+        dropped: set[str] = set()
+        while pending:
+            method_name = pending.pop()
+            if method_name not in dropped:
+                dropped.add(method_name)
+                self._reference_cache.invalidate(method_name)
+                pending.extend(_DEPENDENT_LISTINGS.get(method_name, ()))
+
+    def _build_item(
+        self,
+        item_type: type[CoreItemTypeT],
+        data: dict[str, Any],
+        extra_ctor_params: Optional[dict[str, Any]] = None,
+    ) -> CoreItemTypeT:
+        """Build one item, reporting the parse time to request observers."""
+        from ..client import HiveClient
+
+        assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
+
+        extra_ctor_params = extra_ctor_params or {}
+        if not self._request_observers:
+            return item_type.from_dict(data, **extra_ctor_params, hive_client=self)
+        start = time.perf_counter()
+        item = item_type.from_dict(data, **extra_ctor_params, hive_client=self)
+        elapsed = time.perf_counter() - start
+        for observer in self._request_observers:
+            observer.on_parse(item_type.__name__, elapsed)
+        return item
+
     def _get_core_items(
         self,
         endpoint: str,
@@ -43,6 +113,9 @@ class ClientCoreMixin(AuthenticatedHiveClient):
         responses of the form:
 
             {"count": N, "next": url | null, "previous": url | null, "results": [...]}
+
+        When the client streams list pages, each response is parsed
+        incrementally and items are built one at a time.
         """
         from ..client import HiveClient
 
@@ -61,6 +134,12 @@ class ClientCoreMixin(AuthenticatedHiveClient):
             else:
                 query_params = query_params.set(name, value)
 
+        if self._stream_list_pages:
+            yield from self._stream_core_items(
+                endpoint, item_type, query_params, extra_ctor_params
+            )
+            return
+
         data = self.get(endpoint, params=query_params)
 
         # Non-paginated: assume the payload is the items list (or empty)
@@ -73,22 +152,48 @@ class ClientCoreMixin(AuthenticatedHiveClient):
             ), "Returned data is neither paginated nor the results themselves!"
             items: list[dict[str, Any]] = data
             yield from (
-                item_type.from_dict(x, **extra_ctor_params, hive_client=self)
+                self._build_item(item_type, x, extra_ctor_params)
                 for x in items
             )
+            return
 
         # Paginated: follow "next" links and yield all pages
-        def _paginate() -> Iterable[CoreItemTypeT]:
-            assert isinstance(data, dict)
-            page = data
-            while True:
-                items: list[dict[str, Any]] = page.get("results", [])
-                for x in items:
-                    yield item_type.from_dict(x, **extra_ctor_params, hive_client=self)
-                next_url = page.get("next")
-                if not next_url:
-                    break
-                page = self.get(next_url)
-                assert isinstance(page, dict)
-
-        return _paginate()
+        page = data
+        while True:
+            items = page.get("results", [])
+            for x in items:
+                yield self._build_item(item_type, x, extra_ctor_params)
+            next_url = page.get("next")
+            if not next_url:
+                break
+            next_page = self.get(next_url)
+            assert isinstance(next_page, dict)
+            page = next_page
+
+    def _stream_core_items(
+        self,
+        endpoint: str,
+        item_type: type[CoreItemTypeT],
+        query_params: Optional[httpx.QueryParams],
+        extra_ctor_params: dict[str, Any],
+    ) -> Iterable[CoreItemTypeT]:
+        """Like ``_get_core_items`` but decode each page while it is received.
+
+        The response stays open while the caller consumes its items.
+        """
+        from ..client import HiveClient
+
+        assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
+
+        while True:
+            page_fields: dict[str, Any] = {}
+            response = self._get_stream(endpoint, query_params)
+            try:
+                for x in iter_json_list_items(response.iter_bytes(), fields=page_fields):
+                    yield self._build_item(item_type, x, extra_ctor_params)
+            finally:
+                response.close()
+            next_url = page_fields.get("next")
+            if not next_url:
+                return
+            endpoint, query_params = next_url, None
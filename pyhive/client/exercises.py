@@ -11,6 +11,7 @@ from ..src.types.enums.exercise_patbas_enum import PatbasEnum
 from ..src.types.enums.exercise_preview_types import ExercisePreviewTypes
 from ..src.types.exercise import Exercise
 from .client_shared import ClientCoreMixin
+from .reference_cache import reference_cached
 from .utils import resolve_item_or_id
 
 if TYPE_CHECKING:
@@ -32,6 +33,7 @@ class ExerciseClientMixin(ClientCoreMixin):
     """
 
     # NOTE: Intended to be used only as part of the HiveClient composite class
+    @reference_cached
     def get_exercises(  # pylint: disable=too-many-arguments
         self,
         *,
@@ -86,10 +88,7 @@ class ExerciseClientMixin(ClientCoreMixin):
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
         data = self.get(f"/api/core/course/exercises/{exercise_id}/")
         assert isinstance(data, dict)
-        return Exercise.from_dict(
-            data,
-            hive_client=self,
-        )
+        return self._build_item(Exercise, data)
 
     def create_exercise(
         self,
@@ -134,10 +133,13 @@ class ExerciseClientMixin(ClientCoreMixin):
             "segel_brief": segel_brief,
         }
 
-        return Exercise.from_dict(
+        exercise = Exercise.from_dict(
             self.post("/api/core/course/exercises/", payload),
             hive_client=self,
         )
+        self._invalidate_reference_cache("get_exercises")
+        return exercise
 
     def delete_exercise(self, exercise: "ExerciseLike") -> None:
         self.delete(f"/api/core/course/exercises/{resolve_item_or_id(exercise)}/")
+        self._invalidate_reference_cache("get_exercises")
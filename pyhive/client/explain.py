@@ -0,0 +1,137 @@
+"""Dry-run mode that records the requests an operation would issue.
+
+While explaining, the client's transport is wrapped by :class:`ExplainTransport`.
+Reads and logins go to the server as usual so the operation can walk the data
+it needs. Writes are recorded but never sent; they are answered with a
+synthesized response: the request body laid over the object's current state
+(fetched for updates) or over an existing object of the same collection (for
+creates), so the client can parse it like a real response.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Optional
+
+import httpx
+from attrs import define, field, frozen
+
+from ..src import json_backend
+from ..src.instrumentation import endpoint_template
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_PASSTHROUGH_PREFIX = "/api/core/token/"
+_SYNTHETIC_ID = 0
+_BODY_HEADERS = frozenset({"content-length", "content-type", "transfer-encoding"})
+
+
+@frozen
+class ExplainedRequest:
+    """A request issued while explaining.
+
+    Attributes:
+        method: HTTP method.
+        url: Full request URL.
+        endpoint: ``url``'s path with ids collapsed.
+        sent: Whether the request actually reached the server.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    sent: bool
+
+
+@define
+class ExplainReport:
+    """The requests recorded by ``client.explain()``, in issue order."""
+
+    requests: list[ExplainedRequest] = field(factory=list)
+
+    @property
+    def writes(self) -> list[ExplainedRequest]:
+        """The recorded requests that were not sent."""
+        return [request for request in self.requests if not request.sent]
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """Number of requests per ``(method, endpoint template)``."""
+        return dict(Counter((r.method, r.endpoint) for r in self.requests))
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    def __str__(self) -> str:
+        lines = [f"{len(self.requests)} requests ({len(self.writes)} writes skipped)"]
+        for (method, endpoint), count in sorted(
+            self.counts().items(), key=lambda item: -item[1]
+        ):
+            lines.append(f"{count:6d}  {method:6s} {endpoint}")
+        return "\n".join(lines)
+
+
+def _template(inner: httpx.BaseTransport, request: httpx.Request) -> dict[str, Any]:
+    """A stored object a write to ``request.url`` would return a variant of.
+
+    Updates get the object's current state; creates get the first object of
+    the collection, or nothing if it is empty.
+    """
+    url = request.url
+    if request.method == "POST":
+        url = url.copy_merge_params({"limit": 1})
+    headers = {k: v for k, v in request.headers.items() if k.lower() not in _BODY_HEADERS}
+    response = inner.handle_request(httpx.Request("GET", url, headers=headers))
+    try:
+        response.read()
+        if response.status_code != httpx.codes.OK:
+            return {}
+        data = json_backend.loads(response.content)
+    except ValueError:
+        return {}
+    finally:
+        response.close()
+    if request.method == "POST":
+        rows = data.get("results", []) if isinstance(data, dict) else data
+        data = rows[0] if isinstance(rows, list) and rows else {}
+    return data if isinstance(data, dict) else {}
+
+
+def _synthesize(inner: httpx.BaseTransport, request: httpx.Request) -> httpx.Response:
+    if request.method == "DELETE":
+        return httpx.Response(httpx.codes.NO_CONTENT, request=request)
+    body: Any = json_backend.loads(request.content) if request.content else {}
+    if isinstance(body, dict):
+        segments = [s for s in request.url.path.split("/") if s]
+        item_id = int(segments[-1]) if segments and segments[-1].isdigit() else None
+        body = {
+            **_template(inner, request),
+            **body,
+            "id": _SYNTHETIC_ID if item_id is None else item_id,
+        }
+    status = httpx.codes.CREATED if request.method == "POST" else httpx.codes.OK
+    return httpx.Response(status, content=json_backend.dumps(body), request=request)
+
+
+class ExplainTransport(httpx.BaseTransport):
+    """Transport that records every request and swallows writes."""
+
+    def __init__(self, inner: httpx.BaseTransport, report: Optional[ExplainReport] = None):
+        self.inner = inner
+        self.report = report if report is not None else ExplainReport()
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        sent = request.method not in WRITE_METHODS or request.url.path.startswith(
+            _PASSTHROUGH_PREFIX
+        )
+        with self._lock:
+            self.report.requests.append(
+                ExplainedRequest(
+                    request.method, str(request.url), endpoint_template(str(request.url)), sent
+                )
+            )
+        if sent:
+            return self.inner.handle_request(request)
+        request.read()
+        return _synthesize(self.inner, request)
+
+    def close(self) -> None:
+        self.inner.close()
@@ -0,0 +1,194 @@
+"""Fault injection to exercise and measure the retry and token-refresh layers.
+
+While ``client.inject_faults(...)`` is active, the client's transport is
+wrapped by :class:`FaultInjectionTransport`, which answers a configurable share
+of requests with an error status, a forced 401 (an expired access token) or a
+connection reset, and delays some responses. A :class:`FaultReport` collects
+what the client did about it: retries, token refreshes, the time spent on
+failed attempts and backoff, and how many requests each call ended up costing.
+
+Backoff follows ``MAX_RETRIES_ON_SERVER_ERRORS`` and ``INITIAL_BACKOFF_SECONDS``
+in :mod:`pyhive.src.authenticated_hive_client`, which may be patched to compare
+settings.
+"""
+
+import copy
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Mapping
+from typing import Optional
+
+import httpx
+from attrs import define, field
+
+from ..src import authenticated_hive_client
+from ..src.instrumentation import RequestEvent, RequestObserver
+
+_TOKEN_PREFIX = "/api/core/token/"
+
+
+@define
+class FaultReport(RequestObserver):
+    """What injected faults cost the client.
+
+    Attributes:
+        requests: Requests sent by the client, including logins and refreshes.
+        calls: HTTP calls made by the client (``_get``, ``_post``, ...); retries
+            and the repeat after a token refresh belong to the same call.
+        retries: Attempts repeated after a 502.
+        token_refreshes: Access tokens refreshed after a 401.
+        injected: Number of injected faults per kind (``"502"``, ``"expired
+            token"``, ``"reset"``, ``"slow"``, ...).
+        failed_seconds: Time spent on attempts that got an error response.
+        backoff_seconds: Time slept between retries.
+        injected_delay_seconds: Delay added to slow responses.
+    """
+
+    requests: int = 0
+    calls: int = 0
+    retries: int = 0
+    token_refreshes: int = 0
+    injected: Counter[str] = field(factory=Counter)
+    failed_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+    injected_delay_seconds: float = 0.0
+    _lock: threading.Lock = field(factory=threading.Lock, init=False, repr=False)
+
+    @property
+    def amplification(self) -> float:
+        """Requests sent per HTTP call (1.0 without any retries or refreshes)."""
+        return self.requests / self.calls if self.calls else 0.0
+
+    @property
+    def extra_seconds(self) -> float:
+        """Latency added by faults: failed attempts, backoff and slow responses."""
+        return self.failed_seconds + self.backoff_seconds + self.injected_delay_seconds
+
+    def on_send(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            if event.attempt:
+                self.retries += 1
+                self.backoff_seconds += (
+                    authenticated_hive_client.INITIAL_BACKOFF_SECONDS * 2 ** (event.attempt - 1)
+                )
+            else:
+                self.calls += 1
+            if event.status_code >= 400:
+                self.failed_seconds += event.seconds
+
+    def on_token_refresh(self, endpoint: Optional[str]) -> None:
+        with self._lock:
+            self.token_refreshes += 1
+            self.calls -= 1  # The repeated attempt continues the same call.
+
+    def record_fault(self, kind: str, delay: float = 0.0) -> None:
+        """Count an injected fault; called by the transport."""
+        with self._lock:
+            self.injected[kind] += 1
+            self.injected_delay_seconds += delay
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self.calls} calls, {self.requests} requests "
+            f"(amplification {self.amplification:.2f}x)",
+            f"{self.retries} retries, {self.token_refreshes} token refreshes",
+            f"{self.extra_seconds:.3f}s extra latency: {self.failed_seconds:.3f}s failed "
+            f"attempts, {self.backoff_seconds:.3f}s backoff, "
+            f"{self.injected_delay_seconds:.3f}s slow responses",
+        ]
+        for kind, count in self.injected.most_common():
+            lines.append(f"{count:6d}  injected {kind}")
+        return "\n".join(lines)
+
+
+class FaultInjectionTransport(httpx.BaseTransport):
+    """Transport that makes a share of requests fail or slow down.
+
+    For each request one fault is drawn: an error status with the probability
+    given in ``status_rates`` (e.g. ``{502: 0.1, 429: 0.01}``), a 401 with
+    probability ``expired_token_rate``, or an ``httpx.ReadError`` with
+    probability ``reset_rate``. Independently, a response is delayed by
+    ``slow_seconds`` with probability ``slow_rate``. Login and token refresh
+    requests are only ever slowed down.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        inner: httpx.BaseTransport,
+        *,
+        status_rates: Optional[Mapping[int, float]] = None,
+        expired_token_rate: float = 0.0,
+        reset_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_seconds: float = 1.0,
+        seed: Optional[int] = None,
+        report: Optional[FaultReport] = None,
+    ):
+        self._faults: list[tuple[float, str]] = []
+        total = 0.0
+        for kind, rate in [
+            *((str(status), rate) for status, rate in (status_rates or {}).items()),
+            ("expired token", expired_token_rate),
+            ("reset", reset_rate),
+        ]:
+            if rate < 0:
+                raise ValueError(f"Rate of {kind!r} faults must not be negative")
+            if rate:
+                total += rate
+                self._faults.append((total, kind))
+        if total > 1:
+            raise ValueError("Fault rates must add up to at most 1")
+        if not 0 <= slow_rate <= 1:
+            raise ValueError("slow_rate must be between 0 and 1")
+        self.inner = inner
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.report = report if report is not None else FaultReport()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wrap(self, inner: httpx.BaseTransport) -> "FaultInjectionTransport":
+        """Inject faults in front of ``inner`` too, drawing from this transport's
+        random sequence and recording into its report."""
+        transport = copy.copy(self)
+        transport.inner = inner
+        return transport
+
+    def _draw(self) -> tuple[Optional[str], bool]:
+        with self._lock:
+            point = self._random.random()
+            slow = self._random.random() < self.slow_rate
+        for threshold, kind in self._faults:
+            if point < threshold:
+                return kind, slow
+        return None, slow
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        fault, slow = self._draw()
+        if slow:
+            self.report.record_fault("slow", self.slow_seconds)
+            time.sleep(self.slow_seconds)
+        if fault is None or request.url.path.startswith(_TOKEN_PREFIX):
+            return self.inner.handle_request(request)
+        self.report.record_fault(fault)
+        request.read()
+        if fault == "reset":
+            raise httpx.ReadError("Connection reset by peer (injected)", request=request)
+        if fault == "expired token":
+            return httpx.Response(
+                httpx.codes.UNAUTHORIZED,
+                json={"detail": "Given token not valid for any token type"},
+                request=request,
+            )
+        status = int(fault)
+        headers = {"Retry-After": "1"} if status == httpx.codes.TOO_MANY_REQUESTS else None
+        return httpx.Response(status, headers=headers, request=request)
+
+    def close(self) -> None:
+        self.inner.close()
@@ -38,12 +38,12 @@ class FieldsClientMixin(ClientCoreMixin):
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
         exercise_id = resolve_item_or_id(exercise)
-        return FormField.from_dict(
+        return self._build_item(
+            FormField,
             cast(
                 dict[str, Any],
                 self.get(
                     f"/api/core/course/exercises/{exercise_id}/fields/{field_id}/"
                 ),
             ),
-            hive_client=self,
         )
@@ -12,6 +12,12 @@ from ..src.types.help_ import Help
 from ..src.types.help_response import HelpResponse
 from ..src.types.user import UserLike
 from .client_shared import ClientCoreMixin
+from .help_watcher import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_INTERVAL_SECONDS,
+    DEFAULT_MIN_INTERVAL_SECONDS,
+    HelpWatcher,
+)
 from .utils import resolve_item_or_id
 
 if TYPE_CHECKING:
@@ -34,6 +40,8 @@ class HelpClientMixin(ClientCoreMixin):
         Retrieve a single help response by id for a given help request.
     get_help_response_student_files(help, response_id)
         Retrieve files attached to a specific help response (raw JSON).
+    watch_help_requests(...filters)
+        Create a ``HelpWatcher`` emitting created/updated/resolved events.
     """
 
     def get_help_requests(  # pylint: disable=too-many-arguments,too-many-locals
@@ -83,15 +91,39 @@ class HelpClientMixin(ClientCoreMixin):
             user__program__id__in=user__program__id__in,
         )
 
+    def watch_help_requests(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        max_interval: float = DEFAULT_MAX_INTERVAL_SECONDS,
+        backoff: float = DEFAULT_BACKOFF_FACTOR,
+        fetch_responses: bool = True,
+        emit_initial: bool = False,
+        **filters: Any,
+    ) -> HelpWatcher:
+        """Return a ``HelpWatcher`` polling ``get_help_requests(current=True, **filters)``.
+
+        The options are those of :class:`HelpWatcher`.
+        """
+        from ..client import HiveClient
+
+        assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
+        return HelpWatcher(
+            self,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            backoff=backoff,
+            fetch_responses=fetch_responses,
+            emit_initial=emit_initial,
+            **filters,
+        )
+
     def get_help_request(self, help_id: int) -> Help:
         """Return a single ``Help`` request by its id."""
         from ..client import HiveClient
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
-        return Help.from_dict(
-            self.get(f"/api/core/help/{help_id}/"),
-            hive_client=self,
-        )
+        return self._build_item(Help, self.get(f"/api/core/help/{help_id}/"))
 
     def get_help_responses(self, help_id: "HelpLike") -> Iterable[HelpResponse]:
         """Yield help responses for the given help request (by id or Help)."""
@@ -110,9 +142,9 @@ class HelpClientMixin(ClientCoreMixin):
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
         parent_id = resolve_item_or_id(help_id)
-        return HelpResponse.from_dict(
+        return self._build_item(
+            HelpResponse,
             self.get(f"/api/core/help/{parent_id}/responses/{response_id}/"),
-            hive_client=self,
         )
 
     def get_help_response_student_files(
@@ -0,0 +1,200 @@
+"""Adaptive-polling watcher for help requests.
+
+:class:`HelpWatcher` polls the help-request list, diffs every snapshot against
+the previous one and emits :class:`HelpEvent` objects for created, updated and
+resolved requests. The poll interval shrinks while there is activity and backs
+off exponentially while the desk is idle.
+"""
+
+import threading
+from collections.abc import Callable, Iterator
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Optional
+
+from attrs import define, field
+
+from ..src.types.enums.help_status_enum import HelpStatusEnum
+
+if TYPE_CHECKING:
+    from ..client import HiveClient
+    from ..src.types.help_ import Help
+    from ..src.types.help_response import HelpResponse
+
+DEFAULT_MIN_INTERVAL_SECONDS = 2.0
+DEFAULT_MAX_INTERVAL_SECONDS = 60.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+
+
+class HelpEventType(str, Enum):
+    """Kinds of changes reported by :class:`HelpWatcher`."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    RESOLVED = "resolved"
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+@define
+class HelpEvent:
+    """A change to a single help request.
+
+    Attributes:
+        type_: What happened to the help request.
+        help: The current state of the request (the last known state when it
+            disappeared from the polled list).
+        previous: The state seen on the previous poll, or None when created.
+        new_responses: Responses added since the previous poll.
+    """
+
+    type_: HelpEventType
+    help: "Help"
+    previous: "Help | None" = None
+    new_responses: list["HelpResponse"] = field(factory=list)
+
+
+def _fingerprint(help_: "Help") -> tuple[Any, ...]:
+    """Return the parts of a help request whose change is worth reporting."""
+    return (
+        help_.help_status,
+        help_.checker_id,
+        tuple(r.id for r in help_.responses),
+        tuple(n.id for n in help_.notifications),
+    )
+
+
+class HelpWatcher:
+    """Poll help requests with an adaptive interval and emit change events.
+
+    Events are delivered to registered callbacks and can also be consumed by
+    iterating over the watcher::
+
+        watcher = client.watch_help_requests()
+        watcher.add_callback(lambda event: print(event.type_, event.help.id))
+        for event in watcher:
+            ...
+
+    Requests that disappear from the polled list (``current=True`` only lists
+    open requests) or whose status becomes ``Resolved`` are reported as
+    :attr:`HelpEventType.RESOLVED`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        client: "HiveClient",
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        max_interval: float = DEFAULT_MAX_INTERVAL_SECONDS,
+        backoff: float = DEFAULT_BACKOFF_FACTOR,
+        fetch_responses: bool = True,
+        emit_initial: bool = False,
+        **filters: Any,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Expected 0 < min_interval <= max_interval")
+        if backoff < 1:
+            raise ValueError("backoff must be at least 1")
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.fetch_responses = fetch_responses
+        self.emit_initial = emit_initial
+        self.filters: dict[str, Any] = {"current": True, **filters}
+        self.interval = min_interval
+        self._snapshot: Optional[dict[int, "Help"]] = None
+        self._callbacks: list[Callable[[HelpEvent], None]] = []
+        self._stopped = threading.Event()
+
+    def add_callback(self, callback: Callable[[HelpEvent], None]) -> None:
+        """Call ``callback`` with every event emitted by :meth:`poll`."""
+        self._callbacks.append(callback)
+
+    def stop(self) -> None:
+        """Stop :meth:`run` / iteration after the current poll."""
+        self._stopped.set()
+
+    def poll(self) -> list[HelpEvent]:
+        """Poll once, update the adaptive interval and return the emitted events."""
+        current = {h.id: h for h in self.client.get_help_requests(**self.filters)}
+        previous = self._snapshot
+        self._snapshot = current
+
+        events: list[HelpEvent] = []
+        if previous is None:
+            if self.emit_initial:
+                events = [
+                    HelpEvent(HelpEventType.CREATED, h, None, self._new_responses(None, h))
+                    for h in current.values()
+                ]
+        else:
+            events = self._diff(previous, current)
+
+        if events:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+
+        for event in events:
+            for callback in self._callbacks:
+                callback(event)
+        return events
+
+    def _diff(
+        self, previous: dict[int, "Help"], current: dict[int, "Help"]
+    ) -> list[HelpEvent]:
+        events: list[HelpEvent] = []
+        for help_id, help_ in current.items():
+            old = previous.get(help_id)
+            if old is None:
+                events.append(
+                    HelpEvent(
+                        HelpEventType.CREATED,
+                        help_,
+                        None,
+                        self._new_responses(None, help_),
+                    )
+                )
+            elif _fingerprint(old) != _fingerprint(help_):
+                resolved = (
+                    help_.help_status == HelpStatusEnum.RESOLVED
+                    and old.help_status != HelpStatusEnum.RESOLVED
+                )
+                events.append(
+                    HelpEvent(
+                        HelpEventType.RESOLVED if resolved else HelpEventType.UPDATED,
+                        help_,
+                        old,
+                        self._new_responses(old, help_),
+                    )
+                )
+        for help_id, old in previous.items():
+            if help_id not in current and old.help_status != HelpStatusEnum.RESOLVED:
+                events.append(HelpEvent(HelpEventType.RESOLVED, old, old))
+        return events
+
+    def _new_responses(
+        self, old: "Help | None", help_: "Help"
+    ) -> list["HelpResponse"]:
+        """Fetch only the responses that were not present in ``old``."""
+        if not self.fetch_responses:
+            return []
+        known = set() if old is None else {r.id for r in old.responses}
+        return [
+            self.client.get_help_response(help_.id, r.id)
+            for r in help_.responses
+            if r.id not in known
+        ]
+
+    def run(self) -> None:
+        """Poll until :meth:`stop` is called, delivering events to callbacks."""
+        for _ in self:
+            pass
+
+    def __iter__(self) -> Iterator[HelpEvent]:
+        """Yield events as they are detected, sleeping ``interval`` between polls."""
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            yield from self.poll()
+            self._stopped.wait(self.interval)
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Iterable, Optional
 
 from ..src.types.module import Module, ModuleLike
 from .client_shared import ClientCoreMixin
+from .reference_cache import reference_cached
 from .utils import resolve_item_or_id
 
 if TYPE_CHECKING:
@@ -28,6 +29,7 @@ class ModuleClientMixin(ClientCoreMixin):
         Retrieve a single module record by id.
     """
 
+    @reference_cached
     def get_modules(  # pylint: disable=too-many-arguments,too-many-positional-arguments
         self,
         /,
@@ -80,10 +82,7 @@ class ModuleClientMixin(ClientCoreMixin):
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
         data = self.get(f"/api/core/course/modules/{module_id}/")
         assert isinstance(data, dict)
-        return Module.from_dict(
-            data,
-            hive_client=self,
-        )
+        return self._build_item(Module, data)
 
     def create_module(
         self,
@@ -96,7 +95,7 @@ class ModuleClientMixin(ClientCoreMixin):
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
 
-        return Module.from_dict(
+        module = Module.from_dict(
             self.post(
                 "/api/core/course/modules/",
                 {
@@ -108,6 +107,9 @@ class ModuleClientMixin(ClientCoreMixin):
             ),
             hive_client=self,
         )
+        self._invalidate_reference_cache("get_modules")
+        return module
 
     def delete_module(self, module: "ModuleLike") -> None:
         self.delete(f"/api/core/course/modules/{ resolve_item_or_id(module)}/")
+        self._invalidate_reference_cache("get_modules")
@@ -0,0 +1,166 @@
+"""Debug helper that detects N+1 fetches through lazy model properties.
+
+Lazy relationships such as ``Assignment.user`` or ``Queue.module`` fetch one
+object per access. Inside a loop that turns into one request per item.
+:class:`NPlusOneDetector` attributes every single-object GET to the model
+property and the call site that triggered it, and warns once a call site
+exceeds a threshold, or refuses to send the fetch that would exceed it.
+"""
+
+import os
+import sys
+import threading
+import warnings
+from types import FrameType
+from typing import TYPE_CHECKING, Literal, Optional
+
+from attrs import define
+
+from ..src.instrumentation import RequestEvent, RequestObserver, endpoint_template
+from ..src.types.core_item import HiveCoreItem
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(__file__)) + os.sep
+
+
+class NPlusOneWarning(UserWarning):
+    """Emitted when a call site fetches more related objects than allowed."""
+
+
+class NPlusOneError(RuntimeError):
+    """Raised instead of :class:`NPlusOneWarning` when ``action="raise"``."""
+
+
+@define
+class NPlusOneFinding:
+    """Single-object fetches caused by one lazy property at one call site.
+
+    Attributes:
+        property_: The lazy property, e.g. ``"Assignment.user"``.
+        call_site: ``"path/to/file.py:42"`` of the first frame outside pyhive.
+        count: Number of fetches seen so far.
+        suggestion: How to load the related objects in bulk instead.
+    """
+
+    property_: str
+    call_site: str
+    count: int
+    suggestion: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.property_} fetched {self.count} objects one at a time from "
+            f"{self.call_site}; {self.suggestion}"
+        )
+
+
+def _suggestion(getter: Optional[str], client: object) -> str:
+    if getter is not None and hasattr(client, getter + "s"):
+        return f"prefetch them with client.{getter}s(id__in=[...]) before the loop"
+    if getter is not None:
+        return f"avoid calling client.{getter}() once per item"
+    return "load the related objects in bulk before the loop"
+
+
+class NPlusOneDetector(RequestObserver):
+    """Count single-object fetches per lazy property and call site.
+
+    Only GET requests to ``.../{id}/`` endpoints issued from inside a property
+    of a model are counted. When a ``(property, call site)`` pair exceeds
+    ``threshold`` fetches, a :class:`NPlusOneWarning` is emitted (once per
+    pair). With ``action="raise"``, the fetch that would exceed the threshold
+    is not sent: :meth:`on_send` raises :class:`NPlusOneError` instead.
+    """
+
+    def __init__(
+        self,
+        client: object,
+        threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+        action: Literal["warn", "raise"] = "warn",
+    ) -> None:
+        if action not in ("warn", "raise"):
+            raise ValueError("action must be 'warn' or 'raise'")
+        self.client = client
+        self.threshold = threshold
+        self.action = action
+        self._lock = threading.Lock()
+        self._findings: dict[tuple[str, str], NPlusOneFinding] = {}
+
+    def on_send(self, request: "httpx.Request") -> None:
+        if self.action != "raise" or request.method != "GET":
+            return
+        if not endpoint_template(str(request.url)).endswith("{id}/"):
+            return
+        located = self._locate(sys._getframe(1))  # pylint: disable=protected-access
+        if located is None:
+            return
+        property_, filename, lineno, _ = located
+        with self._lock:
+            finding = self._findings.get((property_, f"{filename}:{lineno}"))
+            if finding is None or finding.count < self.threshold:
+                return
+        raise NPlusOneError(
+            f"{finding.property_} would fetch more than {self.threshold} objects one at a "
+            f"time from {finding.call_site}; {finding.suggestion}"
+        )
+
+    def on_request(self, event: RequestEvent) -> None:
+        if event.method != "GET" or event.attempt or not event.endpoint.endswith("{id}/"):
+            return
+        located = self._locate(sys._getframe(1))  # pylint: disable=protected-access
+        if located is None:
+            return
+        property_, filename, lineno, getter = located
+        call_site = f"{filename}:{lineno}"
+        with self._lock:
+            finding = self._findings.get((property_, call_site))
+            if finding is None:
+                finding = NPlusOneFinding(
+                    property_, call_site, 0, _suggestion(getter, self.client)
+                )
+                self._findings[(property_, call_site)] = finding
+            finding.count += 1
+            exceeded = finding.count == self.threshold + 1
+        if exceeded and self.action == "warn":
+            warnings.warn_explicit(str(finding), NPlusOneWarning, filename, lineno)
+
+    @staticmethod
+    def _locate(
+        frame: Optional[FrameType],
+    ) -> Optional[tuple[str, str, int, Optional[str]]]:
+        """Find the model property and outside call site of the current request."""
+        getter = None
+        while frame is not None:
+            owner = frame.f_locals.get("self")
+            if isinstance(owner, HiveCoreItem) and isinstance(
+                getattr(type(owner), frame.f_code.co_name, None), property
+            ):
+                property_ = f"{type(owner).__name__}.{frame.f_code.co_name}"
+                site = frame.f_back
+                while site is not None and site.f_code.co_filename.startswith(_PACKAGE_DIR):
+                    site = site.f_back
+                site = site or frame.f_back
+                assert site is not None
+                return property_, site.f_code.co_filename, site.f_lineno, getter
+            if owner is not None and frame.f_code.co_name.startswith("get_"):
+                getter = frame.f_code.co_name  # The client getter the property called
+            frame = frame.f_back
+        return None
+
+    def findings(self) -> list[NPlusOneFinding]:
+        """Return the pairs that exceeded the threshold, worst first."""
+        with self._lock:
+            return sorted(
+                (f for f in self._findings.values() if f.count > self.threshold),
+                key=lambda f: -f.count,
+            )
+
+    def report(self) -> str:
+        """Return a human readable summary of :meth:`findings`."""
+        findings = self.findings()
+        if not findings:
+            return "No N+1 fetches detected."
+        return "\n".join(str(f) for f in findings)
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Iterable, Optional
 
 from ..src.types.program import Program, ProgramLike
 from .client_shared import ClientCoreMixin
+from .reference_cache import reference_cached
 from .utils import resolve_item_or_id
 
 if TYPE_CHECKING:
@@ -28,6 +29,7 @@ class ProgramClientMixin(ClientCoreMixin):
         Retrieve a single program record by its id.
     """
 
+    @reference_cached
     def get_programs(
         self,
         id__in: Optional[list[int]] = None,
@@ -52,10 +54,7 @@ class ProgramClientMixin(ClientCoreMixin):
         from ..client import HiveClient
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
-        return Program.from_dict(
-            self.get(f"/api/core/course/programs/{program_id}/"),
-            hive_client=self,
-        )
+        return self._build_item(Program, self.get(f"/api/core/course/programs/{program_id}/"))
 
     def create_program(
         self,
@@ -109,8 +108,10 @@ class ProgramClientMixin(ClientCoreMixin):
             payload["hanich_schedule"] = hanich_schedule
 
         response = self.post("/api/core/course/programs/", payload)
+        self._invalidate_reference_cache("get_programs")
 
         return Program.from_dict(response, hive_client=self)
 
     def delete_program(self, program: "ProgramLike") -> None:
         self.delete(f"/api/core/course/programs/{resolve_item_or_id(program)}/")
+        self._invalidate_reference_cache("get_programs")
@@ -3,12 +3,13 @@
 Provides retrieval of queue records.
 """
 
-from typing import TYPE_CHECKING, Any, Optional, cast
+from typing import TYPE_CHECKING, Any, Iterable, Optional, cast
 
 from pyhive.client.utils import resolve_item_or_id
 
 from ..src.types.queue import Queue
 from .client_shared import ClientCoreMixin
+from .reference_cache import reference_cached
 
 if TYPE_CHECKING:
     from ..src.types.module import ModuleLike
@@ -19,14 +20,30 @@ if TYPE_CHECKING:
 class QueuesClientMixin(ClientCoreMixin):
     """Mixin that exposes queue retrieval endpoints."""
 
+    @reference_cached
+    def get_queues(
+        self,
+        *,
+        id__in: Optional[list[int]] = None,
+    ) -> Iterable[Queue]:
+        """Yield ``Queue`` objects, optionally filtered by ids."""
+        from ..client import HiveClient
+
+        assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
+        return self._get_core_items(
+            "/api/core/queues/",
+            Queue,
+            id__in=id__in,
+        )
+
     def get_queue(self, queue_id: int) -> Queue:
         """Return a single queue by ``queue_id``."""
         from ..client import HiveClient
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
-        return Queue.from_dict(
+        return self._build_item(
+            Queue,
             cast(dict[str, Any], self.get(f"/api/core/queues/{queue_id}/")),
-            hive_client=self,
         )
 
     def create_queue(
@@ -52,10 +69,13 @@ class QueuesClientMixin(ClientCoreMixin):
         if user is not None:
             payload["user"] = resolve_item_or_id(user)
 
-        return Queue.from_dict(
+        queue = Queue.from_dict(
             self.post("/api/core/queues/", payload),
             hive_client=self,
         )
+        self._invalidate_reference_cache("get_queues")
+        return queue
 
     def delete_queue(self, queue: "QueueLike") -> None:
         self.delete(f"/api/core/queues/{resolve_item_or_id(queue)}/")
+        self._invalidate_reference_cache("get_queues")
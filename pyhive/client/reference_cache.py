@@ -0,0 +1,179 @@
+"""Stale-while-revalidate cache for rarely changing reference data.
+
+Entries younger than the soft TTL are served as-is. Entries past the soft TTL
+are still served immediately while a background thread refreshes them; only
+entries past the hard TTL (or missing entries) block the caller on a reload.
+"""
+
+import functools
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast
+
+from attrs import define
+
+from ..src.types.core_item import HiveCoreItem
+
+if TYPE_CHECKING:
+    from .client_shared import ClientCoreMixin
+
+F = TypeVar("F", bound=Callable[..., Iterable[Any]])
+
+
+@define
+class _CacheEntry:
+    value: list[Any] | Callable[[], list[Any]]
+    fetched_at: float
+    refreshing: bool = False
+
+    def resolve(self) -> list[Any]:
+        """Return the value, materializing a lazily primed one first."""
+        if callable(self.value):
+            self.value = self.value()
+        return self.value
+
+
+class ReferenceCache:
+    """Thread-safe stale-while-revalidate cache keyed by call signature."""
+
+    def __init__(
+        self,
+        soft_ttl: float,
+        hard_ttl: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if hard_ttl is not None and hard_ttl < soft_ttl:
+            raise ValueError("hard_ttl must not be shorter than soft_ttl")
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self._clock = clock
+        self._entries: dict[Hashable, _CacheEntry] = {}
+        # Bumped by ``invalidate`` so loads that started earlier are not stored.
+        self._generations: dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], list[Any]]) -> list[Any]:
+        """Return the cached value for ``key``, loading/refreshing it as needed."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generations.setdefault(key, 0)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < self.soft_ttl:
+                    return entry.resolve()
+                if self.hard_ttl is None or age < self.hard_ttl:
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, loader, generation, now),
+                            name="pyhive-cache-refresh",
+                            daemon=True,
+                        ).start()
+                    return entry.resolve()
+
+        value = loader()
+        self._store(key, value, generation, now)
+        return value
+
+    def put(self, key: Hashable, value: list[Any], fetched_at: Optional[float] = None) -> None:
+        """Store ``value`` for ``key`` (as fetched at ``fetched_at``, default now)."""
+        with self._lock:
+            self._entries[key] = _CacheEntry(
+                value, self._clock() if fetched_at is None else fetched_at
+            )
+
+    def prime(
+        self, key: Hashable, loader: Callable[[], list[Any]], fetched_at: float
+    ) -> None:
+        """Store a lazily materialized value for ``key`` fetched at ``fetched_at``.
+
+        ``loader`` is called on the first access that is served from the cache.
+        """
+        with self._lock:
+            self._entries[key] = _CacheEntry(loader, fetched_at)
+
+    def items(self) -> list[tuple[Hashable, list[Any], float]]:
+        """Return ``(key, value, fetched_at)`` for every entry, materializing it."""
+        with self._lock:
+            return [
+                (key, entry.resolve(), entry.fetched_at)
+                for key, entry in self._entries.items()
+            ]
+
+    def _store(
+        self, key: Hashable, value: list[Any], generation: int, started_at: float
+    ) -> None:
+        """Store a loaded value unless ``key`` was invalidated since the load started.
+
+        The entry is stamped with the time the load started, so data read
+        before a concurrent write is not treated as younger than it is.
+        """
+        with self._lock:
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = _CacheEntry(value, started_at)
+
+    def _refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], list[Any]],
+        generation: int,
+        started_at: float,
+    ) -> None:
+        try:
+            value = loader()
+        except Exception:  # pylint: disable=broad-except
+            # Keep serving the stale value; the next access retries the refresh.
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+            return
+        self._store(key, value, generation, started_at)
+
+    def invalidate(self, method_name: Optional[str] = None) -> None:
+        """Drop all entries, or only those cached for ``method_name``.
+
+        Loads of the dropped keys that are still in flight are not stored.
+        """
+        with self._lock:
+            keys = [
+                k
+                for k in {*self._entries, *self._generations}
+                if method_name is None or k[0] == method_name  # type: ignore[index]
+            ]
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn call arguments into a hashable cache-key component."""
+    if isinstance(value, HiveCoreItem):
+        return (type(value).__name__, getattr(value, "id", None))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return cast(Hashable, value)
+
+
+def reference_cached(method: F) -> F:
+    """Decorator: serve a list method through the client's ``ReferenceCache``.
+
+    The wrapped method is called (and fully consumed) only on cache misses and
+    refreshes. Without a configured cache the method is called directly.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "ClientCoreMixin", *args: Any, **kwargs: Any) -> Iterable[Any]:
+        cache = self._reference_cache  # pylint: disable=protected-access
+        if cache is None:
+            return method(self, *args, **kwargs)
+        key = (method.__name__, _freeze(args), _freeze(kwargs))
+        return iter(cache.get(key, lambda: list(method(self, *args, **kwargs))))
+
+    return cast("F", wrapper)
@@ -0,0 +1,194 @@
+"""On-disk snapshots of cached reference data for fast warm starts.
+
+A snapshot file is laid out as::
+
+    magic (8 bytes) | format version (u16) | header length (u32) | header | blocks
+
+The header is UTF-8 JSON describing every cached listing: the method and call
+arguments it was cached for, the model type, and the offset/length of its
+block. Each block is a zlib-compressed JSON array of the models' ``to_dict()``
+output. Loading reads the whole file eagerly, but only decompresses a block
+the first time its listing is requested, rebuilding the models against the
+live client.
+"""
+
+import json
+import os
+import struct
+import time
+import zlib
+from collections.abc import Hashable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from ..src import json_backend
+from ..src.types.class_ import Class
+from ..src.types.core_item import HiveCoreItem
+from ..src.types.exercise import Exercise
+from ..src.types.module import Module
+from ..src.types.program import Program
+from ..src.types.queue import Queue
+from ..src.types.subject import Subject
+from ..src.types.user import User
+
+if TYPE_CHECKING:
+    from ..client import HiveClient
+
+SNAPSHOT_MAGIC = b"PYHIVESN"
+SNAPSHOT_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<8sHI")
+
+SNAPSHOT_METHODS: dict[str, type[HiveCoreItem]] = {
+    "get_programs": Program,
+    "get_subjects": Subject,
+    "get_modules": Module,
+    "get_exercises": Exercise,
+    "get_users": User,
+    "get_classes": Class,
+    "get_queues": Queue,
+}
+
+
+def _thaw(value: Any) -> Hashable:
+    """Turn JSON-decoded key components back into the tuples used as cache keys."""
+    if isinstance(value, list):
+        return tuple(_thaw(v) for v in value)
+    return value
+
+
+def save_snapshot(client: "HiveClient", path: str | os.PathLike[str]) -> None:
+    """Write every cached reference listing of ``client`` to ``path``.
+
+    The unfiltered listing of each method in ``SNAPSHOT_METHODS`` is fetched
+    first if it is not cached yet, so the snapshot always covers the full course
+    tree, users, classes and queues.
+    """
+    cache = client._reference_cache  # pylint: disable=protected-access
+    now_wall = time.time()
+    listings: dict[Hashable, tuple[list[HiveCoreItem], float]] = {}
+    if cache is not None:
+        now_clock = cache._clock()  # pylint: disable=protected-access
+        for key, value, fetched_at in cache.items():
+            if key[0] in SNAPSHOT_METHODS:  # type: ignore[index]
+                listings[key] = (value, now_wall - (now_clock - fetched_at))
+    for method_name in SNAPSHOT_METHODS:
+        key = (method_name, (), ())
+        if key not in listings:
+            listings[key] = (list(getattr(client, method_name)()), now_wall)
+
+    entries: list[dict[str, Any]] = []
+    blocks: list[bytes] = []
+    offset = 0
+    for (method_name, args, kwargs), (items, fetched_at) in listings.items():  # type: ignore[misc]
+        try:
+            encoded_key = json.dumps([args, kwargs])
+        except TypeError:
+            continue  # Keyed on arguments that cannot round-trip through JSON.
+        block = zlib.compress(json_backend.dumps([item.to_dict() for item in items]))
+        entries.append(
+            {
+                "method": method_name,
+                "key": encoded_key,
+                "fetched_at": fetched_at,
+                "count": len(items),
+                "offset": offset,
+                "length": len(block),
+            }
+        )
+        blocks.append(block)
+        offset += len(block)
+
+    header = json.dumps(
+        {
+            "hive_url": client.hive_url,
+            "username": client.username,
+            "created_at": now_wall,
+            "entries": entries,
+        }
+    ).encode("UTF-8")
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)))
+        file.write(header)
+        for block in blocks:
+            file.write(block)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot_header(path: str | os.PathLike[str]) -> dict[str, Any]:
+    """Return the JSON header of the snapshot at ``path`` without reading blocks.
+
+    Raises:
+        ValueError: If the file is not a snapshot or uses an unknown format version.
+    """
+    with open(path, "rb") as file:
+        return _parse_header(file.read(_PREAMBLE.size), file.read, path)[0]
+
+
+def _parse_header(
+    preamble: bytes, read: Callable[[int], bytes], path: str | os.PathLike[str]
+) -> tuple[dict[str, Any], int]:
+    if len(preamble) != _PREAMBLE.size:
+        raise ValueError(f"{path} is not a pyhive snapshot")
+    magic, version, header_length = _PREAMBLE.unpack(preamble)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a pyhive snapshot")
+    if version != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot format version {version} in {path} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+    header = json.loads(read(header_length).decode("UTF-8"))
+    return header, _PREAMBLE.size + header_length
+
+
+def load_snapshot(client: "HiveClient", path: str | os.PathLike[str]) -> int:
+    """Prime ``client``'s reference cache from the snapshot at ``path``.
+
+    The file is read in full up front; its blocks are kept compressed and are
+    decompressed and parsed only when their listing is first served. Entries
+    keep their original fetch time, so listings older than the cache's soft TTL
+    are refreshed in the background on first use.
+
+    Returns:
+        The number of listings primed.
+    """
+    cache = client._reference_cache  # pylint: disable=protected-access
+    if cache is None:
+        raise RuntimeError("Loading a snapshot requires the reference cache to be enabled")
+
+    data = Path(path).read_bytes()
+    header, data_start = _parse_header(
+        data[: _PREAMBLE.size],
+        lambda n: data[_PREAMBLE.size : _PREAMBLE.size + n],
+        path,
+    )
+    blocks = []
+    for entry in header["entries"]:
+        if entry["method"] in SNAPSHOT_METHODS:
+            start = data_start + entry["offset"]
+            blocks.append((entry, data[start : start + entry["length"]]))
+
+    def make_loader(method: str, block: bytes) -> Callable[[], list[Any]]:
+        model = SNAPSHOT_METHODS[method]
+
+        def loader() -> list[Any]:
+            return [
+                model.from_dict(item, hive_client=client)
+                for item in json_backend.loads(zlib.decompress(block))
+            ]
+
+        return loader
+
+    now_wall = time.time()
+    now_clock = cache._clock()  # pylint: disable=protected-access
+    for entry, block in blocks:
+        args, kwargs = json.loads(entry["key"])
+        cache.prime(
+            (entry["method"], _thaw(args), _thaw(kwargs)),
+            make_loader(entry["method"], block),
+            now_clock - (now_wall - entry["fetched_at"]),
+        )
+    return len(blocks)
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Iterable, Optional
 
 from ..src.types.subject import Subject, SubjectLike
 from .client_shared import ClientCoreMixin
+from .reference_cache import reference_cached
 from .utils import resolve_item_or_id
 
 if TYPE_CHECKING:
@@ -27,6 +28,7 @@ class SubjectClientMixin(ClientCoreMixin):
         Retrieve a single subject record by its id.
     """
 
+    @reference_cached
     def get_subjects(
         self,
         parent_program__id__in: Optional[list[int]] = None,
@@ -63,10 +65,7 @@ class SubjectClientMixin(ClientCoreMixin):
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
         data = self.get(f"/api/core/course/subjects/{subject_id}/")
         assert isinstance(data, dict)
-        return Subject.from_dict(
-            data,
-            hive_client=self,
-        )
+        return self._build_item(Subject, data)
 
     def create_subject(
         self,
@@ -95,9 +94,11 @@ class SubjectClientMixin(ClientCoreMixin):
         }
 
         response = self.post("/api/core/course/subjects/", payload)
+        self._invalidate_reference_cache("get_subjects")
 
         return Subject.from_dict(response, hive_client=self)
 
     def delete_subject(self, subject: "SubjectLike") -> None:
         assert subject is not None, "Cannot delete None subject!"
         self.delete(f"/api/core/course/subjects/{resolve_item_or_id(subject)}/")
+        self._invalidate_reference_cache("get_subjects")
@@ -0,0 +1,225 @@
+"""Batched model updates: collect changed users and classes and PATCH them together.
+
+See ``HiveClient.unit_of_work``. Changes are kept per object, keyed by model
+type and id, so several changes to one object (through one or more instances,
+or by id) are sent as a single PATCH when the unit of work is flushed.
+"""
+
+import contextvars
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Literal, Optional, get_args
+
+from attrs import define, field
+
+from ..src.types.class_ import Class
+from ..src.types.core_item import HiveCoreItem
+from ..src.types.user import User
+from .bulk import RateLimiter
+from .utils import resolve_item_or_id
+
+if TYPE_CHECKING:
+    from ..src.types.queue import QueueLike
+    from ..src.types.user import UserLike
+    from . import HiveClient
+
+UnitOfWorkStatus = Literal["saved", "unchanged", "failed"]
+
+# Model type -> (name in results, item endpoint, reference cache to invalidate)
+_MODELS: dict[type[HiveCoreItem], tuple[str, str, str]] = {
+    User: ("user", "/api/core/management/users/{}/", "get_users"),
+    Class: ("class", "/api/core/management/classes/{}/", "get_classes"),
+}
+
+
+@define
+class UnitOfWorkResult:
+    """Outcome of one object flushed by a unit of work.
+
+    Attributes:
+        kind: ``"user"`` or ``"class"``.
+        id: The object's id.
+        status: ``"saved"``; ``"unchanged"`` when the object was collected but
+            had nothing left to send; ``"failed"`` when the request failed or
+            its response could not be read.
+        changes: The fields sent, by API name.
+        item: The object as returned by the server, when saved.
+        error: What went wrong, for failed updates.
+    """
+
+    kind: str
+    id: int
+    status: UnitOfWorkStatus
+    changes: dict[str, Any] = field(factory=dict)
+    item: Optional[HiveCoreItem] = None
+    error: Optional[Exception] = None
+
+
+@define
+class UnitOfWorkReport:
+    """Per-object results of a flush, in the order the objects were collected."""
+
+    results: list[UnitOfWorkResult] = field(factory=list)
+
+    @property
+    def saved(self) -> list[HiveCoreItem]:
+        """Objects updated by the flush, as returned by the server."""
+        return [r.item for r in self.results if r.item is not None]
+
+    @property
+    def errors(self) -> list[UnitOfWorkResult]:
+        """Results of failed updates."""
+        return [r for r in self.results if r.error is not None]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every update succeeded."""
+        return not self.errors
+
+    def counts(self) -> dict[str, int]:
+        """Number of objects per status."""
+        return dict(Counter(r.status for r in self.results))
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __str__(self) -> str:
+        counts = self.counts()
+        lines = [", ".join(f"{counts.get(s, 0)} {s}" for s in get_args(UnitOfWorkStatus))]
+        for result in self.errors:
+            lines.append(f"  {result.kind} {result.id}: {result.error}")
+        return "\n".join(lines)
+
+
+@define
+class _Pending:
+    items: list[HiveCoreItem] = field(factory=list)
+    changes: dict[str, Any] = field(factory=dict)
+    # Collected by add() or by id, rather than only by the change listener.
+    explicit: bool = False
+
+
+class UnitOfWork:
+    """Users and classes with unsaved changes, sent as one PATCH per object.
+
+    While the unit of work is active, users and classes of its client are
+    collected as soon as one of their fields is assigned; :meth:`add` collects
+    others explicitly. Changes made by id only, without loading the object,
+    go through :meth:`set_users_queue` and :meth:`set_users_mentor`; where
+    they and a loaded instance set the same field, the instance wins.
+    """
+
+    def __init__(
+        self,
+        client: "HiveClient",
+        *,
+        concurrency: int = 8,
+        rate_limit: Optional[float] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.client = client
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.report: Optional[UnitOfWorkReport] = None
+        self._pending: dict[tuple[type[HiveCoreItem], int], _Pending] = {}
+        self._lock = threading.Lock()
+
+    def add(self, *items: HiveCoreItem) -> None:
+        """Collect ``items``; their changes are sent on :meth:`flush`."""
+        for item in items:
+            self._add(item, explicit=True)
+
+    def _add(self, item: HiveCoreItem, *, explicit: bool) -> None:
+        if type(item) not in _MODELS:
+            raise TypeError(f"Cannot batch updates of {type(item).__name__}")
+        with self._lock:
+            pending = self._pending.setdefault((type(item), item.id), _Pending())
+            pending.explicit = pending.explicit or explicit
+            if not any(other is item for other in pending.items):
+                pending.items.append(item)
+
+    def set_users_queue(self, user: "UserLike", queue: "QueueLike") -> None:
+        """Set the queue of ``user`` when the unit of work is flushed."""
+        self._set(User, user, "queue_id", resolve_item_or_id(queue))
+
+    def set_users_mentor(self, user: "UserLike", mentor: "UserLike") -> None:
+        """Set the mentor of ``user`` when the unit of work is flushed."""
+        self._set(User, user, "mentor_id", resolve_item_or_id(mentor))
+
+    def _set(self, model: type[HiveCoreItem], item: Any, name: str, value: Any) -> None:
+        if isinstance(item, model):
+            setattr(item, name, value)
+            self.add(item)
+            return
+        with self._lock:
+            pending = self._pending.setdefault((model, item), _Pending(explicit=True))
+            pending.changes[model.api_name(name)] = value
+
+    def _collect(self, item: HiveCoreItem) -> None:
+        """Change listener: collect items of this client's supported models.
+
+        Items collected only this way are left out of the report if they have
+        nothing to send at flush time, e.g. because they were saved directly.
+        """
+        if type(item) in _MODELS and getattr(item, "hive_client", None) is self.client:
+            self._add(item, explicit=False)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> UnitOfWorkReport:
+        """Send the collected changes, ``concurrency`` objects at a time.
+
+        A failed update does not stop the others; its instances keep their
+        changes, so they can be saved again. Returns (and keeps in
+        :attr:`report`) the result of every collected object.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        limiter = RateLimiter(self.rate_limit) if self.rate_limit is not None else None
+
+        def send(
+            model: type[HiveCoreItem], item_id: int, changes: dict[str, Any], entry: _Pending
+        ) -> UnitOfWorkResult:
+            kind, endpoint, _ = _MODELS[model]
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                response = self.client.patch(endpoint.format(item_id), changes)
+                updated = model.from_dict(response, hive_client=self.client)
+            except Exception as exc:  # pylint: disable=broad-except
+                return UnitOfWorkResult(kind, item_id, "failed", changes, error=exc)
+            for item in entry.items:
+                item.mark_clean()
+            return UnitOfWorkResult(kind, item_id, "saved", changes, item=updated)
+
+        results: list[Optional[UnitOfWorkResult]] = [None] * len(pending)
+        jobs = []
+        for index, ((model, item_id), entry) in enumerate(pending.items()):
+            changes = dict(entry.changes)
+            for item in entry.items:
+                changes.update(item.changes())
+            if changes:
+                jobs.append((index, (model, item_id, changes, entry)))
+            elif entry.explicit:
+                results[index] = UnitOfWorkResult(_MODELS[model][0], item_id, "unchanged")
+
+        try:
+            with ThreadPoolExecutor(
+                min(self.concurrency, max(len(jobs), 1)), thread_name_prefix="pyhive-uow"
+            ) as pool:
+                futures = [
+                    # Copy the context so tracing spans nest under this call.
+                    (index, pool.submit(contextvars.copy_context().run, send, *args))
+                    for index, args in jobs
+                ]
+                for index, future in futures:
+                    results[index] = future.result()
+        finally:
+            self.client._invalidate_reference_cache(  # pylint: disable=protected-access
+                *{_MODELS[model][2] for model, _ in pending}
+            )
+        self.report = UnitOfWorkReport([result for result in results if result is not None])
+        return self.report
@@ -3,6 +3,12 @@
 Provides listing and retrieval of user records from the management API.
 """
 
+import contextlib
+import contextvars
+import os
+from collections import deque
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any, Iterable, Optional, cast
 
 from pyhive.src.types.enums.gender_enum import GenderEnum
@@ -11,7 +17,9 @@ from pyhive.src.types.enums.status_enum import StatusEnum
 from ..client.utils import resolve_item_or_id
 from ..src.types.enums.clearance_enum import ClearanceEnum
 from ..src.types.user import User
+from .bulk import BulkCreateReport, BulkJournal, BulkUserResult, RateLimiter
 from .client_shared import ClientCoreMixin
+from .reference_cache import reference_cached
 
 if TYPE_CHECKING:
     from ..src.types.class_ import ClassLike
@@ -20,9 +28,104 @@ if TYPE_CHECKING:
     from ..src.types.user import UserLike
 
 
+def _user_payload(  # pylint: disable=too-many-arguments, too-many-locals, too-many-branches
+    username: str,
+    password: str,
+    *,
+    clearance: ClearanceEnum,
+    gender: GenderEnum,
+    number: Optional[int] = None,
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    mentees: Optional[list["UserLike"]] = None,
+    status: StatusEnum = StatusEnum.PRESENT,
+    avatar_filename: Optional[str] = None,
+    program: Optional["ProgramLike"] = None,
+    checkers_brief: Optional[str] = None,
+    mentor: Optional["UserLike"] = None,
+    classes: Optional[list["ClassLike"]] = None,
+    queue: Optional["QueueLike"] = None,
+    disable_queue: Optional[bool] = None,
+    user_queue: Optional["QueueLike"] = None,
+    disable_user_queue: Optional[bool] = None,
+    override_queue: Optional["QueueLike"] = None,
+    confirmed: Optional[bool] = None,
+    teacher: Optional[bool] = None,
+    hostname: Optional[str] = None,
+) -> dict[str, object]:
+    """Build the body of a user creation request and check Hive's HANICH constraints.
+
+    Raises ``TypeError`` when the fields violate ``hanich_required_fields``.
+    """
+    payload: dict[str, object] = {
+        "username": username,
+        "password": password,
+        "clearance": clearance,
+        "gender": gender,
+        "status": status,
+    }
+
+    # Only add optional fields if they are not None
+    if number is not None:
+        payload["number"] = number
+    if first_name is not None:
+        payload["first_name"] = first_name
+    if last_name is not None:
+        payload["last_name"] = last_name
+
+    if mentees is None:
+        mentees = []
+    payload["mentees"] = [resolve_item_or_id(m) for m in mentees]
+
+    if avatar_filename is not None:
+        payload["avatar_filename"] = avatar_filename
+    if program is not None:
+        payload["program"] = resolve_item_or_id(program)
+    if checkers_brief is not None:
+        payload["checkers_brief"] = checkers_brief
+    if mentor is not None:
+        payload["mentor"] = resolve_item_or_id(mentor)
+    if classes is not None:
+        payload["classes"] = [resolve_item_or_id(c) for c in classes]
+    if queue is not None:
+        payload["queue"] = resolve_item_or_id(queue)
+    if disable_queue is not None:
+        payload["disable_queue"] = disable_queue
+    if user_queue is not None:
+        payload["user_queue"] = resolve_item_or_id(user_queue)
+    if disable_user_queue is not None:
+        payload["disable_user_queue"] = disable_user_queue
+    if override_queue is not None:
+        payload["override_queue"] = resolve_item_or_id(override_queue)
+    if confirmed is not None:
+        payload["confirmed"] = confirmed
+    if teacher is not None:
+        payload["teacher"] = teacher
+    if hostname is not None:
+        payload["hostname"] = hostname
+
+    # To comply with Hive's "hanich_required_fields" constraint
+    if payload.get("clearance", None) != ClearanceEnum.HANICH and (
+        any(payload.get(k, None) is not None for k in ("number", "program"))
+        or payload.get("teacher", False)
+    ):
+        raise TypeError(
+            "A user which is not a HANICH must not be associated with a program, nor have a number, nor be a teacher!" # pylint: disable=line-too-long
+        )
+    if payload.get("clearance", None) == ClearanceEnum.HANICH and (
+        any(payload.get(k, None) is None for k in ("number", "program"))
+    ):
+        raise TypeError(
+            "A user which is a HANICH must be associated with a program and have a number!"
+        )
+
+    return payload
+
+
 class UserClientMixin(ClientCoreMixin):
     """Mixin that exposes user management endpoints (list, get, me)."""
 
+    @reference_cached
     def get_users(  # pylint: disable=too-many-arguments
         self,
         *,
@@ -57,9 +160,9 @@ class UserClientMixin(ClientCoreMixin):
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
 
-        return User.from_dict(
+        return self._build_item(
+            User,
             cast(dict[str, Any], self.get(f"/api/core/management/users/{user_id}/")),
-            hive_client=self,
         )
 
     def get_user_me(self) -> User:  # pragma: no cover
@@ -175,7 +278,7 @@ class UserClientMixin(ClientCoreMixin):
 
         return students_perfect_match[0] if len(students_perfect_match) == 1 else None
 
-    def create_user( # pylint: disable=too-many-arguments, too-many-locals, too-many-branches
+    def create_user( # pylint: disable=too-many-arguments, too-many-locals
         self,
         username: str,
         password: str,
@@ -205,74 +308,173 @@ class UserClientMixin(ClientCoreMixin):
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
 
-        payload: dict[str, object] = {
-            "username": username,
-            "password": password,
-            "clearance": clearance,
-            "gender": gender,
-            "status": status,
-        }
-
-        # Only add optional fields if they are not None
-        if number is not None:
-            payload["number"] = number
-        if first_name is not None:
-            payload["first_name"] = first_name
-        if last_name is not None:
-            payload["last_name"] = last_name
-
-        if mentees is None:
-            mentees = []
-        payload["mentees"] = [resolve_item_or_id(m) for m in mentees]
-
-        if avatar_filename is not None:
-            payload["avatar_filename"] = avatar_filename
-        if program is not None:
-            payload["program"] = resolve_item_or_id(program)
-        if checkers_brief is not None:
-            payload["checkers_brief"] = checkers_brief
-        if mentor is not None:
-            payload["mentor"] = resolve_item_or_id(mentor)
-        if classes is not None:
-            payload["classes"] = [resolve_item_or_id(c) for c in classes]
-        if queue is not None:
-            payload["queue"] = resolve_item_or_id(queue)
-        if disable_queue is not None:
-            payload["disable_queue"] = disable_queue
-        if user_queue is not None:
-            payload["user_queue"] = resolve_item_or_id(user_queue)
-        if disable_user_queue is not None:
-            payload["disable_user_queue"] = disable_user_queue
-        if override_queue is not None:
-            payload["override_queue"] = resolve_item_or_id(override_queue)
-        if confirmed is not None:
-            payload["confirmed"] = confirmed
-        if teacher is not None:
-            payload["teacher"] = teacher
-        if hostname is not None:
-            payload["hostname"] = hostname
-
-        # To comply with Hive's "hanich_required_fields" constraint
-        if payload.get("clearance", None) != ClearanceEnum.HANICH and (
-            any(payload.get(k, None) is not None for k in ("number", "program"))
-            or payload.get("teacher", False)
-        ):
-            raise TypeError(
-                "A user which is not a HANICH must not be associated with a program, nor have a number, nor be a teacher!" # pylint: disable=line-too-long
-            )
-        if payload.get("clearance", None) == ClearanceEnum.HANICH and (
-            any(payload.get(k, None) is None for k in ("number", "program"))
-        ):
-            raise TypeError(
-                "A user which is a HANICH must be associated with a program and have a number!"
-            )
-
+        payload = _user_payload(
+            username,
+            password,
+            clearance=clearance,
+            gender=gender,
+            number=number,
+            first_name=first_name,
+            last_name=last_name,
+            mentees=mentees,
+            status=status,
+            avatar_filename=avatar_filename,
+            program=program,
+            checkers_brief=checkers_brief,
+            mentor=mentor,
+            classes=classes,
+            queue=queue,
+            disable_queue=disable_queue,
+            user_queue=user_queue,
+            disable_user_queue=disable_user_queue,
+            override_queue=override_queue,
+            confirmed=confirmed,
+            teacher=teacher,
+            hostname=hostname,
+        )
         response = self.post("/api/core/management/users/", payload)
+        self._invalidate_reference_cache("get_users")
 
         return User.from_dict(response, hive_client=self)
 
+    def bulk_create_users(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        *,
+        concurrency: int = 8,
+        rate_limit: Optional[float] = None,
+        journal: Optional[str | os.PathLike[str] | BulkJournal] = None,
+    ) -> BulkCreateReport:
+        """Create many users concurrently; one failure does not stop the rest.
+
+        Each record holds the keyword arguments of :meth:`create_user`. Every
+        record is validated (including the HANICH constraints) before it is
+        sent; invalid records and duplicate usernames are reported and
+        skipped. The rest are posted by ``concurrency`` threads, at most
+        ``rate_limit`` per second if given.
+
+        With a ``journal`` path, progress is appended to that file as JSON
+        lines. Running again with the same journal skips the users it lists
+        as created, and users that already exist on the server (created just
+        before an interruption) are reported as ``"skipped"``. Pass an open
+        ``BulkJournal`` instead to share one journal between several calls.
+        """
+        return BulkCreateReport(
+            list(
+                self.iter_bulk_create_users(
+                    records, concurrency=concurrency, rate_limit=rate_limit, journal=journal
+                )
+            )
+        )
+
+    def iter_bulk_create_users(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        *,
+        concurrency: int = 8,
+        rate_limit: Optional[float] = None,
+        journal: Optional[str | os.PathLike[str] | BulkJournal] = None,
+    ) -> Iterator[BulkUserResult]:
+        """Like :meth:`bulk_create_users`, but yield each record's result, in input order.
+
+        ``records`` is read as results are consumed, at most ``2 * concurrency``
+        records ahead, so a long input is streamed through one thread pool and
+        one rate limit without being held in memory.
+        """
+        from ..client import HiveClient
+
+        assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
+
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        limiter = RateLimiter(rate_limit) if rate_limit is not None else None
+        with contextlib.ExitStack() as stack:
+            # Runs last: after the pool finished and the journal was closed.
+            stack.callback(self._invalidate_reference_cache, "get_users")
+            if journal is not None and not isinstance(journal, BulkJournal):
+                journal = stack.enter_context(BulkJournal(journal))
+            existing = self._existing_bulk_users(journal)
+            seen: set[str] = set()
+            pool = stack.enter_context(
+                ThreadPoolExecutor(concurrency, thread_name_prefix="pyhive-bulk")
+            )
+            in_flight: deque[Future[BulkUserResult]] = deque()
+            for index, record in enumerate(records):
+                username = str(record.get("username", ""))
+                checked = self._check_bulk_record(index, username, record, existing, seen, journal)
+                if isinstance(checked, BulkUserResult):
+                    future: Future[BulkUserResult] = Future()
+                    future.set_result(checked)
+                else:
+                    future = pool.submit(
+                        # Copy the context so tracing spans nest under this call.
+                        contextvars.copy_context().run,
+                        self._bulk_create_user, index, username, checked, limiter, journal,
+                    )
+                in_flight.append(future)
+                while in_flight and (in_flight[0].done() or len(in_flight) > 2 * concurrency):
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    def _existing_bulk_users(self, journal: Optional[BulkJournal]) -> dict[str, int]:
+        """Ids by username of the users a bulk creation with ``journal`` skips."""
+        if journal is None:
+            return {}
+        if journal.resumed and journal.server_users is None:
+            self._invalidate_reference_cache("get_users")
+            journal.server_users = {u.username: u.id for u in self.get_users()}
+        return {**(journal.server_users or {}), **journal.created}
+
+    @staticmethod
+    def _check_bulk_record(  # pylint: disable=too-many-arguments
+        index: int,
+        username: str,
+        record: Mapping[str, Any],
+        existing: dict[str, int],
+        seen: set[str],
+        journal: Optional[BulkJournal],
+    ) -> BulkUserResult | dict[str, object]:
+        """The payload to post for ``record``, or its result if it is not to be sent."""
+        if username in existing:
+            result = BulkUserResult(index, username, "skipped", user_id=existing[username])
+            if journal is not None and username not in journal.created:
+                journal.write(result)
+            return result
+        try:
+            if username in seen:
+                raise ValueError(f"Duplicate username {username!r} in batch")
+            payload = _user_payload(**record)
+        except (TypeError, ValueError) as exc:
+            return BulkUserResult(index, username, "invalid", error=exc)
+        seen.add(username)
+        return payload
+
+    def _bulk_create_user(  # pylint: disable=too-many-arguments
+        self,
+        index: int,
+        username: str,
+        payload: dict[str, object],
+        limiter: Optional[RateLimiter],
+        journal: Optional[BulkJournal],
+    ) -> BulkUserResult:
+        """Post one validated record of a bulk creation and journal the outcome."""
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            response = self.post("/api/core/management/users/", payload)
+            user = User.from_dict(response, hive_client=self)
+        except Exception as exc:  # pylint: disable=broad-except
+            result = BulkUserResult(index, username, "failed", error=exc)
+        else:
+            result = BulkUserResult(index, username, "created", user=user, user_id=user.id)
+        if journal is not None:
+            journal.write(result)
+        return result
+
     def delete_user(self, user: "UserLike") -> None:
         self.delete(f"/api/core/management/users/{resolve_item_or_id(user)}/", True)
+        self._invalidate_reference_cache("get_users")
 
     def create_student(
         self,
@@ -325,15 +527,43 @@ class UserClientMixin(ClientCoreMixin):
 
         assert isinstance(self, HiveClient), "self must be an instance of HiveClient"
 
-        return User.from_dict(
+        updated = User.from_dict(
             self.put(
                 f"/api/core/management/users/{resolve_item_or_id(user)}/",
                 user.to_dict(),
             ),
             hive_client=self,
         )
+        user.mark_clean()
+        self._invalidate_reference_cache("get_users")
+        return updated
+
+    def save_user(self, user: User) -> User:
+        """Send only the fields of ``user`` changed since it was loaded, as a PATCH.
+
+        Returns ``user`` itself, without a request, if nothing changed.
+        """
+        changes = user.changes()
+        if not changes:
+            return user
+        updated = User.from_dict(
+            self.patch(f"/api/core/management/users/{user.id}/", changes),
+            hive_client=self,
+        )
+        user.mark_clean()
+        self._invalidate_reference_cache("get_users")
+        return updated
 
     def set_users_queue(self, user: "UserLike", queue: "QueueLike") -> User:
-        full_user = user if isinstance(user, User) else self.get_user(user)
-        full_user.queue_id = resolve_item_or_id(queue)
-        return self.update_user(full_user)
+        queue_id = resolve_item_or_id(queue)
+        updated = User.from_dict(
+            self.patch(
+                f"/api/core/management/users/{resolve_item_or_id(user)}/", {"queue": queue_id}
+            ),
+            hive_client=self,
+        )
+        if isinstance(user, User):
+            user.queue_id = queue_id
+            user.mark_clean("queue_id")
+        self._invalidate_reference_cache("get_users")
+        return updated
@@ -4,17 +4,47 @@ Provides access to the Hive server version information.
 """
 
 import re
+from typing import Any, Optional
 
+from ..src.json_stream import find_json_value
 from .client_shared import ClientCoreMixin
 
+SCHEMA_ENDPOINT = "/api/core/schema/"
+
 
 class VersionClientMixin(ClientCoreMixin):
     """Mixin that exposes the server-version endpoint."""
 
+    _hive_version: Optional[str] = None
+
     def get_hive_version(self) -> str:
-        """Return the Hive server version string (e.g., '1.2.3')."""
-        data = self.get("/api/core/schema/")
-        version = data.get("info", {}).get("version", "")
+        """Return the Hive server version string (e.g., '1.2.3').
+
+        The schema document is streamed and parsed only up to ``info.version``;
+        the whole document is downloaded only if that fails. The result is
+        remembered for the lifetime of the client.
+        """
+        if self._hive_version is not None:
+            return self._hive_version
+        try:
+            version = self._probe_hive_version()
+        except ValueError:
+            # Not parseable incrementally (e.g. not JSON); read the whole document.
+            data = self.get(SCHEMA_ENDPOINT)
+            version = data.get("info", {}).get("version", "")
         if not isinstance(version, str) or not re.match(r"^\d+\.\d+\.\d+", version):
             raise ValueError("Invalid version string received from server")
+        self._hive_version = version
         return version
+
+    def _probe_hive_version(self) -> Optional[Any]:
+        """Stream the schema and return ``info.version``, or None if it is missing.
+
+        Raises:
+            ValueError: If the schema could not be parsed incrementally.
+        """
+        response = self._get_stream(SCHEMA_ENDPOINT)
+        try:
+            return find_json_value(response.iter_bytes(), ("info", "version"))
+        finally:
+            response.close()
@@ -0,0 +1,67 @@
+"""On-disk cache of verified Hive server versions.
+
+Short-lived scripts can skip the version request entirely when the server at
+the same base URL was verified recently. Entries are stored per base URL in a
+small JSON file and expire after a TTL.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+
+def default_version_cache_path() -> Path:
+    """Return ``$XDG_CACHE_HOME/pyhive/versions.json`` (``~/.cache`` by default)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pyhive" / "versions.json"
+
+
+class VersionCache:
+    """JSON file mapping Hive base URLs to their last verified API version."""
+
+    def __init__(
+        self,
+        ttl: float,
+        path: Optional[str | os.PathLike[str]] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.path = Path(path) if path is not None else default_version_cache_path()
+        self._clock = clock
+
+    def _read(self) -> dict[str, dict[str, object]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="UTF-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, hive_url: str) -> Optional[str]:
+        """Return the cached version for ``hive_url`` unless missing or expired."""
+        entry = self._read().get(hive_url)
+        if not isinstance(entry, dict):
+            return None
+        version, checked_at = entry.get("version"), entry.get("checked_at")
+        if not isinstance(version, str) or not isinstance(checked_at, (int, float)):
+            return None
+        if self._clock() - checked_at >= self.ttl:
+            return None
+        return version
+
+    def put(self, hive_url: str, version: str) -> None:
+        """Record ``version`` as verified for ``hive_url`` now.
+
+        Failures to write the cache are ignored; it is only an optimization.
+        """
+        data = self._read()
+        data[hive_url] = {"version": version, "checked_at": self._clock()}
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data), encoding="UTF-8")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
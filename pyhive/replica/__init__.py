@@ -0,0 +1,9 @@
+"""Local SQLite replica of Hive course and user data.
+
+Use :class:`HiveReplica` to mirror reference data into a local database and
+query it without hitting the Hive server.
+"""
+
+from .replica import HiveReplica, SyncStats
+
+__all__ = ["HiveReplica", "SyncStats"]
@@ -0,0 +1,472 @@
+"""SQLite-backed replica of Hive reference data.
+
+The replica mirrors programs, subjects, modules, exercises, classes, users,
+queues and assignments into a local SQLite database. Every row stores the
+model's ``to_dict()`` JSON together with a digest and a handful of indexed
+columns used by the query API. Reads never touch the Hive server and return
+the regular model classes bound to the live client.
+
+Assignments are synchronized incrementally: after the first full sync only
+rows updated since the stored ``last_staff_updated`` watermark are fetched.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+from attrs import define
+
+from ..src.types.assignment import Assignment
+from ..src.types.class_ import Class
+from ..src.types.common import isoparse
+from ..src.types.core_item import HiveCoreItem
+from ..src.types.exercise import Exercise
+from ..src.types.module import Module
+from ..src.types.program import Program
+from ..src.types.queue import Queue
+from ..src.types.subject import Subject
+from ..src.types.user import User
+
+if TYPE_CHECKING:
+    from ..client import HiveClient
+
+
+@define(frozen=True)
+class _Resource:
+    """Describes how a single Hive resource is fetched and stored."""
+
+    table: str
+    model: type[HiveCoreItem]
+    fetch: Callable[["HiveClient"], Iterable[Any]]
+    columns: dict[str, Callable[[Any], Any]]
+    watermark: Optional[Callable[[Any], str]] = None
+    fetch_since: Optional[
+        Callable[["HiveClient", datetime.datetime], Iterable[Any]]
+    ] = None
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    return value if isinstance(value, int) else None
+
+
+RESOURCES: dict[str, _Resource] = {
+    "programs": _Resource(
+        "programs",
+        Program,
+        lambda client: client.get_programs(),
+        {"name": lambda p: p.name},
+    ),
+    "subjects": _Resource(
+        "subjects",
+        Subject,
+        lambda client: client.get_subjects(),
+        {"parent_program_id": lambda s: s.parent_program_id},
+    ),
+    "modules": _Resource(
+        "modules",
+        Module,
+        lambda client: client.get_modules(),
+        {"parent_subject_id": lambda m: m.parent_subject_id},
+    ),
+    "exercises": _Resource(
+        "exercises",
+        Exercise,
+        lambda client: client.get_exercises(),
+        {
+            "parent_module_id": lambda e: e.parent_module_id,
+            "parent_subject_id": lambda e: e.parent_subject_id,
+        },
+    ),
+    "classes": _Resource(
+        "classes",
+        Class,
+        lambda client: client.get_classes(),
+        {"program_id": lambda c: c.program_id, "name": lambda c: c.name},
+    ),
+    "users": _Resource(
+        "users",
+        User,
+        lambda client: client.get_users(),
+        {
+            "username": lambda u: u.username,
+            "clearance": lambda u: int(u.clearance),
+            "program_id": lambda u: _optional_int(u.program_id),
+            "mentor_id": lambda u: _optional_int(u.mentor_id),
+        },
+    ),
+    "queues": _Resource(
+        "queues",
+        Queue,
+        lambda client: client.get_queues(),
+        {
+            "program_id": lambda q: q.program_id,
+            "module_id": lambda q: _optional_int(q.module_id),
+            "user_id": lambda q: _optional_int(q.user_id),
+        },
+    ),
+    "assignments": _Resource(
+        "assignments",
+        Assignment,
+        lambda client: client.get_assignments(),
+        {
+            "user_id": lambda a: a.user_id,
+            "exercise_id": lambda a: a.exercise_id,
+            "checker_id": lambda a: a.checker_id,
+            "assignment_status": lambda a: a.assignment_status.value,
+            "last_staff_updated": lambda a: a.last_staff_updated.isoformat(),
+        },
+        watermark=lambda a: a.last_staff_updated.isoformat(),
+        fetch_since=lambda client, since: client.get_assignments_updated_since(since),
+    ),
+}
+
+#: How far before the stored watermark incremental syncs start re-reading rows.
+INCREMENTAL_RESCAN_WINDOW = datetime.timedelta(minutes=5)
+
+
+@define
+class SyncStats:
+    """Outcome of synchronizing a single resource.
+
+    Attributes:
+        resource: Name of the synchronized resource (table).
+        fetched: Number of rows received from the server.
+        inserted: Rows that were not present locally before.
+        updated: Rows whose content changed since the previous sync.
+        deleted: Local rows which no longer exist on the server.
+        seconds: Wall-clock duration of the sync.
+    """
+
+    resource: str
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    seconds: float = 0.0
+
+
+class HiveReplica:
+    """Local SQLite mirror of Hive course and user data.
+
+    Example::
+
+        with HiveClient(USERNAME, PASSWORD, HIVE_URL) as client:
+            replica = HiveReplica(client, "hive.sqlite3")
+            replica.sync()
+            students = list(replica.get_users(program_id=42, clearance=1))
+    """
+
+    def __init__(
+        self,
+        client: "HiveClient",
+        path: str | os.PathLike[str] = ":memory:",
+    ) -> None:
+        self.client = client
+        self.path = path
+        self._connection = sqlite3.connect(os.fspath(path))
+        self._create_schema()
+
+    def __enter__(self) -> "HiveReplica":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self._connection.close()
+
+    def _create_schema(self) -> None:
+        with self._connection:
+            for resource in RESOURCES.values():
+                columns = "".join(f", {name}" for name in resource.columns)
+                self._connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {resource.table} "
+                    f"(id INTEGER PRIMARY KEY, data TEXT NOT NULL, digest TEXT NOT NULL{columns})"
+                )
+                for name in resource.columns:
+                    self._connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS ix_{resource.table}_{name} "
+                        f"ON {resource.table} ({name})"
+                    )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state "
+                "(resource TEXT PRIMARY KEY, synced_at REAL NOT NULL, watermark TEXT)"
+            )
+
+    # ------------------------------------------------------------------
+    # Synchronization
+    # ------------------------------------------------------------------
+
+    def sync(
+        self, resources: Optional[Sequence[str]] = None, *, full: bool = False
+    ) -> list[SyncStats]:
+        """Synchronize the given resources (default: all) with the server.
+
+        Only rows whose serialized content changed are written. Resources with a
+        watermark (assignments) only fetch recently updated rows unless ``full``
+        is set; full syncs also remove rows which disappeared from the server.
+        """
+        names = list(RESOURCES) if resources is None else list(resources)
+        unknown = set(names) - set(RESOURCES)
+        if unknown:
+            raise ValueError(f"Unknown replica resources: {sorted(unknown)}")
+        return [self._sync_resource(RESOURCES[name], full=full) for name in names]
+
+    def _sync_resource(self, resource: _Resource, *, full: bool) -> SyncStats:
+        started = time.perf_counter()
+        stats = SyncStats(resource.table)
+        known: dict[int, str] = dict(
+            self._connection.execute(f"SELECT id, digest FROM {resource.table}")
+        )
+        seen: set[int] = set()
+        watermark = self.watermark(resource.table)
+
+        items: Iterable[Any]
+        incremental = (
+            not full and resource.fetch_since is not None and watermark is not None
+        )
+        if incremental:
+            assert resource.fetch_since is not None and watermark is not None
+            items = resource.fetch_since(
+                self.client, isoparse(watermark) - INCREMENTAL_RESCAN_WINDOW
+            )
+        else:
+            items = resource.fetch(self.client)
+            watermark = None
+
+        column_names = ", ".join(["id", "data", "digest", *resource.columns])
+        placeholders = ", ".join("?" * (3 + len(resource.columns)))
+        upsert = (
+            f"INSERT OR REPLACE INTO {resource.table} ({column_names}) "
+            f"VALUES ({placeholders})"
+        )
+
+        with self._connection:
+            for item in items:
+                stats.fetched += 1
+                seen.add(item.id)
+                if resource.watermark is not None:
+                    mark = resource.watermark(item)
+                    watermark = mark if watermark is None else max(watermark, mark)
+                data = json.dumps(item.to_dict(), sort_keys=True, separators=(",", ":"))
+                digest = hashlib.sha1(data.encode("utf-8")).hexdigest()
+                previous = known.get(item.id)
+                if previous == digest:
+                    continue
+                if previous is None:
+                    stats.inserted += 1
+                else:
+                    stats.updated += 1
+                self._connection.execute(
+                    upsert,
+                    (
+                        item.id,
+                        data,
+                        digest,
+                        *(extract(item) for extract in resource.columns.values()),
+                    ),
+                )
+
+            if not incremental:
+                removed = [(item_id,) for item_id in known if item_id not in seen]
+                stats.deleted = len(removed)
+                self._connection.executemany(
+                    f"DELETE FROM {resource.table} WHERE id = ?", removed
+                )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state (resource, synced_at, watermark) "
+                "VALUES (?, ?, ?)",
+                (resource.table, time.time(), watermark),
+            )
+
+        stats.seconds = time.perf_counter() - started
+        return stats
+
+    def last_synced(self, resource: str) -> Optional[float]:
+        """Return the UNIX timestamp of the last sync of ``resource``, if any."""
+        row = self._connection.execute(
+            "SELECT synced_at FROM sync_state WHERE resource = ?", (resource,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def watermark(self, resource: str) -> Optional[str]:
+        """Return the stored high-water mark (e.g. ``last_staff_updated``) of ``resource``."""
+        row = self._connection.execute(
+            "SELECT watermark FROM sync_state WHERE resource = ?", (resource,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _select(
+        self,
+        resource_name: str,
+        *,
+        extra_where: Optional[tuple[str, Sequence[Any]]] = None,
+        **filters: Any,
+    ) -> Iterator[Any]:
+        resource = RESOURCES[resource_name]
+        clauses: list[str] = []
+        params: list[Any] = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name != "id" and name not in resource.columns:
+                raise ValueError(f"Cannot filter {resource_name} by {name!r}")
+            if isinstance(value, (list, tuple, set, frozenset)):
+                values = list(value)
+                clauses.append(f"{name} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        if extra_where is not None:
+            clauses.append(extra_where[0])
+            params.extend(extra_where[1])
+
+        query = f"SELECT data FROM {resource.table}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id"
+
+        for (data,) in self._connection.execute(query, params):
+            yield resource.model.from_dict(json.loads(data), hive_client=self.client)
+
+    def _get_one(self, resource_name: str, item_id: int) -> Any:
+        for item in self._select(resource_name, id=item_id):
+            return item
+        raise KeyError(f"{resource_name[:-1].capitalize()} {item_id} is not in the replica")
+
+    def get_programs(self, *, name: Optional[str] = None) -> Iterator[Program]:
+        """Yield replicated programs, optionally filtered by name."""
+        return self._select("programs", name=name)
+
+    def get_program(self, program_id: int) -> Program:
+        """Return a replicated program by id."""
+        return self._get_one("programs", program_id)
+
+    def get_subjects(
+        self, *, parent_program_id: Optional[int | Sequence[int]] = None
+    ) -> Iterator[Subject]:
+        """Yield replicated subjects, optionally filtered by program."""
+        return self._select("subjects", parent_program_id=parent_program_id)
+
+    def get_subject(self, subject_id: int) -> Subject:
+        """Return a replicated subject by id."""
+        return self._get_one("subjects", subject_id)
+
+    def get_modules(
+        self, *, parent_subject_id: Optional[int | Sequence[int]] = None
+    ) -> Iterator[Module]:
+        """Yield replicated modules, optionally filtered by subject."""
+        return self._select("modules", parent_subject_id=parent_subject_id)
+
+    def get_module(self, module_id: int) -> Module:
+        """Return a replicated module by id."""
+        return self._get_one("modules", module_id)
+
+    def get_exercises(
+        self,
+        *,
+        parent_module_id: Optional[int | Sequence[int]] = None,
+        parent_subject_id: Optional[int | Sequence[int]] = None,
+    ) -> Iterator[Exercise]:
+        """Yield replicated exercises, optionally filtered by module/subject."""
+        return self._select(
+            "exercises",
+            parent_module_id=parent_module_id,
+            parent_subject_id=parent_subject_id,
+        )
+
+    def get_exercise(self, exercise_id: int) -> Exercise:
+        """Return a replicated exercise by id."""
+        return self._get_one("exercises", exercise_id)
+
+    def get_classes(
+        self,
+        *,
+        program_id: Optional[int | Sequence[int]] = None,
+        name: Optional[str] = None,
+    ) -> Iterator[Class]:
+        """Yield replicated classes, optionally filtered by program/name."""
+        return self._select("classes", program_id=program_id, name=name)
+
+    def get_class(self, class_id: int) -> Class:
+        """Return a replicated class by id."""
+        return self._get_one("classes", class_id)
+
+    def get_users(
+        self,
+        *,
+        program_id: Optional[int | Sequence[int]] = None,
+        mentor_id: Optional[int | Sequence[int]] = None,
+        clearance: Optional[int | Sequence[int]] = None,
+        username: Optional[str] = None,
+    ) -> Iterator[User]:
+        """Yield replicated users filtered by the indexed columns."""
+        return self._select(
+            "users",
+            program_id=program_id,
+            mentor_id=mentor_id,
+            clearance=clearance,
+            username=username,
+        )
+
+    def get_user(self, user_id: int) -> User:
+        """Return a replicated user by id."""
+        return self._get_one("users", user_id)
+
+    def get_queues(
+        self,
+        *,
+        program_id: Optional[int | Sequence[int]] = None,
+        module_id: Optional[int | Sequence[int]] = None,
+        user_id: Optional[int | Sequence[int]] = None,
+    ) -> Iterator[Queue]:
+        """Yield replicated queues filtered by program/module/user."""
+        return self._select(
+            "queues", program_id=program_id, module_id=module_id, user_id=user_id
+        )
+
+    def get_queue(self, queue_id: int) -> Queue:
+        """Return a replicated queue by id."""
+        return self._get_one("queues", queue_id)
+
+    def get_assignments(
+        self,
+        *,
+        user_id: Optional[int | Sequence[int]] = None,
+        exercise_id: Optional[int | Sequence[int]] = None,
+        checker_id: Optional[int | Sequence[int]] = None,
+        assignment_status: Optional[str | Sequence[str]] = None,
+        updated_since: Optional[str] = None,
+    ) -> Iterator[Assignment]:
+        """Yield replicated assignments.
+
+        ``updated_since`` is an ISO-8601 timestamp compared against
+        ``last_staff_updated``.
+        """
+        return self._select(
+            "assignments",
+            extra_where=(
+                None
+                if updated_since is None
+                else ("last_staff_updated > ?", [updated_since])
+            ),
+            user_id=user_id,
+            exercise_id=exercise_id,
+            checker_id=checker_id,
+            assignment_status=assignment_status,
+        )
+
+    def get_assignment(self, assignment_id: int) -> Assignment:
+        """Return a replicated assignment by id."""
+        return self._get_one("assignments", assignment_id)
@@ -6,6 +6,7 @@ HTTP calls and an internal ``_AuthenticatedHiveClient`` which wraps an
 """
 
 import functools
+import threading
 import time
 from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast
@@ -13,13 +14,20 @@ from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast
 import httpx
 from httpx import HTTPStatusError
 
+from . import json_backend
+from .instrumentation import RequestEvent, RequestObserver, endpoint_template
+
 if TYPE_CHECKING:
     from httpx._types import ProxyTypes
 
+    from .token_store import TokenStore
+    from .tracing import Tracer
+
 F = TypeVar("F", bound=Callable[..., httpx.Response])
 
 MAX_RETRIES_ON_SERVER_ERRORS = 5
 INITIAL_BACKOFF_SECONDS = 0.5
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
 
 
 def _retry_on_bad_gateway(func: F) -> F:
@@ -37,9 +45,15 @@ def _retry_on_bad_gateway(func: F) -> F:
             raise ValueError("MAX_RETRIES_ON_SERVER_ERRORS must be greater than 0")
         response = None
         for attempt in range(MAX_RETRIES_ON_SERVER_ERRORS):
+            start = time.perf_counter()
             response = func(self, *args, **kwargs)
+            if self._request_observers:  # pylint: disable=protected-access
+                self._notify_request(  # pylint: disable=protected-access
+                    response, time.perf_counter() - start, attempt
+                )
             if response.status_code != httpx.codes.BAD_GATEWAY.value:
                 return response
+            response.close()
             if attempt < MAX_RETRIES_ON_SERVER_ERRORS - 1:
                 time.sleep(delay)
                 delay *= 2
@@ -59,30 +73,60 @@ def _refresh_token_on_unauthorized(func: F) -> F:
 
     @functools.wraps(func)
     def wrapper(self: "AuthenticatedHiveClient", *args: Any, **kwargs: Any):
+        self._ensure_ready()  # pylint: disable=protected-access
+        used_token = self._access_token  # pylint: disable=protected-access
         response = func(self, *args, **kwargs)
         if response.status_code == httpx.codes.UNAUTHORIZED.value:
-            self._refresh_access_token()  # pylint: disable=protected-access
+            response.close()
+            self._refresh_access_token(  # pylint: disable=protected-access
+                used_token, endpoint_template(str(response.request.url))
+            )
             response = func(self, *args, **kwargs)
         if response.status_code == httpx.codes.BAD_REQUEST.value:
+            response.read()
             raise HTTPStatusError(
-                f"Bad request! {response.json()}",
+                f"Bad request! {json_backend.loads(response.content)}",
                 request=response.request,
                 response=response,
             )
+        if response.is_error:
+            response.read()  # Releases the connection of a streamed response
         response.raise_for_status()
         return response
 
     return cast("F", wrapper)
 
 
+def _traced_request(func: F) -> F:
+    """Decorator: record a span around the whole HTTP call while tracing.
+
+    Attempts made by the retry decorator become child spans (the tracer is a
+    request observer).
+    """
+
+    http_method = func.__name__.lstrip("_").split("_")[0].upper()
+
+    @functools.wraps(func)
+    def wrapper(self: "AuthenticatedHiveClient", endpoint: str, *args: Any, **kwargs: Any):
+        tracer = self._tracer  # pylint: disable=protected-access
+        if tracer is None:
+            return func(self, endpoint, *args, **kwargs)
+        with tracer.span(f"{http_method} {endpoint_template(endpoint)}") as span:
+            response = func(self, endpoint, *args, **kwargs)
+            span.attributes["status_code"] = response.status_code
+            return response
+
+    return cast("F", wrapper)
+
+
 def _with_retries_and_token_refresh(func: F) -> F:
-    """Compose the retry and token-refresh decorators.
+    """Compose the tracing, retry and token-refresh decorators.
 
     Use this to wrap HTTP methods so they automatically handle transient
     502 errors and expired access tokens.
     """
 
-    return _refresh_token_on_unauthorized(_retry_on_bad_gateway(func))
+    return _traced_request(_refresh_token_on_unauthorized(_retry_on_bad_gateway(func)))
 
 
 class AuthenticatedHiveClient:
@@ -91,6 +135,12 @@ class AuthenticatedHiveClient:
     _refresh_token: str
     _access_token: str
     _session: httpx.Client
+    _token_lock: threading.Lock
+    _pending_login: Optional[tuple[str, str]] = None
+    _token_store: Optional["TokenStore"] = None
+    _fallback_credentials: Optional[tuple[str, str]] = None
+    _request_observers: tuple[RequestObserver, ...] = ()
+    _tracer: Optional["Tracer"] = None
     username: str
 
     def __init__(  # pylint: disable=too-many-arguments
@@ -103,6 +153,8 @@ class AuthenticatedHiveClient:
         headers: dict[str, str] | None = None,
         verify: bool | str | None = None,
         proxy: Optional["ProxyTypes"],
+        lazy_login: bool = False,
+        token_store: Optional["TokenStore"] = None,
         **kwargs: Any,
     ) -> None:
         """Create an authenticated client.
@@ -112,9 +164,17 @@ class AuthenticatedHiveClient:
 
         Typed kwargs provided (timeout, headers, verify) take precedence; the
         rest are forwarded from ``kwargs``.
+
+        With ``lazy_login`` the login request is postponed until the first
+        request is made.
+
+        With a ``token_store`` a still-valid stored token is reused (or
+        refreshed) instead of logging in, and new tokens are written back.
         """
         self.username = username
         self.hive_url = hive_url
+        self._token_lock = threading.Lock()
+        self._token_store = token_store
 
         client_kwargs: dict[str, Any] = {}
         if timeout is not None:
@@ -128,12 +188,98 @@ class AuthenticatedHiveClient:
 
         # Include any other httpx.Client kwargs passed in **kwargs
         client_kwargs.update(kwargs)
+        event_hooks = dict(client_kwargs.get("event_hooks") or {})
+        event_hooks["request"] = [*event_hooks.get("request", []), self._notify_send]
+        client_kwargs["event_hooks"] = event_hooks
 
         self._session = httpx.Client(
             base_url=hive_url,
             **client_kwargs,
         ).__enter__()
-        self._login(username, password)
+        if lazy_login:
+            self._pending_login = (username, password)
+        else:
+            self._authenticate(username, password)
+
+    def add_request_observer(self, observer: RequestObserver) -> None:
+        """Report every request, token refresh and parsed item to ``observer``."""
+        self._request_observers = (*self._request_observers, observer)
+
+    def remove_request_observer(self, observer: RequestObserver) -> None:
+        """Stop reporting to ``observer``."""
+        self._request_observers = tuple(
+            o for o in self._request_observers if o is not observer
+        )
+
+    def _notify_send(self, request: httpx.Request) -> None:
+        for observer in self._request_observers:
+            observer.on_send(request)
+
+    def _notify_request(
+        self, response: httpx.Response, seconds: float, attempt: int
+    ) -> None:
+        request = response.request
+        try:
+            bytes_out = len(request.content)
+        except httpx.RequestNotRead:
+            bytes_out = 0
+        event = RequestEvent(
+            method=request.method,
+            url=str(request.url),
+            endpoint=endpoint_template(str(request.url)),
+            status_code=response.status_code,
+            seconds=seconds,
+            bytes_in=response.num_bytes_downloaded
+            or int(response.headers.get("Content-Length", 0)),
+            bytes_out=bytes_out,
+            attempt=attempt,
+        )
+        for observer in self._request_observers:
+            observer.on_request(event)
+
+    def _ensure_ready(self) -> None:
+        """Finish any deferred initialization before a request is sent.
+
+        Performs the postponed login of a ``lazy_login`` client.
+        """
+        if self._pending_login is None:
+            return
+        with self._token_lock:
+            if self._pending_login is None:
+                return
+            username, password = self._pending_login
+            if self._tracer is None:
+                self._authenticate(username, password)
+            else:
+                with self._tracer.span("login"):
+                    self._authenticate(username, password)
+            self._pending_login = None
+
+    def _authenticate(self, username: str, password: str) -> None:
+        """Obtain tokens from the token store if possible, else by logging in."""
+        if self._token_store is None:
+            self._login(username, password)
+            return
+        # Kept so a rejected stored token can be replaced by a fresh login.
+        self._fallback_credentials = (username, password)
+        access, refresh = self._token_store.load(self.hive_url, username)
+        if access is not None:
+            self._access_token = access
+            self._refresh_token = refresh or ""
+            self._session.headers.update({"Authorization": f"Bearer {access}"})
+        elif refresh is not None:
+            self._refresh_token = refresh
+            self._refresh_tokens()
+        else:
+            self._login(username, password)
+
+    def _set_tokens(self, access: str, refresh: str) -> None:
+        """Install a new token pair on the session and persist it if configured."""
+        self._access_token = access
+        self._refresh_token = refresh
+        self._session.headers.update({"Authorization": f"Bearer {access}"})
+        if self._token_store is not None:
+            self._token_store.save(self.hive_url, self.username, access, refresh)
 
     def _login(self, username: str, password: str) -> None:
         """Perform an authentication request and store access/refresh tokens.
@@ -143,31 +289,53 @@ class AuthenticatedHiveClient:
 
         response = self._session.post(
             "/api/core/token/",
-            json={"username": username, "password": password},
+            content=json_backend.dumps({"username": username, "password": password}),
+            headers=_JSON_CONTENT_TYPE,
         )
         response.raise_for_status()
-        data = response.json()
-        self._access_token = data["access"]
-        self._refresh_token = data["refresh"]
+        data = json_backend.loads(response.content)
+        self._set_tokens(data["access"], data["refresh"])
 
-        self._session.headers.update({"Authorization": f"Bearer {self._access_token}"})
-
-    def _refresh_access_token(self) -> None:
+    def _refresh_access_token(
+        self, expired_token: Optional[str] = None, endpoint: Optional[str] = None
+    ) -> None:
         """Refresh the access token using the stored refresh token.
 
         Updates the stored access and refresh tokens and the session header.
+        When ``expired_token`` is given and another thread already replaced it,
+        the refresh is skipped. ``endpoint`` is the template of the request
+        that was answered with 401, reported to the observers.
+        """
+
+        with self._token_lock:
+            if expired_token is not None and expired_token != self._access_token:
+                return
+            if self._tracer is None:
+                self._refresh_tokens()
+            else:
+                with self._tracer.span("token refresh"):
+                    self._refresh_tokens()
+        for observer in self._request_observers:
+            observer.on_token_refresh(endpoint)
+
+    def _refresh_tokens(self) -> None:
+        """Exchange the refresh token for new tokens; the caller holds the lock.
+
+        A rejected refresh token falls back to a password login when the
+        credentials were kept for the token store.
         """
 
         response = self._session.post(
             "/api/core/token/refresh/",
-            json={"refresh": self._refresh_token},
+            content=json_backend.dumps({"refresh": self._refresh_token}),
+            headers=_JSON_CONTENT_TYPE,
         )
+        if response.is_client_error and self._fallback_credentials is not None:
+            self._login(*self._fallback_credentials)
+            return
         response.raise_for_status()
-        data = response.json()
-        self._access_token = data["access"]
-        self._refresh_token = data["refresh"]
-
-        self._session.headers.update({"Authorization": f"Bearer {self._access_token}"})
+        data = json_backend.loads(response.content)
+        self._set_tokens(data["access"], data["refresh"])
 
     @_with_retries_and_token_refresh
     def _get(
@@ -182,6 +350,20 @@ class AuthenticatedHiveClient:
             endpoint, params=params, headers={"Accept": "application/json"}
         )
 
+    @_with_retries_and_token_refresh
+    def _get_stream(
+        self, endpoint: str, params: httpx.QueryParams | None = None
+    ) -> httpx.Response:
+        """Low-level GET whose body is streamed instead of read up front.
+
+        The caller must close the returned response.
+        """
+
+        request = self._session.build_request(
+            "GET", endpoint, params=params, headers={"Accept": "application/json"}
+        )
+        return self._session.send(request, stream=True)
+
     @_with_retries_and_token_refresh
     def _post(self, endpoint: str, data: dict[Any, Any]) -> httpx.Response:
         """Low-level POST that returns an :class:`httpx.Response` with JSON body.
@@ -189,7 +371,9 @@ class AuthenticatedHiveClient:
         The ``data`` is JSON-encoded into the request body.
         """
 
-        return self._session.post(endpoint, json=data)
+        return self._session.post(
+            endpoint, content=json_backend.dumps(data), headers=_JSON_CONTENT_TYPE
+        )
 
     @_with_retries_and_token_refresh
     def _patch(self, endpoint: str, data: dict[Any, Any]) -> httpx.Response:
@@ -198,7 +382,9 @@ class AuthenticatedHiveClient:
         The ``data`` is JSON-encoded into the request body.
         """
 
-        return self._session.patch(endpoint, json=data)
+        return self._session.patch(
+            endpoint, content=json_backend.dumps(data), headers=_JSON_CONTENT_TYPE
+        )
 
     @_with_retries_and_token_refresh
     def _delete(self, endpoint: str) -> httpx.Response:
@@ -213,7 +399,9 @@ class AuthenticatedHiveClient:
         The ``data`` is JSON-encoded into the request body.
         """
 
-        return self._session.put(endpoint, json=data)
+        return self._session.put(
+            endpoint, content=json_backend.dumps(data), headers=_JSON_CONTENT_TYPE
+        )
 
     def get(
         self, endpoint: str, params: httpx.QueryParams | None = None
@@ -223,7 +411,7 @@ class AuthenticatedHiveClient:
         This calls the decorated ``_get`` helper and returns its JSON body.
         """
 
-        return self._get(endpoint, params).json()
+        return json_backend.loads(self._get(endpoint, params).content)
 
     def post(self, endpoint: str, data: dict[Any, Any]) -> dict[str, Any]:
         """High-level POST that returns parsed JSON from the response.
@@ -239,13 +427,13 @@ class AuthenticatedHiveClient:
             # If status code is 400, raise with response JSON
             if exc.response.status_code == 400:
                 try:
-                    error_json = exc.response.json()
+                    error_json = json_backend.loads(exc.response.content)
                 except Exception: # pylint: disable=broad-except
                     error_json = exc.response.text
                 raise ValueError(f"HTTP 400 Error: {error_json}") from exc
             # Otherwise, re-raise the original HTTP error
             raise
-        return resp.json()
+        return json_backend.loads(resp.content)
 
     def delete(self, endpoint: str, force: bool = False) -> None: # pylint: disable=unused-argument
         response = self._delete(endpoint)
@@ -253,4 +441,8 @@ class AuthenticatedHiveClient:
             raise RuntimeError("Failed to delete!")
 
     def put(self, endpoint: str, data: dict[Any, Any]) -> dict[Any, Any]:
-        return self._put(endpoint, data).json()
+        return json_backend.loads(self._put(endpoint, data).content)
+
+    def patch(self, endpoint: str, data: dict[Any, Any]) -> dict[Any, Any]:
+        """High-level PATCH that returns parsed JSON from the response."""
+        return json_backend.loads(self._patch(endpoint, data).content)
@@ -0,0 +1,73 @@
+"""Observer hooks for requests made by :class:`AuthenticatedHiveClient`.
+
+Register a :class:`RequestObserver` with ``client.add_request_observer`` to be
+told about every HTTP attempt, token refresh and model parse. Observers must be
+cheap and run on the calling thread; only :meth:`RequestObserver.on_send` may
+raise, to stop a request before it is sent.
+"""
+
+import re
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlsplit
+
+from attrs import frozen
+
+if TYPE_CHECKING:
+    import httpx
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url: str) -> str:
+    """Return the path of ``url`` with numeric segments collapsed to ``{id}``.
+
+    >>> endpoint_template("https://hive/api/core/assignments/12/responses/3/?x=1")
+    '/api/core/assignments/{id}/responses/{id}/'
+    """
+    return _ID_SEGMENT.sub("/{id}", urlsplit(url).path)
+
+
+@frozen
+class RequestEvent:
+    """One HTTP attempt made by the client.
+
+    Attributes:
+        method: HTTP method.
+        url: Full request URL.
+        endpoint: ``url``'s path with ids collapsed (see :func:`endpoint_template`).
+        status_code: Response status code.
+        seconds: Wall time until the response headers (and, unless streamed,
+            the body) were received.
+        bytes_in: Response body size, when known.
+        bytes_out: Request body size.
+        attempt: 0 for the first attempt, >0 for retries after HTTP 502.
+    """
+
+    method: str
+    url: str
+    endpoint: str
+    status_code: int
+    seconds: float
+    bytes_in: int
+    bytes_out: int
+    attempt: int
+
+
+class RequestObserver:
+    """Base class for request observers; override the hooks you need."""
+
+    def on_send(self, request: "httpx.Request") -> None:
+        """Called before any request is sent, including logins and refreshes."""
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called after every HTTP attempt, including retries."""
+
+    def on_token_refresh(self, endpoint: Optional[str]) -> None:
+        """Called after the access token was refreshed following a 401.
+
+        ``endpoint`` is the template of the request that got the 401 (None
+        when the refresh was not caused by a request).
+        """
+
+    def on_parse(self, model: str, seconds: float) -> None:
+        """Called after a list item was turned into a ``model`` instance."""
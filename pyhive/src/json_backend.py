@@ -0,0 +1,102 @@
+"""Pluggable JSON codec used for request and response bodies.
+
+``orjson`` is used when it is installed, with the stdlib :mod:`json` module as
+the fallback. Set the ``PYHIVE_JSON_BACKEND`` environment variable
+(``orjson``/``stdlib``) or call :func:`set_json_backend` to choose explicitly.
+Both backends decode straight from the response bytes.
+
+The two encoders differ on edge cases: ``orjson`` raises ``TypeError`` for
+dicts with non-``str`` keys (stdlib converts ``int``/``float``/``bool``/``None``
+keys to strings), and writes NaN and infinities as ``null`` where the stdlib
+backend, like httpx, rejects them with ``ValueError`` (``allow_nan=False``).
+Payloads built by pyhive avoid both.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from typing import Any
+
+from attrs import frozen
+
+
+@frozen
+class JsonBackend:
+    """A named pair of JSON decode/encode functions."""
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_backend() -> JsonBackend:
+    def encode(obj: Any) -> bytes:
+        # Same settings httpx uses for ``json=`` bodies.
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode("UTF-8")
+
+    return JsonBackend("stdlib", json.loads, encode)
+
+
+def _orjson_backend() -> JsonBackend:
+    import orjson  # pylint: disable=import-outside-toplevel,import-error
+
+    return JsonBackend("orjson", orjson.loads, orjson.dumps)
+
+
+_BACKEND_FACTORIES: dict[str, Callable[[], JsonBackend]] = {
+    "orjson": _orjson_backend,
+    "stdlib": _stdlib_backend,
+}
+
+
+def _make_backend(name: str) -> JsonBackend:
+    if name not in _BACKEND_FACTORIES:
+        raise ValueError(
+            f"Unknown JSON backend {name!r}; expected one of {sorted(_BACKEND_FACTORIES)}"
+        )
+    return _BACKEND_FACTORIES[name]()
+
+
+def _default_backend() -> JsonBackend:
+    requested = os.environ.get("PYHIVE_JSON_BACKEND")
+    if requested:
+        return _make_backend(requested)
+    try:
+        return _orjson_backend()
+    except ImportError:
+        return _stdlib_backend()
+
+
+_backend = _default_backend()
+
+
+def get_json_backend() -> JsonBackend:
+    """Return the backend currently in use."""
+    return _backend
+
+
+def set_json_backend(backend: str | JsonBackend) -> JsonBackend:
+    """Switch to ``backend`` (a name or a custom :class:`JsonBackend`).
+
+    Returns the previously active backend.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the named backend's package is not installed.
+    """
+    global _backend  # pylint: disable=global-statement
+    previous = _backend
+    _backend = _make_backend(backend) if isinstance(backend, str) else backend
+    return previous
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode a JSON document with the active backend."""
+    return _backend.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON bytes with the active backend."""
+    return _backend.dumps(obj)
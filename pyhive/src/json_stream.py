@@ -0,0 +1,257 @@
+"""Incremental JSON parsing over a stream of byte chunks.
+
+:func:`iter_json_events` turns response chunks into parse events as soon as
+enough bytes arrived, so callers can stop reading a large document early (see
+:func:`find_json_value`). :func:`iter_json_list_items` decodes the items of a
+(possibly paginated) list response one at a time.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+_SCALAR = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+_LITERALS: dict[str, Any] = {"true": True, "false": False, "null": None}
+_DECODER = json.JSONDecoder()
+
+START_MAP = "start_map"
+END_MAP = "end_map"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+MAP_KEY = "map_key"
+VALUE = "value"
+
+JsonEvent = tuple[str, Any]
+
+
+def _find_string_end(buffer: str, start: int) -> int:
+    """Return the index of the quote closing the string opened at ``start``, or -1."""
+    end = start
+    while True:
+        end = buffer.find('"', end + 1)
+        if end == -1:
+            return -1
+        backslashes = 0
+        while buffer[end - 1 - backslashes] == "\\":
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return end
+
+
+class _JsonReader:
+    """Decoded text of a chunk stream, read one chunk at a time as needed."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._decoder = codecs.getincrementaldecoder("UTF-8")()
+        self._chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.final = False
+
+    def read_more(self) -> bool:
+        """Append the next chunk, dropping consumed text; False once exhausted."""
+        if self.final:
+            return False
+        chunk = next(self._chunks, None)
+        self.final = chunk is None
+        self.text = self.text[self.pos :] + self._decoder.decode(chunk or b"", final=self.final)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at the end."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.read_more():
+                return ""
+
+    def near(self) -> str:
+        """The upcoming text, for error messages."""
+        return repr(self.text[self.pos : self.pos + 20])
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` (after whitespace) or raise ``ValueError``."""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} near {self.near()}")
+        self.pos += 1
+
+    def read_value(self) -> Any:
+        """Decode the complete JSON value that starts at the next character."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.read_more():  # Otherwise the value may just be incomplete
+                    raise
+                continue
+            if (
+                not self.final
+                and self.text[self.pos] not in '"{['
+                and (end == len(self.text) or self.text[end] not in _DELIMITERS)
+            ):
+                self.read_more()  # A number may continue in the next chunk
+                continue
+            self.pos = end
+            return value
+
+    def next_token(self) -> Optional[tuple[str, Any]]:
+        """Return the next ``(kind, value)`` token, or None at the end of the stream.
+
+        ``kind`` is a structural character, ``"string"`` or ``"scalar"``.
+        """
+        while True:
+            char = self.peek()
+            if not char:
+                return None
+            if char in "{}[],:":
+                self.pos += 1
+                return char, None
+            if char == '"':
+                end = _find_string_end(self.text, self.pos)
+                if end != -1:
+                    text = json.loads(self.text[self.pos : end + 1])
+                    self.pos = end + 1
+                    return "string", text
+            else:
+                match = _SCALAR.match(self.text, self.pos)
+                # A scalar is only complete once a delimiter follows it; until
+                # then it may continue in the next chunk.
+                if match is not None and (
+                    self.final
+                    or (match.end() < len(self.text) and self.text[match.end()] in _DELIMITERS)
+                ):
+                    token = match.group()
+                    self.pos = match.end()
+                    return "scalar", _LITERALS[token] if token in _LITERALS else json.loads(token)
+            if not self.read_more():
+                raise ValueError(f"Invalid JSON near {self.near()}")
+
+
+# Opening/closing character -> (container, event, state right after the opening).
+_OPEN = {"{": ("map", START_MAP, "key_or_close"), "[": ("array", START_ARRAY, "value_or_close")}
+_CLOSE = {"}": ("map", END_MAP, "key_or_close"), "]": ("array", END_ARRAY, "value_or_close")}
+
+
+def iter_json_events(chunks: Iterable[bytes]) -> Iterator[JsonEvent]:
+    """Yield ``(event, value)`` pairs for the JSON document split over ``chunks``.
+
+    Events are ``start_map``/``end_map``, ``start_array``/``end_array``,
+    ``map_key`` (with the key) and ``value`` (with a decoded scalar). Events
+    are yielded as the document is read, so a malformed document may yield
+    some events before the error is raised.
+
+    Raises:
+        ValueError: If the document is malformed or truncated.
+    """
+    reader = _JsonReader(chunks)
+    stack: list[str] = []  # "map" or "array" for every open container
+    state = "value"  # What may come next
+    while (token := reader.next_token()) is not None:
+        kind, value = token
+        if kind in _OPEN and state in ("value", "value_or_close"):
+            container, event, state = _OPEN[kind]
+            stack.append(container)
+            yield event, None
+        elif kind in _CLOSE and stack and stack[-1] == _CLOSE[kind][0] and (
+            state in ("separator", _CLOSE[kind][2])
+        ):
+            stack.pop()
+            state = "separator" if stack else "done"
+            yield _CLOSE[kind][1], None
+        elif kind == "string" and state in ("key", "key_or_close"):
+            state = "colon"
+            yield MAP_KEY, value
+        elif kind in ("string", "scalar") and state in ("value", "value_or_close"):
+            state = "separator" if stack else "done"
+            yield VALUE, value
+        elif kind == ":" and state == "colon":
+            state = "value"
+        elif kind == "," and state == "separator":
+            state = "key" if stack[-1] == "map" else "value"
+        else:
+            raise ValueError(f"Unexpected {kind} in JSON stream near {reader.near()}")
+    if state != "done":
+        raise ValueError("Truncated JSON stream")
+
+
+def find_json_value(chunks: Iterable[bytes], path: tuple[str, ...]) -> Optional[Any]:
+    """Return the scalar at the object-key ``path``, reading only as far as needed.
+
+    Returns None when the document ends without a scalar at ``path``.
+    """
+    keys: list[Optional[str]] = []  # Current key per open container (None in arrays)
+    for event, value in iter_json_events(chunks):
+        if event == MAP_KEY:
+            keys[-1] = value
+        elif event in (START_MAP, START_ARRAY):
+            keys.append(None)
+        elif event in (END_MAP, END_ARRAY):
+            keys.pop()
+        elif tuple(keys) == path:
+            return value
+    return None
+
+
+def iter_json_list_items(
+    chunks: Iterable[bytes],
+    *,
+    results_key: str = "results",
+    fields: Optional[dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """Yield the items of a JSON list response one at a time.
+
+    The document is either an array or an object holding the array under
+    ``results_key`` (a paginated page). The other top-level members of such an
+    object (``count``, ``next``, ...) are stored into ``fields`` when given.
+    Only one item is held in decoded form at a time.
+
+    Raises:
+        ValueError: If the document is malformed or truncated.
+    """
+    reader = _JsonReader(chunks)
+    if reader.peek() == "[":
+        yield from _iter_array(reader)
+    else:
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                key = reader.read_value()
+                if not isinstance(key, str):
+                    raise ValueError("Expected an object key in JSON stream")
+                reader.expect(":")
+                if key == results_key and reader.peek() == "[":
+                    yield from _iter_array(reader)
+                else:
+                    value = reader.read_value()
+                    if fields is not None:
+                        fields[key] = value
+                if reader.peek() == "}":
+                    reader.pos += 1
+                    break
+                reader.expect(",")
+    if reader.peek():
+        raise ValueError(f"Unexpected data after JSON document: {reader.near()}")
+
+
+def _iter_array(reader: _JsonReader) -> Iterator[Any]:
+    """Yield the items of the array that starts at the next character."""
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.read_value()
+        if reader.peek() == "]":
+            reader.pos += 1
+            return
+        reader.expect(",")
@@ -0,0 +1,199 @@
+"""Per-endpoint request metrics with a Prometheus text-format dump.
+
+Attach a :class:`MetricsRegistry` to a client to collect request counts,
+latency histograms, transferred bytes, retries, token refreshes (by the
+endpoint whose request got the 401), status codes and model parse times::
+
+    metrics = MetricsRegistry()
+    client.add_request_observer(metrics)
+    ...
+    metrics.write_prometheus("/var/lib/node_exporter/pyhive.prom")
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from attrs import define, field
+
+from .instrumentation import RequestEvent, RequestObserver
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@define
+class _EndpointStats:
+    bucket_counts: list[int]
+    count: int = 0
+    seconds: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    retries: int = 0
+    status_codes: dict[int, int] = field(factory=dict)
+
+
+@define
+class _ParseStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_label_value(v)}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRegistry(RequestObserver):
+    """Thread-safe request metrics aggregated per ``(method, endpoint template)``."""
+
+    def __init__(self, latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self._lock = threading.Lock()
+        self._endpoints: dict[tuple[str, str], _EndpointStats] = {}
+        self._parses: dict[str, _ParseStats] = {}
+        self._token_refreshes: dict[str, int] = {}
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            stats = self._endpoints.get((event.method, event.endpoint))
+            if stats is None:
+                stats = _EndpointStats([0] * (len(self.latency_buckets) + 1))
+                self._endpoints[(event.method, event.endpoint)] = stats
+            stats.count += 1
+            stats.seconds += event.seconds
+            stats.bytes_in += event.bytes_in
+            stats.bytes_out += event.bytes_out
+            stats.retries += event.attempt > 0
+            stats.status_codes[event.status_code] = (
+                stats.status_codes.get(event.status_code, 0) + 1
+            )
+            for index, bound in enumerate(self.latency_buckets):
+                if event.seconds <= bound:
+                    stats.bucket_counts[index] += 1
+                    break
+            else:
+                stats.bucket_counts[-1] += 1
+
+    def on_token_refresh(self, endpoint: Optional[str]) -> None:
+        key = endpoint or ""
+        with self._lock:
+            self._token_refreshes[key] = self._token_refreshes.get(key, 0) + 1
+
+    def on_parse(self, model: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._parses.setdefault(model, _ParseStats())
+            stats.count += 1
+            stats.seconds += seconds
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._endpoints.clear()
+            self._parses.clear()
+            self._token_refreshes.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-serializable copy of the current metrics.
+
+        ``latency_buckets`` maps each upper bound (and ``"+Inf"``) to the
+        cumulative number of requests at or below it. ``token_refreshes`` is
+        the total; ``token_refreshes_by_endpoint`` splits it by the endpoint
+        whose request was answered with 401.
+        """
+        with self._lock:
+            requests = []
+            for (method, endpoint), stats in sorted(self._endpoints.items()):
+                cumulative, buckets = 0, {}
+                for bound, bucket_count in zip(
+                    [*map(str, self.latency_buckets), "+Inf"], stats.bucket_counts
+                ):
+                    cumulative += bucket_count
+                    buckets[bound] = cumulative
+                requests.append(
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "count": stats.count,
+                        "seconds": stats.seconds,
+                        "bytes_in": stats.bytes_in,
+                        "bytes_out": stats.bytes_out,
+                        "retries": stats.retries,
+                        "status_codes": dict(stats.status_codes),
+                        "latency_buckets": buckets,
+                    }
+                )
+            return {
+                "requests": requests,
+                "token_refreshes": sum(self._token_refreshes.values()),
+                "token_refreshes_by_endpoint": dict(sorted(self._token_refreshes.items())),
+                "parses": {
+                    model: {"count": stats.count, "seconds": stats.seconds}
+                    for model, stats in sorted(self._parses.items())
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: list[str] = []
+
+        def family(name: str, kind: str, description: str) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family("pyhive_requests_total", "counter", "HTTP attempts by endpoint and status.")
+        for req in snapshot["requests"]:
+            for status, count in sorted(req["status_codes"].items()):
+                labels = _labels(
+                    method=req["method"], endpoint=req["endpoint"], status=str(status)
+                )
+                lines.append(f"pyhive_requests_total{labels} {count}")
+
+        family(
+            "pyhive_request_duration_seconds", "histogram", "HTTP attempt latency."
+        )
+        for req in snapshot["requests"]:
+            base = {"method": req["method"], "endpoint": req["endpoint"]}
+            for bound, count in req["latency_buckets"].items():
+                labels = _labels(**base, le=bound)
+                lines.append(f"pyhive_request_duration_seconds_bucket{labels} {count}")
+            lines.append(f"pyhive_request_duration_seconds_sum{_labels(**base)} {req['seconds']}")
+            lines.append(f"pyhive_request_duration_seconds_count{_labels(**base)} {req['count']}")
+
+        for name, key, description in (
+            ("pyhive_request_bytes_received_total", "bytes_in", "Response bytes received."),
+            ("pyhive_request_bytes_sent_total", "bytes_out", "Request bytes sent."),
+            ("pyhive_request_retries_total", "retries", "Attempts retried after HTTP 502."),
+        ):
+            family(name, "counter", description)
+            for req in snapshot["requests"]:
+                labels = _labels(method=req["method"], endpoint=req["endpoint"])
+                lines.append(f"{name}{labels} {req[key]}")
+
+        family(
+            "pyhive_token_refreshes_total",
+            "counter",
+            "Access token refreshes by the endpoint whose request got HTTP 401.",
+        )
+        for endpoint, count in snapshot["token_refreshes_by_endpoint"].items():
+            lines.append(f"pyhive_token_refreshes_total{_labels(endpoint=endpoint)} {count}")
+
+        family("pyhive_parsed_items_total", "counter", "List items parsed into models.")
+        for model, stats in snapshot["parses"].items():
+            lines.append(f"pyhive_parsed_items_total{_labels(model=model)} {stats['count']}")
+        family("pyhive_parse_seconds_total", "counter", "Time spent in from_dict.")
+        for model, stats in snapshot["parses"].items():
+            lines.append(f"pyhive_parse_seconds_total{_labels(model=model)} {stats['seconds']}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | os.PathLike[str]) -> None:
+        """Atomically write :meth:`to_prometheus` to ``path``."""
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.to_prometheus(), encoding="UTF-8")
+        os.replace(tmp_path, path)
@@ -0,0 +1,101 @@
+"""Persistent storage of Hive JWT tokens across processes.
+
+A :class:`TokenStore` keeps the latest access/refresh token pair per
+``(hive_url, username)`` in a JSON file that only its owner may read, so a new
+process can reuse a still-valid token instead of logging in with a password.
+"""
+
+import base64
+import binascii
+import json
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+EXPIRY_MARGIN_SECONDS = 30.0
+
+
+def default_token_store_path() -> Path:
+    """Return ``$XDG_CACHE_HOME/pyhive/tokens.json`` (``~/.cache`` by default)."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pyhive" / "tokens.json"
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Return the ``exp`` claim (epoch seconds) of a JWT, or None if unreadable.
+
+    The signature is not verified; the server remains the authority.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError, binascii.Error):
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class TokenStore:
+    """Owner-only JSON file of token pairs keyed by Hive URL and username.
+
+    Files that are accessible to the group or to other users are ignored on
+    read and replaced on write.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | os.PathLike[str]] = None,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path) if path is not None else default_token_store_path()
+        self._clock = clock
+
+    def _read(self) -> dict[str, dict[str, dict[str, str]]]:
+        try:
+            if os.name == "posix" and stat.S_IMODE(self.path.stat().st_mode) & 0o077:
+                return {}
+            data = json.loads(self.path.read_text(encoding="UTF-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: dict[str, dict[str, dict[str, str]]]) -> None:
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="UTF-8") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, self.path)
+
+    def _is_valid(self, token: Optional[str]) -> bool:
+        if not token:
+            return False
+        expiry = jwt_expiry(token)
+        return expiry is not None and expiry - self._clock() > EXPIRY_MARGIN_SECONDS
+
+    def load(self, hive_url: str, username: str) -> tuple[Optional[str], Optional[str]]:
+        """Return the stored ``(access, refresh)`` tokens that are still valid.
+
+        Expired (or missing) tokens are returned as None.
+        """
+        entry = self._read().get(hive_url, {}).get(username, {})
+        access, refresh = entry.get("access"), entry.get("refresh")
+        return (
+            access if self._is_valid(access) else None,
+            refresh if self._is_valid(refresh) else None,
+        )
+
+    def save(self, hive_url: str, username: str, access: str, refresh: str) -> None:
+        """Store the token pair for ``(hive_url, username)``."""
+        data = self._read()
+        data.setdefault(hive_url, {})[username] = {"access": access, "refresh": refresh}
+        self._write(data)
+
+    def discard(self, hive_url: str, username: str) -> None:
+        """Forget the tokens stored for ``(hive_url, username)``."""
+        data = self._read()
+        if data.get(hive_url, {}).pop(username, None) is not None:
+            self._write(data)
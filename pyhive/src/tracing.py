@@ -0,0 +1,251 @@
+"""Request tracing with JSONL and Chrome trace-event export.
+
+A :class:`Tracer` attached to a client (see ``HiveClient.trace``) records one
+span per public client method call, one per HTTP call (``_get``, ``_post``,
+...) and one per HTTP attempt, linked by parent ids::
+
+    get_users
+      GET /api/core/management/users/
+        attempt 0
+
+Spans are exported as JSON lines or as a Chrome trace-event file that opens in
+``chrome://tracing``, Perfetto or speedscope.
+"""
+
+import functools
+import inspect
+import itertools
+import os
+import threading
+import time
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast
+
+from attrs import define, field
+
+from . import json_backend
+from .instrumentation import RequestEvent, RequestObserver
+
+if TYPE_CHECKING:
+    from .authenticated_hive_client import AuthenticatedHiveClient
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@define
+class Span:
+    """A timed operation.
+
+    Attributes:
+        name: What was timed, e.g. ``"get_users"`` or ``"GET /api/core/queues/"``.
+        span_id: Unique id within the tracer.
+        parent_id: ``span_id`` of the enclosing span, if any.
+        start_ns: Start time in ``time.perf_counter_ns()`` units.
+        end_ns: End time, or ``None`` while the span is open.
+        thread_id: Native id of the thread that started the span.
+        attributes: Extra details (status code, payload sizes, attempt, ...).
+    """
+
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    start_ns: int
+    end_ns: Optional[int] = None
+    thread_id: int = 0
+    attributes: dict[str, Any] = field(factory=dict)
+
+    @property
+    def seconds(self) -> float:
+        """Duration of the span (0 while it is still open)."""
+        return 0.0 if self.end_ns is None else (self.end_ns - self.start_ns) / 1e9
+
+
+class Tracer(RequestObserver):
+    """Collects spans; thread-safe.
+
+    The tracer is also a request observer: HTTP attempts are recorded as
+    children of the current span, and model parse times are summed onto it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+        self._ids = itertools.count(1)
+        self._current: ContextVar[Optional[Span]] = ContextVar(
+            f"pyhive_tracer_{id(self)}", default=None
+        )
+
+    @property
+    def current_span(self) -> Optional[Span]:
+        """The innermost open span of the calling context."""
+        return self._current.get()
+
+    def start_span(self, name: str, **attributes: Any) -> Span:
+        """Open a span under the current one without making it current."""
+        parent = self._current.get()
+        span = Span(
+            name,
+            next(self._ids),
+            None if parent is None else parent.span_id,
+            time.perf_counter_ns(),
+            thread_id=threading.get_native_id(),
+            attributes=attributes,
+        )
+        with self._lock:
+            self._spans.append(span)
+        return span
+
+    @staticmethod
+    def end_span(span: Span, **attributes: Any) -> None:
+        """Close ``span`` and add ``attributes`` to it."""
+        span.attributes.update(attributes)
+        span.end_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Open a span that is current for the duration of the block."""
+        span = self.start_span(name, **attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.attributes["error"] = type(exc).__name__
+            raise
+        finally:
+            self._current.reset(token)
+            self.end_span(span)
+
+    def trace_generator(self, span: Span, gen: Generator[Any, Any, Any]) -> Iterator[Any]:
+        """Iterate ``gen`` with ``span`` current during each step; close it at the end."""
+        try:
+            while True:
+                token = self._current.set(span)
+                try:
+                    item = next(gen)
+                except StopIteration:
+                    return
+                finally:
+                    self._current.reset(token)
+                yield item
+        finally:
+            gen.close()
+            self.end_span(span)
+
+    def on_request(self, event: RequestEvent) -> None:
+        parent = self._current.get()
+        end_ns = time.perf_counter_ns()
+        span = Span(
+            f"attempt {event.attempt}",
+            next(self._ids),
+            None if parent is None else parent.span_id,
+            end_ns - int(event.seconds * 1e9),
+            end_ns,
+            threading.get_native_id(),
+            {
+                "status_code": event.status_code,
+                "bytes_in": event.bytes_in,
+                "bytes_out": event.bytes_out,
+                "attempt": event.attempt,
+            },
+        )
+        with self._lock:
+            self._spans.append(span)
+
+    def on_token_refresh(self, endpoint: Optional[str]) -> None:
+        span = self._current.get()
+        if span is not None:
+            span.attributes["token_refreshes"] = span.attributes.get("token_refreshes", 0) + 1
+
+    def on_parse(self, model: str, seconds: float) -> None:
+        span = self._current.get()
+        if span is not None:
+            span.attributes["parsed_items"] = span.attributes.get("parsed_items", 0) + 1
+            span.attributes["parse_seconds"] = span.attributes.get("parse_seconds", 0.0) + seconds
+
+    def spans(self) -> list[Span]:
+        """Return the recorded spans in start order."""
+        with self._lock:
+            return sorted(self._spans, key=lambda s: s.start_ns)
+
+    def clear(self) -> None:
+        """Forget all recorded spans."""
+        with self._lock:
+            self._spans.clear()
+
+    def to_jsonl(self) -> str:
+        """One JSON object per span, times in seconds relative to the first span."""
+        spans = self.spans()
+        origin = spans[0].start_ns if spans else 0
+        lines = [
+            json_backend.dumps(
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start": (span.start_ns - origin) / 1e9,
+                    "seconds": span.seconds,
+                    "thread_id": span.thread_id,
+                    "attributes": span.attributes,
+                }
+            ).decode("UTF-8")
+            for span in spans
+        ]
+        return "".join(line + "\n" for line in lines)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Return the spans as a Chrome trace-event document (complete events)."""
+        spans = self.spans()
+        origin = spans[0].start_ns if spans else 0
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": "http" if span.name.startswith("attempt") else "pyhive",
+                "ph": "X",
+                "ts": (span.start_ns - origin) / 1e3,
+                "dur": span.seconds * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {
+                    **span.attributes,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                },
+            }
+            for span in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str | os.PathLike[str]) -> None:
+        """Write the spans to ``path``: JSON lines for ``.jsonl``, else a Chrome trace."""
+        path = Path(path)
+        if path.suffix == ".jsonl":
+            path.write_text(self.to_jsonl(), encoding="UTF-8")
+        else:
+            path.write_bytes(json_backend.dumps(self.to_chrome_trace()))
+
+
+def traced_method(method: F) -> F:
+    """Decorator: record a span for each call of a client method while tracing.
+
+    Generators get a span that stays open until they are exhausted or closed,
+    so requests made while iterating are attributed to the call that created
+    them.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "AuthenticatedHiveClient", *args: Any, **kwargs: Any) -> Any:
+        tracer = self._tracer  # pylint: disable=protected-access
+        if tracer is None:
+            return method(self, *args, **kwargs)
+        with tracer.span(method.__name__) as span:
+            result = method(self, *args, **kwargs)
+        if inspect.isgenerator(result):
+            span.end_ns = None  # Reopened until the generator is consumed.
+            return tracer.trace_generator(span, result)
+        return result
+
+    return cast("F", wrapper)
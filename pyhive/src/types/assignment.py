@@ -5,9 +5,8 @@ from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any, Generator, Self, TypeVar, cast
 
 from attrs import define, field
-from dateutil.parser import isoparse
 
-from .common import UNSET, Unset
+from .common import UNSET, Unset, isoparse
 from .core_item import HiveCoreItem
 from .enums.assignment_status_enum import AssignmentStatusEnum
 from .notification_nested import NotificationNested
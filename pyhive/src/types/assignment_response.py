@@ -4,11 +4,10 @@ import datetime
 from typing import TYPE_CHECKING, Any, Generator, TypeVar, Union
 
 from attrs import define, field
-from dateutil.parser import isoparse
 
 from .assignment import Assignment
 from .autocheck_status import AutoCheckStatus
-from .common import UNSET, Unset
+from .common import UNSET, Unset, isoparse
 from .core_item import HiveCoreItem
 from .enums.assignment_response_type_enum import AssignmentResponseTypeEnum
 
@@ -4,12 +4,12 @@ including serialization and lazy-loading of related objects.
 """
 
 from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, Self, TypeVar, cast
+from typing import TYPE_CHECKING, Any, ClassVar, Self, TypeVar, cast
 
 from attrs import define, field
 
 from .common import UNSET, Unset
-from .core_item import HiveCoreItem
+from .core_item import HiveCoreItem, track_changes
 from .enums.class_type_enum import ClassTypeEnum
 
 if TYPE_CHECKING:
@@ -20,7 +20,7 @@ if TYPE_CHECKING:
 T = TypeVar("T", bound="Class")
 
 
-@define
+@define(on_setattr=track_changes)
 class Class(HiveCoreItem):
     """Represents a school class/group in a program.
 
@@ -51,6 +51,13 @@ class Class(HiveCoreItem):
     # Lazy-loaded fields
     _program: "Program | None" = field(init=False, default=None)
     _users: "list[User] | None" = field(init=False, default=None)
+    _dirty_fields: set[str] = field(init=False, factory=set, eq=False, repr=False)
+
+    _api_names: ClassVar[dict[str, str]] = {
+        "program_id": "program",
+        "user_ids": "users",
+        "type_": "type",
+    }
 
     @property
     def program(self) -> "Program":
@@ -119,5 +126,9 @@ class Class(HiveCoreItem):
     def update(self) -> None:
         self.hive_client.update_class(self)
 
+    def save(self) -> None:
+        """Send the fields changed since the class was loaded (or saved) as a PATCH."""
+        self.hive_client.save_class(self)
+
 
 ClassLike = TypeVar("ClassLike", Class, int)
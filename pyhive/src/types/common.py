@@ -1,5 +1,6 @@
 """Contains some shared types for properties."""
 
+import datetime
 from collections.abc import Mapping, MutableMapping
 from http import HTTPStatus
 from typing import IO, BinaryIO, Generic, Literal, TypeVar, Union
@@ -16,6 +17,20 @@ class Unset:  # pylint: disable=too-few-public-methods
 
 UNSET: Unset = Unset()
 
+
+def isoparse(value: str) -> datetime.datetime:
+    """Parse an ISO-8601 timestamp.
+
+    The stdlib parser handles the timestamps Hive emits; ``dateutil`` is only
+    imported for the rare formats it rejects.
+    """
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        from dateutil.parser import isoparse as dateutil_isoparse
+
+        return dateutil_isoparse(value)
+
 # The types that `httpx.Client(files=)` can accept, copied from that library.
 FileContent = Union[IO[bytes], bytes, str]
 FileTypes = Union[
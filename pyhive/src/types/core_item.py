@@ -1,15 +1,43 @@
 """Base class for Hive core items."""
 
-from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, Self
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, ClassVar, Optional, Self
 
 if TYPE_CHECKING:
+    from attrs import Attribute
+
     from ...client import HiveClient
 
+# Called with each item whose tracked fields change; set by ``HiveClient.unit_of_work``.
+change_listener: ContextVar[Optional[Callable[["HiveCoreItem"], None]]] = ContextVar(
+    "pyhive_change_listener", default=None
+)
+
+
+def track_changes(instance: "HiveCoreItem", attribute: "Attribute[Any]", value: Any) -> Any:
+    """attrs ``on_setattr`` hook that records assignments to public fields.
+
+    Models opt in with ``@define(on_setattr=track_changes)`` and a
+    ``_dirty_fields`` set field; assignments made by ``__init__`` are not
+    recorded.
+    """
+    name = attribute.name
+    if not name.startswith("_") and name != "hive_client":
+        instance._dirty_fields.add(name)  # pylint: disable=protected-access
+        listener = change_listener.get()
+        if listener is not None:
+            listener(instance)
+    return value
+
 
 class HiveCoreItem:
     """Base class for Hive core items."""
 
+    # Keys of ``to_dict()`` for fields whose API name differs from the field name.
+    _api_names: ClassVar[dict[str, str]] = {}
+    _dirty_fields: set[str]
+
     def to_dict(self) -> dict[str, Any]:
         """Serialize this HiveCoreItem instance to a plain dictionary."""
         raise NotImplementedError
@@ -20,3 +48,36 @@ class HiveCoreItem:
     ) -> Self:  # noqa: D102
         """Deserialize a HiveCoreItem instance from a mapping."""
         raise NotImplementedError
+
+    @classmethod
+    def api_name(cls, field: str) -> str:
+        """The key of ``field`` in ``to_dict()`` and in API requests."""
+        return cls._api_names.get(field, field)
+
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        """Fields assigned since the item was loaded or last saved."""
+        return frozenset(getattr(self, "_dirty_fields", ()))
+
+    def changes(self) -> dict[str, Any]:
+        """The serialized values of :attr:`dirty_fields`, keyed by API name."""
+        dirty = self.dirty_fields
+        if not dirty:
+            return {}
+        data = self.to_dict()
+        keys = (self.api_name(name) for name in dirty)
+        return {key: data[key] for key in keys if key in data}
+
+    def mark_dirty(self, *names: str) -> None:
+        """Record fields changed in place, e.g. by appending to a list field."""
+        self._dirty_fields.update(names)
+        listener = change_listener.get()
+        if listener is not None and names:
+            listener(self)
+
+    def mark_clean(self, *names: str) -> None:
+        """Forget changes to ``names``, or to every field if none are given."""
+        if names:
+            self._dirty_fields.difference_update(names)
+        else:
+            self._dirty_fields.clear()
@@ -9,9 +9,8 @@ from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any, Self, TypeVar, cast
 
 from attrs import define, field
-from dateutil.parser import isoparse
 
-from .common import UNSET, Unset
+from .common import UNSET, Unset, isoparse
 from .core_item import HiveCoreItem
 from .enums.help_response_type_enum import HelpResponseTypeEnum
 
@@ -79,8 +79,6 @@ class Queue(HiveCoreItem):
                 if self.description is not UNSET
                 else {}
             ),
-            **({"module": self.module} if self.module is not UNSET else {}),
-            **({"user": self.user} if self.user_id is not UNSET else {}),
         }
 
     @classmethod
@@ -2,13 +2,12 @@
 
 import datetime
 from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, Iterable, Self, TypeVar, cast
+from typing import TYPE_CHECKING, Any, ClassVar, Iterable, Self, TypeVar, cast
 
 from attrs import define, field
-from dateutil.parser import isoparse
 
-from .common import UNSET, Unset
-from .core_item import HiveCoreItem
+from .common import UNSET, Unset, isoparse
+from .core_item import HiveCoreItem, track_changes
 from .enums.clearance_enum import ClearanceEnum
 from .enums.gender_enum import GenderEnum
 from .enums.status_enum import StatusEnum
@@ -23,7 +22,7 @@ if TYPE_CHECKING:
 T = TypeVar("T", bound="User")
 
 
-@define
+@define(on_setattr=track_changes)
 class User(HiveCoreItem):  # pylint: disable=too-many-instance-attributes
     """Hive management course user.
 
@@ -109,6 +108,18 @@ class User(HiveCoreItem):  # pylint: disable=too-many-instance-attributes
     confirmed: Unset | bool = UNSET
     teacher: Unset | bool = UNSET
     hostname: Unset | str = UNSET
+    _dirty_fields: set[str] = field(init=False, factory=set, eq=False, repr=False)
+
+    _api_names: ClassVar[dict[str, str]] = {
+        "current_assignment_id": "current_assignment",
+        "mentee_ids": "mentees",
+        "program_id": "program",
+        "mentor_id": "mentor",
+        "class_ids": "classes",
+        "queue_id": "queue",
+        "user_queue_id": "user_queue",
+        "override_queue_id": "override_queue",
+    }
 
     def to_dict(  # pylint: disable=too-many-locals, too-many-statements, too-many-branches
         self,
@@ -460,6 +471,10 @@ class User(HiveCoreItem):  # pylint: disable=too-many-instance-attributes
         """Commit the current state of the user to the server"""
         assert self.hive_client.update_user(self) == self
 
+    def save(self) -> None:
+        """Send the fields changed since the user was loaded (or saved) as a PATCH."""
+        self.hive_client.save_user(self)
+
     def set_queue(self, queue: "QueueLike") -> None:
         self.hive_client.set_users_queue(self, queue)
 
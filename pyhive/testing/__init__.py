@@ -0,0 +1,11 @@
+"""Offline test and benchmark helpers.
+
+:class:`FakeHive` is an in-memory Hive server that plugs into
+:class:`~pyhive.HiveClient` through an httpx transport, and
+:func:`generate_dataset` fills it with realistic data at a chosen scale.
+"""
+
+from .datasets import SCALES, Dataset, DatasetScale, generate_dataset
+from .fake_hive import FAKE_HIVE_URL, FakeHive
+
+__all__ = ["FAKE_HIVE_URL", "SCALES", "Dataset", "DatasetScale", "FakeHive", "generate_dataset"]
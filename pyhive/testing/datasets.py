@@ -0,0 +1,533 @@
+"""Seeded generator of realistic, large Hive datasets.
+
+:func:`generate_dataset` builds a consistent course tree, staff, students with
+mentors and classes, queues, assignments with submission/autocheck/review
+histories, exercise fields and help requests. Every record has the field shapes
+the ``from_dict`` methods in :mod:`pyhive.src.types` expect. Load the result
+into a :class:`~pyhive.testing.FakeHive` or write it out as JSON fixtures::
+
+    dataset = generate_dataset("medium", seed=1)
+    client = dataset.to_fake_hive(page_size=500).client()
+
+    dataset.write_json("fixtures/medium")
+    dataset = Dataset.read_json("fixtures/medium")
+"""
+
+import datetime
+import os
+import random
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from attrs import define, field
+
+from ..src import json_backend
+from .fake_hive import FakeHive
+
+
+@define
+class DatasetScale:  # pylint: disable=too-many-instance-attributes
+    """How much data :func:`generate_dataset` produces.
+
+    Students are split evenly across programs; each student gets an assignment
+    for (up to) ``assignments_per_student`` exercises of their program, in
+    course order.
+    """
+
+    programs: int = 1
+    subjects_per_program: int = 24
+    modules_per_subject: int = 5
+    exercises_per_module: int = 8
+    fields_per_exercise: int = 2
+    checkers: int = 40
+    students: int = 2000
+    classes_per_program: int = 8
+    assignments_per_student: int = 60
+    max_review_rounds: int = 3
+    help_requests: int = 500
+
+
+SCALES: dict[str, DatasetScale] = {
+    "tiny": DatasetScale(
+        subjects_per_program=3, modules_per_subject=2, exercises_per_module=3,
+        checkers=3, students=20, classes_per_program=2, assignments_per_student=10,
+        help_requests=10,
+    ),
+    "small": DatasetScale(students=200, assignments_per_student=20, help_requests=50),
+    "medium": DatasetScale(),
+    "large": DatasetScale(
+        programs=2, subjects_per_program=36, students=5000, checkers=120,
+        assignments_per_student=100, help_requests=5000,
+    ),
+}
+
+_FIRST_NAMES = (
+    "Noa", "Ariel", "Yael", "Omer", "Tamar", "Itai", "Maya", "Eitan", "Shira", "Daniel",
+    "Roni", "Amit", "Lior", "Nadav", "Talia", "Yonatan", "Gal", "Hila", "Ido", "Michal",
+)
+_LAST_NAMES = (
+    "Cohen", "Levi", "Mizrahi", "Peretz", "Biton", "Dahan", "Avraham", "Friedman",
+    "Katz", "Azoulay", "Malka", "Shapiro", "Ben David", "Golan", "Rosen", "Segal",
+)
+_COLORS = ("#e6194b", "#3cb44b", "#ffe119", "#4363d8", "#f58231", "#911eb4", "#46f0f0")
+_TOPICS = (
+    "Variables", "Loops", "Functions", "Recursion", "Files", "Classes", "Networking",
+    "Threads", "Algorithms", "Data Structures", "Databases", "Testing", "Security",
+)
+_EPOCH = datetime.datetime(2025, 1, 5, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def _timestamp(seconds: float) -> str:
+    return (_EPOCH + datetime.timedelta(seconds=seconds)).isoformat()
+
+
+@define
+class Dataset:
+    """Generated records, keyed like the tables of :class:`FakeHive`.
+
+    Attributes:
+        tables: Top-level records per table (``"users"``, ``"assignments"``, ...).
+        nested: Nested records per table and parent id
+            (``"assignment_responses"``, ``"help_responses"``, ``"fields"``).
+    """
+
+    tables: dict[str, list[dict[str, Any]]] = field(factory=dict)
+    nested: dict[str, dict[int, list[dict[str, Any]]]] = field(factory=dict)
+
+    def counts(self) -> dict[str, int]:
+        """Number of records per table."""
+        counts = {name: len(records) for name, records in self.tables.items()}
+        for name, by_parent in self.nested.items():
+            counts[name] = sum(len(records) for records in by_parent.values())
+        return counts
+
+    def load_into(self, fake: FakeHive) -> None:
+        """Add every record to ``fake``."""
+        for name, records in self.tables.items():
+            fake.add_many(name, records)
+        for name, by_parent in self.nested.items():
+            for parent, records in by_parent.items():
+                fake.add_many(name, records, parent=parent)
+
+    def to_fake_hive(self, **kwargs: Any) -> FakeHive:
+        """Return a new :class:`FakeHive` (built with ``kwargs``) holding this dataset."""
+        fake = FakeHive(**kwargs)
+        self.load_into(fake)
+        return fake
+
+    def write_json(self, directory: Union[str, "os.PathLike[str]"]) -> None:
+        """Write one ``<table>.json`` fixture per table into ``directory``."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, records in self.tables.items():
+            (directory / f"{name}.json").write_bytes(json_backend.dumps(records))
+        for name, by_parent in self.nested.items():
+            (directory / f"{name}.json").write_bytes(
+                json_backend.dumps({str(parent): rows for parent, rows in by_parent.items()})
+            )
+
+    @classmethod
+    def read_json(cls, directory: Union[str, "os.PathLike[str]"]) -> "Dataset":
+        """Read fixtures written by :meth:`write_json`."""
+        dataset = cls()
+        for path in sorted(Path(directory).glob("*.json")):
+            data = json_backend.loads(path.read_bytes())
+            if isinstance(data, dict):
+                dataset.nested[path.stem] = {int(k): v for k, v in data.items()}
+            else:
+                dataset.tables[path.stem] = data
+        return dataset
+
+
+class _Generator:  # pylint: disable=too-many-instance-attributes
+    """Builds one dataset; split into steps to keep the relations readable."""
+
+    def __init__(self, scale: DatasetScale, seed: int) -> None:
+        self.scale = scale
+        self.random = random.Random(seed)
+        self.dataset = Dataset(
+            tables={
+                name: []
+                for name in (
+                    "programs", "subjects", "modules", "exercises", "users", "classes",
+                    "queues", "assignments", "help",
+                )
+            },
+            nested={"fields": {}, "assignment_responses": {}, "help_responses": {}},
+        )
+        self.next_ids: dict[str, int] = {}
+        self.program_exercises: dict[int, list[dict[str, Any]]] = {}
+        self.checkers: list[dict[str, Any]] = []
+
+    def next_id(self, table: str) -> int:
+        self.next_ids[table] = self.next_ids.get(table, 0) + 1
+        return self.next_ids[table]
+
+    def add(self, table: str, record: dict[str, Any]) -> dict[str, Any]:
+        self.dataset.tables[table].append(record)
+        return record
+
+    def add_nested(self, table: str, parent: int, record: dict[str, Any]) -> dict[str, Any]:
+        self.dataset.nested[table].setdefault(parent, []).append(record)
+        return record
+
+    def person(self, username: str, clearance: int, **extra: Any) -> dict[str, Any]:
+        first, last = self.random.choice(_FIRST_NAMES), self.random.choice(_LAST_NAMES)
+        return self.add(
+            "users",
+            {
+                "id": self.next_id("users"),
+                "display_name": f"{first} {last}",
+                "clearance": clearance,
+                "gender": self.random.choice(("Male", "Female")),
+                "current_assignment": None,
+                "current_assignment_options": [],
+                "mentees": [],
+                "username": username,
+                "status": "Present",
+                "status_date": _timestamp(self.random.uniform(0, 86400 * 30)),
+                "first_name": first,
+                "last_name": last,
+                **extra,
+            },
+        )
+
+    def generate(self) -> Dataset:
+        self.staff()
+        for program_number in range(self.scale.programs):
+            program = self.course(program_number)
+            classes = self.classes(program)
+            queues = self.queues(program)
+            students = self.students(program, classes, queues)
+            self.assignments(program, students)
+        self.help_requests()
+        return self.dataset
+
+    def staff(self) -> None:
+        for number in range(self.scale.checkers):
+            self.checkers.append(self.person(f"checker{number + 1}", 2))
+        self.person("segel1", 3)
+
+    def course(self, program_number: int) -> dict[str, Any]:
+        scale = self.scale
+        program = self.add(
+            "programs",
+            {
+                "id": self.next_id("programs"),
+                "name": f"Program {program_number + 1}",
+                "checker": self.checkers[0]["id"] if self.checkers else None,
+                "sync_status": "Normal",
+                "sync_message": None,
+                "default_class": None,
+            },
+        )
+        exercises: list[dict[str, Any]] = []
+        for subject_number in range(scale.subjects_per_program):
+            topic = _TOPICS[subject_number % len(_TOPICS)]
+            subject = self.add(
+                "subjects",
+                {
+                    "id": self.next_id("subjects"),
+                    "symbol": chr(ord("A") + subject_number % 26) + str(subject_number // 26 or ""),
+                    "parent_program": program["id"],
+                    "color": _COLORS[subject_number % len(_COLORS)],
+                    "name": f"{topic} {subject_number + 1}",
+                    "parent_program_name": program["name"],
+                    "sync_status": "Normal",
+                    "sync_message": None,
+                    "segel_path": f"/{program['name']}/{topic}",
+                    "segel_brief": "",
+                },
+            )
+            for module_number in range(scale.modules_per_subject):
+                module = self.add(
+                    "modules",
+                    {
+                        "id": self.next_id("modules"),
+                        "name": f"{topic} part {module_number + 1}",
+                        "parent_subject": subject["id"],
+                        "order": module_number + 1,
+                        "sync_status": "Normal",
+                        "sync_message": None,
+                        "parent_program_name": program["name"],
+                        "parent_subject_name": subject["name"],
+                        "parent_subject_symbol": subject["symbol"],
+                        "segel_path": f"{subject['segel_path']}/{module_number + 1}",
+                    },
+                )
+                for exercise_number in range(scale.exercises_per_module):
+                    exercises.append(self.exercise(subject, module, exercise_number + 1))
+        self.program_exercises[program["id"]] = exercises
+        return program
+
+    def exercise(
+        self, subject: dict[str, Any], module: dict[str, Any], order: int
+    ) -> dict[str, Any]:
+        exercise = self.add(
+            "exercises",
+            {
+                "id": self.next_id("exercises"),
+                "name": f"{module['name']} - exercise {order}",
+                "parent_module": module["id"],
+                "parent_subject": subject["id"],
+                "parent_module_name": module["name"],
+                "parent_subject_symbol": subject["symbol"],
+                "parent_subject_color": subject["color"],
+                "download": self.random.random() < 0.2,
+                "preview": self.random.choice(("Disabled", "Markdown", "PDF")),
+                "parent_subject_name": subject["name"],
+                "parent_module_order": module["order"],
+                "order": order,
+                "tags": [],
+                "patbas": self.random.choice(("Never", "On Done", "Always")),
+                "sync_status": "Normal",
+                "sync_message": None,
+                "segel_path": f"{module['segel_path']}/{order}",
+                "is_lecture": order == 1,
+                "autodone": False,
+            },
+        )
+        for field_number in range(self.scale.fields_per_exercise):
+            self.add_nested(
+                "fields",
+                exercise["id"],
+                {
+                    "id": self.next_id("fields"),
+                    "name": "Answer" if field_number == 0 else f"Question {field_number}",
+                    "type": "text" if field_number == 0 else "number",
+                    "order": field_number + 1,
+                    "required": field_number == 0,
+                    "staff_responses": False,
+                    "hanich_responses": True,
+                    "has_value": True,
+                    "segel_only": False,
+                },
+            )
+        return exercise
+
+    def classes(self, program: dict[str, Any]) -> list[dict[str, Any]]:
+        return [
+            self.add(
+                "classes",
+                {
+                    "id": self.next_id("classes"),
+                    "name": f"{program['name']} class {number + 1}",
+                    "display_name": f"Class {number + 1}",
+                    "program": program["id"],
+                    "users": [],
+                    "program__name": program["name"],
+                    "type": "Student Group" if number % 4 else "Room",
+                    "description": "",
+                },
+            )
+            for number in range(self.scale.classes_per_program)
+        ]
+
+    def queues(self, program: dict[str, Any]) -> list[dict[str, Any]]:
+        subjects = [
+            s for s in self.dataset.tables["subjects"] if s["parent_program"] == program["id"]
+        ]
+        return [
+            self.add(
+                "queues",
+                {
+                    "id": self.next_id("queues"),
+                    "name": f"{subject['name']} queue",
+                    "user_id": None,
+                    "user_name": None,
+                    "subject_id": subject["id"],
+                    "subject_name": subject["name"],
+                    "subject_color": subject["color"],
+                    "subject_symbol": subject["symbol"],
+                    "module_id": None,
+                    "module_name": None,
+                    "module_order": None,
+                    "program_id": program["id"],
+                    "program_name": program["name"],
+                    "description": "",
+                },
+            )
+            for subject in subjects
+        ]
+
+    def students(
+        self,
+        program: dict[str, Any],
+        classes: list[dict[str, Any]],
+        queues: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        count = self.scale.students // self.scale.programs
+        students = []
+        for _ in range(count):
+            mentor = self.random.choice(self.checkers) if self.checkers else None
+            class_ = self.random.choice(classes) if classes else None
+            student = self.person(
+                f"student{self.next_ids.get('users', 0) + 1}",
+                1,
+                number=len(students) + 1,
+                program=program["id"],
+                mentor=mentor["id"] if mentor else None,
+                classes=[class_["id"]] if class_ else [],
+                queue=self.random.choice(queues)["id"] if queues else None,
+                teacher=False,
+            )
+            if mentor is not None:
+                mentor["mentees"].append(student["id"])
+            if class_ is not None:
+                class_["users"].append(student["id"])
+            students.append(student)
+        return students
+
+    def assignments(self, program: dict[str, Any], students: list[dict[str, Any]]) -> None:
+        exercises = self.program_exercises[program["id"]]
+        for student in students:
+            # Students progress through the course in order, at different paces.
+            reached = self.random.randint(
+                min(1, self.scale.assignments_per_student),
+                min(self.scale.assignments_per_student, len(exercises)),
+            )
+            started = self.random.uniform(0, 86400 * 7)
+            for position, exercise in enumerate(exercises[:reached]):
+                last = position == reached - 1
+                self.assignment(student, exercise, started + position * 5400, last)
+            if reached:
+                student["current_assignment"] = self.next_ids["assignments"]
+
+    def assignment(
+        self, student: dict[str, Any], exercise: dict[str, Any], started: float, in_progress: bool
+    ) -> None:
+        assignment_id = self.next_id("assignments")
+        clock = started
+        status = "Work In Progress" if in_progress else "New"
+        checker: Optional[dict[str, Any]] = None
+        field_ids = [f["id"] for f in self.dataset.nested["fields"].get(exercise["id"], [])]
+        rounds = 0 if in_progress else self.random.randint(1, max(1, self.scale.max_review_rounds))
+        for round_number in range(rounds):
+            clock += self.random.uniform(600, 7200)
+            self.response(assignment_id, student["id"], clock, "Submission", field_ids)
+            status = "Submitted"
+            clock += self.random.uniform(5, 120)
+            self.response(assignment_id, student["id"], clock, "AutoCheck", [])
+            status = "AutoChecked"
+            clock += self.random.uniform(300, 3600)
+            checker = self.random.choice(self.checkers) if self.checkers else None
+            verdict = "Done" if round_number == rounds - 1 else "Redo"
+            self.response(assignment_id, checker["id"] if checker else 0, clock, verdict, [])
+            status = verdict
+        self.add(
+            "assignments",
+            {
+                "id": assignment_id,
+                "user": student["id"],
+                "checker": checker["id"] if checker else None,
+                "checker_first_name": checker["first_name"] if checker else "",
+                "checker_last_name": checker["last_name"] if checker else "",
+                "is_subscribed": False,
+                "exercise": exercise["id"],
+                "assignment_status": status,
+                "patbas": False,
+                "notifications": [],
+                "last_staff_updated": _timestamp(clock),
+                "work_time": int(clock - started),
+                "submission_count": rounds,
+                "total_check_count": rounds,
+                "manual_check_count": rounds,
+                "flagged": False,
+            },
+        )
+
+    def response(
+        self,
+        assignment_id: int,
+        user_id: int,
+        clock: float,
+        response_type: str,
+        field_ids: list[int],
+    ) -> None:
+        autocheck_statuses = []
+        if response_type == "AutoCheck":
+            autocheck_statuses = [
+                {
+                    "id": self.next_id("autocheck_statuses"),
+                    "time": _timestamp(clock + offset),
+                    "action": action,
+                    "payload": None,
+                }
+                for offset, action in enumerate(("Sending", "Handling", "Finished", "Success"))
+            ]
+        self.add_nested(
+            "assignment_responses",
+            assignment_id,
+            {
+                "id": self.next_id("assignment_responses"),
+                "user": user_id,
+                "contents": [
+                    {"content": f"answer {self.random.randint(0, 10**6)}", "field": field_id}
+                    for field_id in field_ids
+                ],
+                "date": _timestamp(clock),
+                "response_type": response_type,
+                "autocheck_statuses": autocheck_statuses,
+                "file_name": None,
+                "dear_student": response_type in ("Done", "Redo"),
+                "hide_checker_name": False,
+                "segel_only": False,
+            },
+        )
+
+    def help_requests(self) -> None:
+        students = [u for u in self.dataset.tables["users"] if u["clearance"] == 1]
+        exercises = self.dataset.tables["exercises"]
+        for _ in range(self.scale.help_requests if students else 0):
+            student = self.random.choice(students)
+            resolved = self.random.random() < 0.8
+            checker = self.random.choice(self.checkers) if self.checkers and resolved else None
+            help_id = self.next_id("help")
+            clock = self.random.uniform(0, 86400 * 30)
+            self.add(
+                "help",
+                {
+                    "id": help_id,
+                    "user": student["id"],
+                    "checker": checker["id"] if checker else None,
+                    "checker_first_name": checker["first_name"] if checker else "",
+                    "checker_last_name": checker["last_name"] if checker else "",
+                    "is_subscribed": False,
+                    "help_type": self.random.choice(("Exercise", "Exercise", "Request", "Other")),
+                    "help_status": "Resolved" if resolved else "Open",
+                    "for_exercise": self.random.choice(exercises)["id"] if exercises else None,
+                    "responses": [],
+                    "notifications": [],
+                    "title": "Stuck on this one",
+                },
+            )
+            thread = (("Open", student), ("Comment", checker), ("Resolve", checker))
+            for response_type, user in thread:
+                if user is None:
+                    break
+                clock += self.random.uniform(60, 1800)
+                self.add_nested(
+                    "help_responses",
+                    help_id,
+                    {
+                        "id": self.next_id("help_responses"),
+                        "user": user["id"],
+                        "date": _timestamp(clock),
+                        "response_type": response_type,
+                        "contents": "",
+                    },
+                )
+
+
+def generate_dataset(scale: Union[str, DatasetScale] = "small", *, seed: int = 0) -> Dataset:
+    """Generate a dataset; the same ``scale`` and ``seed`` give the same records.
+
+    Args:
+        scale: A name from :data:`SCALES` or a custom :class:`DatasetScale`.
+        seed: Seed of the random generator.
+    """
+    if isinstance(scale, str):
+        if scale not in SCALES:
+            raise ValueError(f"Unknown scale {scale!r}; expected one of {sorted(SCALES)}")
+        scale = SCALES[scale]
+    return _Generator(scale, seed).generate()
@@ -0,0 +1,785 @@
+"""In-memory Hive server served through an :class:`httpx.MockTransport`.
+
+:class:`FakeHive` implements the endpoints used by :class:`HiveClient` (tokens,
+schema, course tree, users, classes, queues, assignments and their responses,
+exercise fields, help requests and their responses) against plain dicts, so
+the client can be exercised, benchmarked and load-tested without a Hive
+instance::
+
+    fake = FakeHive()
+    program = fake.add("programs", {"name": "Python"})
+    client = fake.client()
+    assert client.get_program(program["id"]).name == "Python"
+
+List endpoints support Django-style filters (``program__id__in=1,2``,
+``user__classes__id=3``, ``last_staff_updated__gte=...``), ``ordering`` and
+limit/offset pagination in the DRF response shape. Filters that name a field
+the resource does not have are ignored, like undeclared filters in DRF.
+Exact and ``__in`` filters are answered from indexes that are built on first
+use and dropped on the next write.
+"""
+
+import datetime
+import itertools
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, Optional, Union
+from urllib.parse import urlencode
+
+import httpx
+
+from ..src import json_backend
+from ..src.api_versions import LATEST_API_VERSION
+from ..src.instrumentation import endpoint_template
+
+if TYPE_CHECKING:
+    from ..client import HiveClient
+
+FAKE_HIVE_URL = "http://fake-hive.test"
+
+# Collection path (below /api/core/) -> table name.
+COLLECTIONS = {
+    "course/programs": "programs",
+    "course/subjects": "subjects",
+    "course/modules": "modules",
+    "course/exercises": "exercises",
+    "management/users": "users",
+    "management/classes": "classes",
+    "queues": "queues",
+    "assignments": "assignments",
+    "help": "help",
+}
+
+# (parent table, path segment) -> nested table; rows are keyed by parent id.
+NESTED_COLLECTIONS = {
+    ("assignments", "responses"): "assignment_responses",
+    ("help", "responses"): "help_responses",
+    ("exercises", "fields"): "fields",
+}
+
+# (table, field) -> table the field's id(s) refer to, for ``a__b__id`` filters.
+RELATIONS = {
+    ("programs", "checker"): "users",
+    ("programs", "default_class"): "classes",
+    ("subjects", "parent_program"): "programs",
+    ("modules", "parent_subject"): "subjects",
+    ("exercises", "parent_module"): "modules",
+    ("exercises", "parent_subject"): "subjects",
+    ("users", "program"): "programs",
+    ("users", "mentor"): "users",
+    ("users", "mentees"): "users",
+    ("users", "classes"): "classes",
+    ("users", "queue"): "queues",
+    ("classes", "program"): "programs",
+    ("classes", "users"): "users",
+    ("assignments", "user"): "users",
+    ("assignments", "checker"): "users",
+    ("assignments", "exercise"): "exercises",
+    ("help", "user"): "users",
+    ("help", "checker"): "users",
+    ("help", "for_exercise"): "exercises",
+}
+
+REQUIRED_ON_CREATE = {
+    "programs": ("name",),
+    "subjects": ("name", "symbol", "parent_program"),
+    "modules": ("name", "parent_subject"),
+    "exercises": ("name", "parent_module"),
+    "users": ("username", "clearance"),
+    "classes": ("name", "program"),
+    "queues": ("name",),
+    "help": ("user", "help_type"),
+}
+
+_RANGE_LOOKUPS = {
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+_SYNCED = {"sync_status": "Normal", "sync_message": None}
+_UNCHECKED = {
+    "checker": None, "checker_first_name": "", "checker_last_name": "", "is_subscribed": False,
+}
+# Static defaults of fields the server fills in when a record is created.
+_DEFAULTS: dict[str, dict[str, Any]] = {
+    "programs": {**_SYNCED, "checker": None, "default_class": None},
+    "subjects": {
+        **_SYNCED, "symbol": "", "color": "#000000", "segel_path": "", "segel_brief": "",
+    },
+    "modules": {**_SYNCED, "order": 0, "segel_path": ""},
+    "exercises": {
+        **_SYNCED, "order": 0, "download": False, "preview": "Disabled", "tags": [],
+        "patbas": "Never", "segel_path": "",
+    },
+    "users": {
+        "clearance": 1, "gender": "Male", "current_assignment": None,
+        "current_assignment_options": [], "mentees": [], "status": "Present", "classes": [],
+    },
+    "classes": {"users": [], "type": "Student Group", "description": ""},
+    "assignments": {
+        **_UNCHECKED, "assignment_status": "New", "patbas": False, "notifications": [],
+        "work_time": 0,
+    },
+    "help": {
+        **_UNCHECKED, "help_status": "Open", "responses": [], "notifications": [], "title": "",
+    },
+    "assignment_responses": {"response_type": "Comment", "contents": [], "autocheck_statuses": []},
+    "help_responses": {"response_type": "Comment", "contents": ""},
+}
+_TIMESTAMP_FIELDS = {
+    "users": "status_date",
+    "assignments": "last_staff_updated",
+    "assignment_responses": "date",
+    "help_responses": "date",
+}
+_PAGINATION_PARAMS = frozenset({"limit", "offset", "ordering", "page_size"})
+_COLLECTION_PATTERN = "|".join(re.escape(path) for path in COLLECTIONS)
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _tables_read(table: str, path: str) -> set[str]:
+    """Return the tables a ``a__b__id`` filter on ``table`` looks into."""
+    tables = {table}
+    current: Optional[str] = table
+    for part in path.split("__"):
+        current = RELATIONS.get((current, part)) if current else None
+        if current is None:
+            break
+        tables.add(current)
+    return tables
+
+
+def _norm(value: Any) -> str:
+    """Render a stored value the way it appears in a query string."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _as_comparable(value: Any) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return _norm(value)
+
+
+def _parse_comparable(raw: str) -> Any:
+    try:
+        return float(raw)
+    except ValueError:
+        return raw
+
+
+class FakeHive:  # pylint: disable=too-many-instance-attributes
+    """An in-process Hive backend for offline tests and benchmarks.
+
+    Args:
+        username: Login accepted by the token endpoint.
+        password: Password accepted for ``username``.
+        latency: Seconds to sleep per request, or a callable returning them.
+        error_rate: Probability of answering a request with ``error_status``.
+        error_status: Status code used for injected errors.
+        page_size: Paginate list responses by default; ``None`` returns plain
+            lists unless the request passes ``limit``.
+        version: Version reported by the schema endpoint.
+        seed: Seed for the error-injection random generator.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        username: str = "admin",
+        password: str = "admin",
+        latency: Union[float, Callable[[], float]] = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = httpx.codes.BAD_GATEWAY,
+        page_size: Optional[int] = None,
+        version: str = LATEST_API_VERSION,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.username = username
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.page_size = page_size
+        self.version = version
+        self.request_counts: Counter[tuple[str, str]] = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._passwords = {username: password}
+        self._tables: dict[str, dict[int, dict[str, Any]]] = {
+            name: {} for name in COLLECTIONS.values()
+        }
+        self._nested: dict[str, dict[int, dict[int, dict[str, Any]]]] = {
+            name: {} for name in NESTED_COLLECTIONS.values()
+        }
+        self._next_ids = {name: 1 for name in [*self._tables, *self._nested]}
+        self._indexes: dict[tuple[str, str], dict[str, set[int]]] = {}
+        self._sorted: dict[tuple[str, str], list[int]] = {}
+        self._results: dict[tuple[str, tuple[tuple[str, str], ...]], list[dict[str, Any]]] = {}
+        self._usernames: dict[str, int] = {}
+        self._access_tokens: set[str] = set()
+        self._refresh_tokens: set[str] = set()
+        self._token_counter = itertools.count(1)
+        self._queued_failures: list[int] = []
+        self.transport = httpx.MockTransport(self.handle_request)
+
+    # ----- Data access -------------------------------------------------
+
+    def add(
+        self, table: str, record: dict[str, Any], *, parent: Optional[int] = None
+    ) -> dict[str, Any]:
+        """Store ``record`` (a new ``id`` is assigned if missing) and return it.
+
+        Fields the server derives, such as ``parent_program_name`` of a subject,
+        are filled in when absent. Nested tables (``"assignment_responses"``,
+        ``"help_responses"``, ``"fields"``) require the ``parent`` id.
+        """
+        return self.add_many(table, [record], parent=parent)[0]
+
+    def add_many(
+        self,
+        table: str,
+        records: Iterable[dict[str, Any]],
+        *,
+        parent: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """Store many records of one table at once; see :meth:`add`."""
+        with self._lock:
+            if table in self._nested:
+                if parent is None:
+                    raise ValueError(f"Rows of {table!r} need a parent id")
+                rows = self._nested[table].setdefault(parent, {})
+            elif table in self._tables:
+                rows = self._tables[table]
+            else:
+                raise KeyError(f"Unknown table {table!r}")
+            now = _now()
+            stored = []
+            for record in records:
+                record = dict(record)
+                if "id" not in record:
+                    record["id"] = self._next_ids[table]
+                self._next_ids[table] = max(self._next_ids[table], record["id"] + 1)
+                self._complete(table, record, now)
+                self._reindex(table, rows.get(record["id"]), record)
+                rows[record["id"]] = record
+                stored.append(record)
+            self._changed(table)
+            return stored
+
+    def get(self, table: str, item_id: int) -> Optional[dict[str, Any]]:
+        """Return the stored record, or None."""
+        return self._tables[table].get(item_id)
+
+    def records(self, table: str) -> list[dict[str, Any]]:
+        """Return all stored records of a top-level table."""
+        with self._lock:
+            return list(self._tables[table].values())
+
+    def count(self, table: str) -> int:
+        """Return the number of stored records of a top-level table."""
+        return len(self._tables[table])
+
+    def set_password(self, username: str, password: str) -> None:
+        """Accept ``username``/``password`` at the token endpoint."""
+        self._passwords[username] = password
+
+    # ----- Failure injection -------------------------------------------
+
+    def fail_next(self, status: int = httpx.codes.BAD_GATEWAY, count: int = 1) -> None:
+        """Answer the next ``count`` API requests with ``status``."""
+        with self._lock:
+            self._queued_failures.extend([status] * count)
+
+    def expire_tokens(self) -> None:
+        """Invalidate every issued access token, forcing clients to refresh."""
+        with self._lock:
+            self._access_tokens.clear()
+
+    # ----- Client ------------------------------------------------------
+
+    def client(self, **kwargs: Any) -> "HiveClient":
+        """Return a :class:`HiveClient` logged in to this fake.
+
+        With ``proxy``, httpx sends every request through a proxy mount
+        instead of the client's own transport; the mount leads to this fake
+        too, so code that wraps the transport can be tested behind a proxy.
+        """
+        from ..client import HiveClient  # pylint: disable=import-outside-toplevel
+
+        if kwargs.get("proxy") is not None:
+            kwargs.setdefault("mounts", {"all://": self.transport})
+        return HiveClient(
+            self.username,
+            self._passwords[self.username],
+            FAKE_HIVE_URL,
+            transport=self.transport,
+            **kwargs,
+        )
+
+    # ----- Request handling --------------------------------------------
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer one request; used as the :class:`httpx.MockTransport` handler."""
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+        path = request.url.path
+        with self._lock:
+            self.request_counts[(request.method, endpoint_template(path))] += 1
+            status = self._injected_failure()
+            if status is not None:
+                return self._error(request, status)
+            public = self._PUBLIC_ENDPOINTS.get(path)
+            if public is not None:
+                return public(self, request)
+            if not self._authorized(request):
+                return self._json(
+                    request, {"detail": "Given token not valid for any token type"}, 401
+                )
+            return self._route(request)
+
+    def _injected_failure(self) -> Optional[int]:
+        if self._queued_failures:
+            return self._queued_failures.pop(0)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    @staticmethod
+    def _json(request: httpx.Request, body: Any, status: int = 200) -> httpx.Response:
+        return httpx.Response(
+            status,
+            content=json_backend.dumps(body),
+            headers={"Content-Type": "application/json"},
+            request=request,
+        )
+
+    def _error(self, request: httpx.Request, status: int) -> httpx.Response:
+        return self._json(request, {"detail": f"Injected error {status}"}, status)
+
+    def _not_found(self, request: httpx.Request) -> httpx.Response:
+        return self._json(request, {"detail": "Not found."}, 404)
+
+    def _issue_tokens(self, request: httpx.Request) -> httpx.Response:
+        number = next(self._token_counter)
+        access, refresh = f"fake-access-{number}", f"fake-refresh-{number}"
+        self._access_tokens.add(access)
+        self._refresh_tokens.add(refresh)
+        return self._json(request, {"access": access, "refresh": refresh})
+
+    def _login(self, request: httpx.Request) -> httpx.Response:
+        body = json_backend.loads(request.content)
+        if self._passwords.get(body.get("username")) != body.get("password"):
+            return self._json(
+                request, {"detail": "No active account found with the given credentials"}, 401
+            )
+        return self._issue_tokens(request)
+
+    def _refresh(self, request: httpx.Request) -> httpx.Response:
+        body = json_backend.loads(request.content)
+        if body.get("refresh") not in self._refresh_tokens:
+            return self._json(request, {"detail": "Token is invalid or expired"}, 401)
+        return self._issue_tokens(request)
+
+    def _authorized(self, request: httpx.Request) -> bool:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        return scheme == "Bearer" and token in self._access_tokens
+
+    def _schema(self, request: httpx.Request) -> httpx.Response:
+        return self._json(
+            request, {"openapi": "3.0.3", "info": {"title": "Hive", "version": self.version}}
+        )
+
+    def _nested_rows(
+        self, collection: str, item_id: str, nested: str
+    ) -> Optional[tuple[str, dict[int, dict[str, Any]]]]:
+        """The nested table and rows below an item, None if there are none."""
+        table = COLLECTIONS[collection]
+        nested_table = NESTED_COLLECTIONS.get((table, nested))
+        if nested_table is None or int(item_id) not in self._tables[table]:
+            return None
+        return nested_table, self._nested[nested_table].setdefault(int(item_id), {})
+
+    def _route_collection(self, request: httpx.Request, collection: str) -> httpx.Response:
+        table = COLLECTIONS[collection]
+        return self._collection(request, table, self._tables[table], None)
+
+    def _route_item(
+        self, request: httpx.Request, collection: str, item_id: str
+    ) -> httpx.Response:
+        table = COLLECTIONS[collection]
+        return self._item(request, table, self._tables[table], int(item_id))
+
+    def _route_nested_collection(
+        self, request: httpx.Request, collection: str, item_id: str, nested: str
+    ) -> httpx.Response:
+        found = self._nested_rows(collection, item_id, nested)
+        if found is None:
+            return self._not_found(request)
+        table, rows = found
+        return self._collection(request, table, rows, int(item_id))
+
+    def _route_nested_item(  # pylint: disable=too-many-arguments
+        self, request: httpx.Request, collection: str, item_id: str, nested: str, nested_id: str
+    ) -> httpx.Response:
+        found = self._nested_rows(collection, item_id, nested)
+        if found is None:
+            return self._not_found(request)
+        table, rows = found
+        return self._item(request, table, rows, int(nested_id))
+
+    def _route_student_files(  # pylint: disable=too-many-arguments
+        self, request: httpx.Request, collection: str, item_id: str, nested: str, nested_id: str
+    ) -> httpx.Response:
+        found = self._nested_rows(collection, item_id, nested)
+        if found is None or int(nested_id) not in found[1]:
+            return self._not_found(request)
+        return self._json(request, [])
+
+    # Endpoints answered without an access token, by path.
+    _PUBLIC_ENDPOINTS: dict[str, Callable[["FakeHive", httpx.Request], httpx.Response]] = {
+        "/api/core/token/": _login,
+        "/api/core/token/refresh/": _refresh,
+    }
+
+    # Path below /api/core/ -> handler, called with the named groups of the match.
+    _ROUTES: tuple[tuple[re.Pattern[str], Callable[..., httpx.Response]], ...] = (
+        (re.compile("schema"), _schema),
+        (re.compile(rf"(?P<collection>{_COLLECTION_PATTERN})"), _route_collection),
+        (re.compile(rf"(?P<collection>{_COLLECTION_PATTERN})/(?P<item_id>\d+)"), _route_item),
+        (
+            re.compile(rf"(?P<collection>{_COLLECTION_PATTERN})/(?P<item_id>\d+)/(?P<nested>\w+)"),
+            _route_nested_collection,
+        ),
+        (
+            re.compile(
+                rf"(?P<collection>{_COLLECTION_PATTERN})/(?P<item_id>\d+)/(?P<nested>\w+)"
+                r"/(?P<nested_id>\d+)"
+            ),
+            _route_nested_item,
+        ),
+        (
+            re.compile(
+                rf"(?P<collection>{_COLLECTION_PATTERN})/(?P<item_id>\d+)/(?P<nested>\w+)"
+                r"/(?P<nested_id>\d+)/student_files"
+            ),
+            _route_student_files,
+        ),
+    )
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        path = "/".join(s for s in request.url.path.split("/") if s)
+        if path.startswith("api/core/"):
+            for pattern, handler in self._ROUTES:
+                match = pattern.fullmatch(path, len("api/core/"))
+                if match is not None:
+                    return handler(self, request, **match.groupdict())
+        return self._not_found(request)
+
+    def _collection(
+        self,
+        request: httpx.Request,
+        table: str,
+        rows: dict[int, dict[str, Any]],
+        parent: Optional[int],
+    ) -> httpx.Response:
+        if request.method == "POST":
+            body = json_backend.loads(request.content)
+            missing = [f for f in REQUIRED_ON_CREATE.get(table, ()) if body.get(f) is None]
+            if missing:
+                return self._json(
+                    request, {f: ["This field is required."] for f in missing}, 400
+                )
+            if table == "users":
+                password = body.pop("password", None)
+                if body["username"] in self._usernames:
+                    return self._json(
+                        request, {"username": ["A user with that username already exists."]}, 400
+                    )
+                if password is not None:
+                    self._passwords[body["username"]] = password
+            body.pop("id", None)
+            return self._json(request, self.add(table, body, parent=parent), 201)
+        if request.method != "GET":
+            return self._json(request, {"detail": "Method not allowed."}, 405)
+        return self._list(request, table, rows, parent is None)
+
+    def _item(
+        self,
+        request: httpx.Request,
+        table: str,
+        rows: dict[int, dict[str, Any]],
+        item_id: int,
+    ) -> httpx.Response:
+        record = rows.get(item_id)
+        if record is None:
+            return self._not_found(request)
+        if request.method == "GET":
+            return self._json(request, record)
+        if request.method == "DELETE":
+            self._reindex(table, rows.pop(item_id), None)
+            self._changed(table)
+            return httpx.Response(204, request=request)
+        if request.method in ("PUT", "PATCH"):
+            body = json_backend.loads(request.content)
+            body.pop("password", None)
+            updated = {**record, **body} if request.method == "PATCH" else body
+            updated["id"] = item_id
+            self._complete(table, updated)
+            self._reindex(table, record, updated)
+            rows[item_id] = updated
+            self._changed(table)
+            return self._json(request, updated)
+        return self._json(request, {"detail": "Method not allowed."}, 405)
+
+    # ----- Listing -----------------------------------------------------
+
+    def _list(
+        self,
+        request: httpx.Request,
+        table: str,
+        rows: dict[int, dict[str, Any]],
+        indexed: bool,
+    ) -> httpx.Response:
+        params = request.url.params
+        if indexed:
+            # Pages of one listing share the filtered result until the next write.
+            key = (
+                table,
+                tuple(sorted(i for i in params.multi_items() if i[0] not in ("limit", "offset"))),
+            )
+            items = self._results.get(key)
+            if items is None:
+                items = self._results[key] = self._select(table, rows, params, indexed)
+        else:
+            items = self._select(table, rows, params, indexed)
+
+        limit = params.get("limit")
+        if limit is None and self.page_size is None:
+            return self._json(request, items)
+        limit_value = int(limit) if limit is not None else self.page_size
+        assert limit_value is not None
+        offset = int(params.get("offset", 0))
+        page = items[offset : offset + limit_value]
+
+        def link(new_offset: int) -> str:
+            query = {k: v for k, v in params.items() if k != "offset"}
+            query["limit"] = str(limit_value)
+            if new_offset:
+                query["offset"] = str(new_offset)
+            return f"{FAKE_HIVE_URL}{request.url.path}?{urlencode(query)}"
+
+        return self._json(
+            request,
+            {
+                "count": len(items),
+                "next": link(offset + limit_value) if offset + limit_value < len(items) else None,
+                "previous": link(max(offset - limit_value, 0)) if offset > 0 else None,
+                "results": page,
+            },
+        )
+
+    def _select(
+        self,
+        table: str,
+        rows: dict[int, dict[str, Any]],
+        params: httpx.QueryParams,
+        indexed: bool,
+    ) -> list[dict[str, Any]]:
+        """Return the rows matching the filters of ``params``, in their ordering."""
+        ids: Optional[set[int]] = None
+        scans: list[tuple[list[str], str, str]] = []
+        for key, raw in params.multi_items():
+            if key in _PAGINATION_PARAMS:
+                continue
+            parts = key.split("__")
+            lookup = "exact"
+            if len(parts) > 1 and parts[-1] in ("in", *_RANGE_LOOKUPS):
+                lookup = parts.pop()
+            if not rows or parts[0] not in next(iter(rows.values())):
+                continue  # Unknown filter; DRF ignores undeclared filters.
+            if lookup in ("exact", "in") and indexed:
+                index = self._index(table, parts)
+                wanted = raw.split(",") if lookup == "in" else [raw]
+                matched = set().union(*(index.get(v, ()) for v in wanted))
+                ids = matched if ids is None else ids & matched
+            else:
+                scans.append((parts, lookup, raw))
+
+        ordering = params.get("ordering")
+        if indexed:
+            order = self._ordered_ids(table, ordering)
+            selected = order if ids is None else [i for i in order if i in ids]
+            items = [rows[i] for i in selected]
+        else:
+            items = self._sort(rows.values(), ordering)
+        for parts, lookup, raw in scans:
+            items = [r for r in items if self._matches(table, r, parts, lookup, raw)]
+        return items
+
+    def _resolve(self, table: str, record: dict[str, Any], parts: list[str]) -> list[Any]:
+        """Follow ``parts`` (e.g. ``["user", "classes", "id"]``) from ``record``."""
+        values: list[Any] = [record]
+        current: Optional[str] = table
+        is_ids = False
+        for part in parts:
+            if is_ids and part == "id":
+                continue
+            found: list[Any] = []
+            for value in values:
+                if is_ids:
+                    value = self._tables[current].get(value) if current else None
+                    if value is None:
+                        continue
+                value = value.get(part)
+                found.extend(value if isinstance(value, list) else [value])
+            values = found
+            current = RELATIONS.get((current, part)) if current else None
+            is_ids = current is not None
+        return values
+
+    def _index(self, table: str, parts: list[str]) -> dict[str, set[int]]:
+        key = (table, "__".join(parts))
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for item_id, record in self._tables[table].items():
+                for value in self._resolve(table, record, parts):
+                    index.setdefault(_norm(value), set()).add(item_id)
+            self._indexes[key] = index
+        return index
+
+    def _matches(
+        self, table: str, record: dict[str, Any], parts: list[str], lookup: str, raw: str
+    ) -> bool:
+        values = self._resolve(table, record, parts)
+        if lookup == "exact":
+            return raw in map(_norm, values)
+        if lookup == "in":
+            return not set(raw.split(",")).isdisjoint(map(_norm, values))
+        compare = _RANGE_LOOKUPS[lookup]
+        bound = _parse_comparable(raw)
+        for value in values:
+            candidate = _as_comparable(value)
+            if value is not None and type(candidate) is type(bound) and compare(candidate, bound):
+                return True
+        return False
+
+    def _ordered_ids(self, table: str, ordering: Optional[str]) -> list[int]:
+        key = (table, ordering or "")
+        order = self._sorted.get(key)
+        if order is None:
+            order = [r["id"] for r in self._sort(self._tables[table].values(), ordering)]
+            self._sorted[key] = order
+        return order
+
+    @staticmethod
+    def _sort(records: Iterable[dict[str, Any]], ordering: Optional[str]) -> list[dict[str, Any]]:
+        items = sorted(records, key=lambda r: r["id"])
+        for field in reversed((ordering or "").split(",")):
+            if not field:
+                continue
+            name = field.lstrip("-")
+            items.sort(
+                key=lambda r, name=name: (r.get(name) is None, _as_comparable(r.get(name))),
+                reverse=field.startswith("-"),
+            )
+        return items
+
+    def _reindex(
+        self, table: str, old: Optional[dict[str, Any]], new: Optional[dict[str, Any]]
+    ) -> None:
+        """Keep the username index in step with a write to ``table``."""
+        if table != "users":
+            return
+        if old is not None and self._usernames.get(old.get("username")) == old["id"]:
+            del self._usernames[old["username"]]
+        if new is not None and new.get("username") is not None:
+            self._usernames[new["username"]] = new["id"]
+
+    def _changed(self, table: str) -> None:
+        """Drop the cached indexes, orderings and results that read ``table``."""
+        for key in [k for k in self._indexes if table in _tables_read(*k)]:
+            del self._indexes[key]
+        for key in [k for k in self._sorted if k[0] == table]:
+            del self._sorted[key]
+        for key in [
+            k for k in self._results
+            if k[0] == table or any(table in _tables_read(k[0], name) for name, _ in k[1])
+        ]:
+            del self._results[key]
+
+    # ----- Derived fields ----------------------------------------------
+
+    def _complete(self, table: str, record: dict[str, Any], now: Optional[str] = None) -> None:
+        """Fill in the defaults and derived fields the real server returns."""
+        for key, default in _DEFAULTS.get(table, {}).items():
+            if key not in record:
+                record[key] = list(default) if isinstance(default, list) else default
+        if table in _TIMESTAMP_FIELDS and _TIMESTAMP_FIELDS[table] not in record:
+            record[_TIMESTAMP_FIELDS[table]] = now or _now()
+        tables = self._tables
+        if table == "subjects":
+            program = tables["programs"].get(record.get("parent_program"), {})
+            record.setdefault("parent_program_name", program.get("name", ""))
+        elif table == "modules":
+            subject = tables["subjects"].get(record.get("parent_subject"), {})
+            record.setdefault("parent_program_name", subject.get("parent_program_name", ""))
+            record.setdefault("parent_subject_name", subject.get("name", ""))
+            record.setdefault("parent_subject_symbol", subject.get("symbol", ""))
+        elif table == "exercises":
+            module = tables["modules"].get(record.get("parent_module"), {})
+            subject = tables["subjects"].get(module.get("parent_subject"), {})
+            record.setdefault("parent_subject", module.get("parent_subject"))
+            record.setdefault("parent_module_name", module.get("name", ""))
+            record.setdefault("parent_module_order", module.get("order", 0))
+            record.setdefault("parent_subject_name", subject.get("name", ""))
+            record.setdefault("parent_subject_symbol", subject.get("symbol", ""))
+            record.setdefault("parent_subject_color", subject.get("color", "#000000"))
+        elif table == "users":
+            if "display_name" not in record:
+                full_name = f"{record.get('first_name', '')} {record.get('last_name', '')}".strip()
+                record["display_name"] = full_name or record.get("username", "")
+        elif table == "classes":
+            program = tables["programs"].get(record.get("program"), {})
+            record.setdefault("display_name", record.get("name", ""))
+            record.setdefault("program__name", program.get("name", ""))
+        elif table == "queues":
+            self._complete_queue(record)
+        elif table == "help":
+            if "for_exercise" not in record:
+                record["for_exercise"] = record.pop("exercise_id", None)
+
+    def _complete_queue(self, record: dict[str, Any]) -> None:
+        tables = self._tables
+        user = tables["users"].get(record.get("user", record.get("user_id")), {})
+        module = tables["modules"].get(record.get("module", record.get("module_id")), {})
+        subject = tables["subjects"].get(module.get("parent_subject"), {})
+        program = tables["programs"].get(subject.get("parent_program"), {})
+        record.pop("user", None)
+        record.pop("module", None)
+        record.setdefault("description", "")
+        record.setdefault("user_id", user.get("id"))
+        record.setdefault("user_name", user.get("display_name"))
+        record.setdefault("module_id", module.get("id"))
+        record.setdefault("module_name", module.get("name"))
+        record.setdefault("module_order", module.get("order"))
+        record.setdefault("subject_id", subject.get("id"))
+        record.setdefault("subject_name", subject.get("name"))
+        record.setdefault("subject_color", subject.get("color"))
+        record.setdefault("subject_symbol", subject.get("symbol"))
+        record.setdefault("program_id", program.get("id"))
+        record.setdefault("program_name", program.get("name"))
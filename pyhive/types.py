@@ -1,37 +1,57 @@
-"""Type definitions for PyHiveLMS."""
+"""Type definitions for PyHiveLMS.
+
+Models and enums are imported from ``pyhive.src.types`` on first access.
+"""
 
 from __future__ import annotations
 
-# Import the implementation from the `pyhive` package (implementation
-# lives there) and expose the client at package level.
-from pyhive.src.types.assignment import Assignment
-from pyhive.src.types.assignment_response import AssignmentResponse
-from pyhive.src.types.class_ import Class
-from pyhive.src.types.enums.clearance_enum import ClearanceEnum
-from pyhive.src.types.enums.gender_enum import GenderEnum
-from pyhive.src.types.enums.status_enum import StatusEnum
-from pyhive.src.types.exercise import Exercise
-from pyhive.src.types.form_field import FormField
-from pyhive.src.types.module import Module
-from pyhive.src.types.program import Program
-from pyhive.src.types.queue import Queue
-from pyhive.src.types.subject import Subject
-from pyhive.src.types.user import User
-from pyhive.src.types.enums.class_type_enum import ClassTypeEnum
-
-__all__ = [
-    "Assignment",
-    "AssignmentResponse",
-    "User",
-    "Module",
-    "Exercise",
-    "Class",
-    "FormField",
-    "Subject",
-    "Program",
-    "ClearanceEnum",
-    "GenderEnum",
-    "StatusEnum",
-    "ClassTypeEnum",
-    "Queue",
-]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pyhive.src.types.assignment import Assignment
+    from pyhive.src.types.assignment_response import AssignmentResponse
+    from pyhive.src.types.class_ import Class
+    from pyhive.src.types.enums.class_type_enum import ClassTypeEnum
+    from pyhive.src.types.enums.clearance_enum import ClearanceEnum
+    from pyhive.src.types.enums.gender_enum import GenderEnum
+    from pyhive.src.types.enums.status_enum import StatusEnum
+    from pyhive.src.types.exercise import Exercise
+    from pyhive.src.types.form_field import FormField
+    from pyhive.src.types.module import Module
+    from pyhive.src.types.program import Program
+    from pyhive.src.types.queue import Queue
+    from pyhive.src.types.subject import Subject
+    from pyhive.src.types.user import User
+
+_LAZY_IMPORTS = {
+    "Assignment": "pyhive.src.types.assignment",
+    "AssignmentResponse": "pyhive.src.types.assignment_response",
+    "User": "pyhive.src.types.user",
+    "Module": "pyhive.src.types.module",
+    "Exercise": "pyhive.src.types.exercise",
+    "Class": "pyhive.src.types.class_",
+    "FormField": "pyhive.src.types.form_field",
+    "Subject": "pyhive.src.types.subject",
+    "Program": "pyhive.src.types.program",
+    "ClearanceEnum": "pyhive.src.types.enums.clearance_enum",
+    "GenderEnum": "pyhive.src.types.enums.gender_enum",
+    "StatusEnum": "pyhive.src.types.enums.status_enum",
+    "ClassTypeEnum": "pyhive.src.types.enums.class_type_enum",
+    "Queue": "pyhive.src.types.queue",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
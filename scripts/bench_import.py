@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Measure pyhive import time with ``python -X importtime``.
+
+Each statement runs in a fresh interpreter several times. The reported time
+is the median of the summed times of the top-level imports the statement adds
+to an empty interpreter (modules imported at startup, such as ``site``, are
+left out), in milliseconds.
+
+Usage: python scripts/bench_import.py [--runs N] [statement ...]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+DEFAULT_STATEMENTS = [
+    "import pyhive",
+    "import pyhive.types",
+    "from pyhive.types import User",
+    "from pyhive import HiveClient",
+]
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _top_level_imports(statement: str) -> dict[str, int]:
+    """Cumulative import time (us) of each top-level import, by module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    return {
+        match.group(3): int(match.group(1))
+        for match in _IMPORTTIME_LINE.finditer(result.stderr)
+        if not match.group(2)  # Nested imports are already in their parent's total
+    }
+
+
+def measure(statement: str, runs: int) -> float:
+    """Return the median import time (ms) added by running ``statement``."""
+    startup = _top_level_imports("pass").keys()
+    return statistics.median(
+        sum(us for module, us in _top_level_imports(statement).items() if module not in startup)
+        for _ in range(runs)
+    ) / 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("statements", nargs="*", default=DEFAULT_STATEMENTS)
+    args = parser.parse_args()
+
+    for stmt in args.statements:
+        print(f"{measure(stmt, args.runs):8.1f} ms  {stmt}")
@@ -0,0 +1,102 @@
+import datetime
+import json
+from pathlib import Path
+
+import httpx
+
+from pyhive.client import HiveClient
+from pyhive.client.assignment_changes import AssignmentWatermark
+from pyhive.testing import FAKE_HIVE_URL, FakeHive
+
+
+def test_first_poll_reports_every_assignment_as_new(client: HiveClient):
+    watermark = AssignmentWatermark()
+    changes = list(client.iter_assignment_changes(watermark))
+    assert all(old is None for old, _ in changes)
+    assert len(changes) == len(list(client.get_assignments()))
+    if changes:
+        assert watermark.last_staff_updated == max(
+            new.last_staff_updated for _, new in changes
+        )
+
+
+def test_unchanged_assignments_are_not_reported_again(
+    client: HiveClient, tmp_path: Path
+):
+    state_path = tmp_path / "assignments.json"
+    list(client.iter_assignment_changes(state_path=state_path))
+    assert state_path.exists()
+    assert list(client.iter_assignment_changes(state_path=state_path)) == []
+
+
+def test_updated_since_returns_only_newer_rows(client: HiveClient):
+    assignments = sorted(client.get_assignments(), key=lambda a: a.last_staff_updated)
+    if not assignments:
+        return
+    since = assignments[len(assignments) // 2].last_staff_updated
+    recent = list(client.get_assignments_updated_since(since))
+    assert {a.id for a in recent} == {
+        a.id for a in assignments if a.last_staff_updated >= since
+    }
+
+
+def daily_assignments(fake: FakeHive, days: int = 10) -> None:
+    fake.add_many(
+        "assignments",
+        [
+            {"user": 1, "exercise": 1, "last_staff_updated": f"2025-01-{day:02}T00:00:00+00:00"}
+            for day in range(1, days + 1)
+        ],
+    )
+
+
+def test_updated_since_filters_when_the_server_ignores_ordering():
+    fake = FakeHive()
+    daily_assignments(fake)
+
+    def ignore_ordering(request: httpx.Request) -> httpx.Response:
+        params = request.url.params.remove("ordering")
+        return fake.handle_request(
+            httpx.Request(
+                request.method,
+                request.url.copy_with(params=params),
+                headers=request.headers,
+                content=request.content,
+            )
+        )
+
+    client = HiveClient(
+        fake.username, "admin", FAKE_HIVE_URL, transport=httpx.MockTransport(ignore_ordering)
+    )
+    since = datetime.datetime(2025, 1, 5, tzinfo=datetime.timezone.utc)
+    for page_size in (3, 20):
+        recent = client.get_assignments_updated_since(since, page_size=page_size)
+        assert sorted(a.last_staff_updated.day for a in recent) == [5, 6, 7, 8, 9, 10]
+
+
+def test_ordered_server_stops_after_the_first_older_page():
+    fake = FakeHive()
+    daily_assignments(fake)
+    client = fake.client()
+    since = datetime.datetime(2025, 1, 8, tzinfo=datetime.timezone.utc)
+    recent = client.get_assignments_updated_since(since, page_size=3)
+    assert [a.last_staff_updated.day for a in recent] == [10, 9, 8]
+    assert fake.request_counts[("GET", "/api/core/assignments/")] == 2
+
+
+def test_watermark_keeps_only_versions(tmp_path: Path):
+    fake = FakeHive()
+    daily_assignments(fake, days=3)
+    client = fake.client()
+    state_path = tmp_path / "assignments.json"
+    assert len(list(client.iter_assignment_changes(state_path=state_path))) == 3
+    fake.add("assignments", {"user": 1, "exercise": 1})
+    fake.get("assignments", 2)["assignment_status"] = "Done"
+    changes = list(
+        client.iter_assignment_changes(
+            state_path=state_path, rescan_window=datetime.timedelta(days=3650)
+        )
+    )
+    assert sorted((old is not None, new.id) for old, new in changes) == [(False, 4), (True, 2)]
+    saved = json.loads(state_path.read_text(encoding="UTF-8"))["known"]
+    assert saved["2"] == ["2025-01-02T00:00:00+00:00", "Done"]
@@ -0,0 +1,74 @@
+import pytest
+
+from pyhive.client import HiveClient
+from pyhive.client.budget import BudgetExceededError
+from pyhive.testing import FakeHive
+from pyhive.types import ClearanceEnum, Program
+
+
+def test_budget_counts_requests(client: HiveClient, program: Program):
+    with client.budget(max_requests=1) as budget:
+        client.get_program(program.id)
+    assert budget.requests == 1
+
+
+def test_budget_stops_request_blowup(client: HiveClient, large_program: Program):
+    users = list(client.get_users(program__id__in=[large_program.id]))
+    assert len(users) > 2
+    with pytest.raises(BudgetExceededError, match="users/{id}/"):
+        with client.budget(max_requests=2) as budget:
+            for user in users:
+                client.get_user(user.id)
+    assert budget.requests == 2
+
+
+def test_explain_records_without_writing(client: HiveClient, program: Program):
+    with client.explain() as report:
+        client.delete_program(program)
+    assert [(r.method, r.sent) for r in report.requests] == [("DELETE", False)]
+    assert client.get_program(program.id).id == program.id
+
+
+def test_explain_does_not_write_through_a_proxy():
+    fake = FakeHive()
+    fake.add("programs", {"name": "Program"})
+    client = fake.client(proxy="http://proxy.invalid:3128")
+    with client.explain() as report:
+        client.delete_program(1)
+    assert [(r.method, r.sent) for r in report.requests] == [("DELETE", False)]
+    assert fake.get("programs", 1) is not None
+
+
+def test_explain_dry_runs_writes():
+    fake = FakeHive()
+    fake.add("users", {"username": "checker", "clearance": ClearanceEnum.SEGEL})
+    fake.add("programs", {"name": "Program", "checker": 1})
+    fake.add("queues", {"name": "Queue"})
+    fake.add(
+        "classes",
+        {"name": "Class", "program": 1, "type": "Room", "email": "", "description": ""},
+    )
+    client = fake.client(cache_soft_ttl=60)
+    user = client.get_user(1)
+    class_ = client.get_class(1)
+    users = list(client.get_users())
+    with client.explain() as report:
+        program = client.create_program("New", checker=1)
+        user.first_name = "Ada"
+        user.save()
+        client.set_users_queue(user, 1)
+        class_.name = "Renamed"
+        client.update_class(class_)
+    assert (program.id, program.name) == (0, "New")
+    assert [(r.method, r.sent) for r in report.writes] == [
+        ("POST", False),
+        ("PATCH", False),
+        ("PATCH", False),
+        ("PUT", False),
+    ]
+    assert fake.count("programs") == 1
+    assert fake.get("users", 1).get("first_name") != "Ada"
+    assert fake.get("classes", 1)["name"] == "Class"
+    fake.request_counts.clear()
+    assert list(client.get_users()) == users  # Still cached: nothing was written
+    assert not fake.request_counts
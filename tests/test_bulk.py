@@ -0,0 +1,103 @@
+import pytest
+
+from pyhive.client.bulk import RateLimiter
+from pyhive.testing import FakeHive
+from pyhive.types import ClearanceEnum, GenderEnum
+
+
+@pytest.fixture
+def fake() -> FakeHive:
+    fake = FakeHive()
+    fake.add("programs", {"name": "Program"})
+    return fake
+
+
+def student(i: int, **overrides):
+    return {
+        "username": f"student{i}",
+        "password": "secret",
+        "clearance": ClearanceEnum.HANICH,
+        "gender": GenderEnum.FEMALE,
+        "number": i,
+        "program": 1,
+        **overrides,
+    }
+
+
+def test_bulk_create_reports_every_record(fake: FakeHive):
+    client = fake.client()
+    fake.add("users", {"username": "taken", "clearance": ClearanceEnum.HANICH})
+    records = [
+        *(student(i) for i in range(10)),
+        student(10, program=None),  # HANICH without a program
+        student(0),  # Duplicate in the batch
+        student(11, username="taken"),  # Rejected by the server
+    ]
+    report = client.bulk_create_users(records, concurrency=4)
+    assert [r.status for r in report.results] == ["created"] * 10 + ["invalid"] * 2 + ["failed"]
+    assert [u.username for u in report.created] == [f"student{i}" for i in range(10)]
+    assert not report.ok
+    assert fake.count("users") == 11
+
+
+def test_bulk_create_resumes_from_journal(fake: FakeHive, tmp_path):
+    client = fake.client()
+    journal = tmp_path / "journal.jsonl"
+    records = [student(i) for i in range(6)]
+    client.bulk_create_users(records[:3], journal=journal)
+    client.create_user(**records[3])  # Created, but the process died before journaling it
+    with journal.open("ab") as file:
+        file.write(b'{"index": 4, "user')  # A line cut short
+
+    report = client.bulk_create_users(records, journal=journal)
+    assert report.counts() == {"skipped": 4, "created": 2}
+    assert report.ok
+    assert fake.count("users") == 6
+    assert client.bulk_create_users(records, journal=journal).counts() == {"skipped": 6}
+
+
+def test_rate_limiter_spaces_calls():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+
+    limiter = RateLimiter(4, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+    assert sleeps == [0.25, 0.5]
+
+
+def test_bulk_create_reports_unexpected_errors_per_record(fake: FakeHive, monkeypatch):
+    client = fake.client()
+    post = client.post
+
+    def flaky_post(endpoint, data, *args, **kwargs):
+        if data["username"] == "student1":
+            raise RuntimeError("boom")
+        return post(endpoint, data, *args, **kwargs)
+
+    monkeypatch.setattr(client, "post", flaky_post)
+    report = client.bulk_create_users([student(i) for i in range(3)], concurrency=2)
+    assert [r.status for r in report.results] == ["created", "failed", "created"]
+    assert "boom" in str(report)
+
+
+def test_iter_bulk_create_streams_records(fake: FakeHive):
+    client = fake.client()
+    read = []
+
+    def records():
+        for i in range(20):
+            read.append(i)
+            yield student(i)
+        yield student(3)  # Duplicate of a record read long before
+
+    results = client.iter_bulk_create_users(records(), concurrency=2)
+    assert next(results).index == 0
+    assert len(read) <= 5  # At most 2 * concurrency records ahead
+    rest = list(results)
+    assert [r.index for r in rest] == list(range(1, 21))
+    assert [r.status for r in rest][-2:] == ["created", "invalid"]
+    assert fake.count("users") == 20
@@ -0,0 +1,62 @@
+import gzip
+import time
+
+import pytest
+
+from pyhive.client.cassette import Cassette, UnmatchedRequestError
+from pyhive.testing import FakeHive
+from pyhive.types import GenderEnum
+
+
+@pytest.fixture
+def fake() -> FakeHive:
+    fake = FakeHive(page_size=2)
+    program = fake.add("programs", {"name": "Program"})
+    fake.add_many("classes", [{"name": f"Class {i}", "program": program["id"]} for i in range(3)])
+    return fake
+
+
+def test_record_and_replay(fake: FakeHive, tmp_path):
+    client = fake.client()
+    path = tmp_path / "session.jsonl.gz"
+    with client.record(path) as cassette:
+        program = client.get_program(1)
+        fake.expire_tokens()
+        classes = [c.name for c in client.get_classes()]
+        client.create_student("student", "hunter2", GenderEnum.FEMALE, number=1, program=program)
+    # 401, refresh, 2 pages of classes, create
+    assert [i.status_code for i in cassette.interactions][1:] == [401, 200, 200, 200, 201]
+
+    raw = gzip.decompress(path.read_bytes())
+    assert b"hunter2" not in raw
+    assert client._access_token.encode() not in raw  # pylint: disable=protected-access
+    assert client._refresh_token.encode() not in raw  # pylint: disable=protected-access
+
+    replayed = Cassette.load(path).replay_client()
+    assert replayed.get_program(1).name == "Program"
+    assert [c.name for c in replayed.get_classes()] == classes
+    assert [c.name for c in replayed.get_classes()] == classes  # Repeated reads are served
+    replayed.create_student("student", "other", GenderEnum.FEMALE, number=1, program=program)
+    with pytest.raises(UnmatchedRequestError, match="/api/core/management/users/5/"):
+        replayed.get_user(5)
+    assert fake.count("users") == 1  # Replaying never reaches the server
+
+
+def test_replay_scales_recorded_timings(fake: FakeHive):
+    client = fake.client()
+    fake.latency = 0.1
+    with client.record() as cassette:
+        client.get_program(1)
+    assert cassette.interactions[0].seconds >= 0.1
+
+    replayed = cassette.replay_client(time_scale=0.5)
+    start = time.perf_counter()
+    replayed.get_program(1)
+    assert 0.05 <= time.perf_counter() - start < 0.1
+
+
+def test_record_through_a_proxy(fake: FakeHive):
+    client = fake.client(proxy="http://proxy.invalid:3128")
+    with client.record() as cassette:
+        client.get_program(1)
+    assert [i.status_code for i in cassette.interactions] == [200]
@@ -0,0 +1,94 @@
+import csv
+import gzip
+import json
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from pyhive.cli import common
+from pyhive.cli.main import app
+from pyhive.client import HiveClient
+from pyhive.testing import FAKE_HIVE_URL, FakeHive
+
+ARGS = ["--hive-url", "http://fake", "-u", "admin", "--password", "admin"]
+
+
+@pytest.fixture
+def fake(monkeypatch) -> FakeHive:
+    fake = FakeHive()
+    fake.add_many("programs", [{"name": f"Program {i}"} for i in range(2)])
+    fake.add_many(
+        "users",
+        [{"username": f"user{i}", "program": i % 2 + 1, "classes": [i]} for i in range(25)],
+    )
+    monkeypatch.setattr(common, "connect", lambda *args: fake.client())
+    return fake
+
+
+def export(*args: str):
+    return CliRunner().invoke(app, ["export", "users", *ARGS, "--page-size", "4", *args])
+
+
+def test_export_ndjson_gzip_with_filter(fake: FakeHive, tmp_path):
+    out = tmp_path / "users.ndjson.gz"
+    result = export("--out", str(out), "--filter", "program__id__in=2", "--concurrency", "3")
+    assert result.exit_code == 0, result.output
+    with gzip.open(out, "rt", encoding="utf-8") as file:
+        users = [json.loads(line) for line in file]
+    assert [u["username"] for u in users] == [f"user{i}" for i in range(1, 25, 2)]
+    assert not (tmp_path / "users.ndjson.gz.checkpoint").exists()
+
+
+def test_export_csv_resumes_from_checkpoint(fake: FakeHive, tmp_path):
+    out = tmp_path / "users.csv"
+    requests = 0
+
+    def interrupt_after_two_pages() -> float:
+        nonlocal requests
+        requests += 1
+        if requests == 5:  # Login, version check and two pages went through
+            raise KeyboardInterrupt
+        return 0.0
+
+    fake.latency = interrupt_after_two_pages
+    assert export("--out", str(out), "--concurrency", "1").exit_code != 0
+    checkpoint = json.loads((tmp_path / "users.csv.checkpoint").read_text(encoding="utf-8"))
+    assert checkpoint["key"]["params"] == {"ordering": "id"}
+    with out.open("ab") as file:
+        file.write(b"user8,half a row")  # A page cut short
+    fake.latency = 0.0
+    fake.request_counts.clear()
+
+    assert export("--out", str(out)).exit_code == 0
+    assert fake.request_counts[("GET", "/api/core/management/users/")] == 5  # From offset 8
+    with out.open(encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [r["username"] for r in rows] == [f"user{i}" for i in range(25)]
+    assert rows[3]["classes"] == "[3]"
+
+
+def test_export_keeps_a_given_ordering(fake: FakeHive, tmp_path):
+    out = tmp_path / "users.ndjson"
+    assert export("--out", str(out), "--filter", "ordering=-id").exit_code == 0
+    with out.open(encoding="utf-8") as file:
+        users = [json.loads(line) for line in file]
+    assert [u["username"] for u in users] == [f"user{i}" for i in reversed(range(25))]
+
+
+def test_export_fails_when_the_server_caps_the_page_size(fake: FakeHive, tmp_path, monkeypatch):
+    def capped(request: httpx.Request) -> httpx.Response:
+        if "limit" in request.url.params:
+            limit = min(int(request.url.params["limit"]), 3)
+            request = httpx.Request(
+                request.method,
+                request.url.copy_set_param("limit", limit),
+                headers=request.headers,
+            )
+        return fake.handle_request(request)
+
+    client = HiveClient("admin", "admin", FAKE_HIVE_URL, transport=httpx.MockTransport(capped))
+    monkeypatch.setattr(common, "connect", lambda *args: client)
+    result = export("--out", str(tmp_path / "users.ndjson"))
+    assert result.exit_code == 1
+    assert "Expected 4 records at offset 0 but got 3" in result.output
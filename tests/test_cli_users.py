@@ -0,0 +1,90 @@
+import csv
+
+import pytest
+from typer.testing import CliRunner
+
+from pyhive.cli import common
+from pyhive.cli.main import app
+from pyhive.testing import FakeHive
+from pyhive.types import ClearanceEnum
+
+ARGS = ["--hive-url", "http://fake", "-u", "admin", "--password", "admin"]
+
+
+@pytest.fixture
+def fake(monkeypatch) -> FakeHive:
+    fake = FakeHive()
+    program = fake.add("programs", {"name": "Python"})
+    fake.add("classes", {"name": "Class A", "program": program["id"]})
+    fake.add("users", {"username": "mentor", "clearance": ClearanceEnum.SEGEL})
+    monkeypatch.setattr(common, "connect", lambda *args: fake.client())
+    return fake
+
+
+def test_users_import(fake: FakeHive, tmp_path):
+    cohort = tmp_path / "cohort.csv"
+    cohort.write_text(
+        "username,password,gender,number,program,classes,mentor\n"
+        "dana,pw,female,1,Python,Class A,mentor\n"
+        "eli,pw,Male,2,Python,Class B,mentor\n"
+        "noa,pw,NonBinary,3,Python,,\n",
+        encoding="utf-8",
+    )
+    result = CliRunner().invoke(app, ["users", "import", str(cohort), *ARGS])
+    assert result.exit_code == 1, result.output
+    assert "2 created, 0 skipped, 1 invalid, 0 failed" in result.output
+    with (tmp_path / "cohort.results.csv").open(encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [(r["row"], r["status"]) for r in rows] == [
+        ("1", "created"),
+        ("2", "invalid"),
+        ("3", "created"),
+    ]
+    assert rows[1]["error"] == "Unknown class 'Class B'"
+    dana = next(u for u in fake.records("users") if u["username"] == "dana")
+    assert (dana["program"], dana["classes"], dana["mentor"]) == (1, [1], 1)
+    assert fake.request_counts[("GET", "/api/core/management/users/")] == 1  # One mentor lookup
+
+
+def test_users_import_reports_malformed_rows(fake: FakeHive, tmp_path):
+    cohort = tmp_path / "cohort.csv"
+    cohort.write_text(
+        "username,password,gender,number,program\n"
+        "dana,pw,female,1,Python,extra\n"
+        "eli,pw,male,2,Python\n",
+        encoding="utf-8",
+    )
+    result = CliRunner().invoke(app, ["users", "import", str(cohort), *ARGS])
+    assert result.exit_code == 1, result.output
+    assert "1 created, 0 skipped, 1 invalid, 0 failed" in result.output
+
+    lines = tmp_path / "lines.jsonl"
+    lines.write_text(
+        '["noa", "pw"]\n{"username": "noa", "password": "pw", "gender": "female", '
+        '"number": 3, "program": "Python"}\n',
+        encoding="utf-8",
+    )
+    result = CliRunner().invoke(app, ["users", "import", str(lines), *ARGS])
+    assert "1 created, 0 skipped, 1 invalid, 0 failed" in result.output
+    with (tmp_path / "lines.results.csv").open(encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [(r["row"], r["status"], r["error"]) for r in rows] == [
+        ("1", "invalid", "Expected a JSON object"),
+        ("2", "created", ""),
+    ]
+
+
+def test_users_import_reports_repeated_usernames_as_invalid(fake: FakeHive, tmp_path):
+    cohort = tmp_path / "cohort.csv"
+    cohort.write_text(
+        "username,password,gender,number,program\n"
+        + "".join(f"user{i},pw,female,{i},Python\n" for i in range(30))
+        + "user0,pw,female,0,Python\n",
+        encoding="utf-8",
+    )
+    result = CliRunner().invoke(app, ["users", "import", str(cohort), *ARGS, "--concurrency", "2"])
+    assert "30 created, 0 skipped, 1 invalid, 0 failed" in result.output
+    with (tmp_path / "cohort.results.csv").open(encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert [r["row"] for r in rows] == [str(i) for i in range(1, 32)]
+    assert rows[-1]["error"] == "Duplicate username 'user0' in batch"
@@ -1,7 +1,9 @@
 import re
+from pathlib import Path
 from typing import Literal
 
 import pytest
+from httpx import HTTPStatusError
 
 from pyhive.client import HiveClient
 from pyhive.src.types.assignment import Assignment
@@ -198,3 +200,66 @@ def test_skip_version_check(monkeypatch: pytest.MonkeyPatch):
     # Should not raise when skip_version_check=True
     with HiveClient(**get_client_params(), skip_version_check=True) as client2:
         assert client2 is not None
+
+
+def test_lazy_client_defers_login_and_version_check(monkeypatch: pytest.MonkeyPatch):
+    params = {**get_client_params(), "password": "wrong-password"}
+    client = HiveClient(**params, lazy=True)  # No request is made yet
+    with pytest.raises(HTTPStatusError):
+        client.get_hive_version()
+
+    monkeypatch.setattr(HiveClient, "get_hive_version", lambda self: "0.0.0-unsupported")
+    with HiveClient(**get_client_params(), lazy=True) as lazy_client:
+        with pytest.raises(RuntimeError):
+            list(lazy_client.get_programs())
+
+
+def test_version_cache_skips_version_request(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    calls: list[str] = []
+    original = HiveClient.get_hive_version
+
+    def counting_get_hive_version(self: HiveClient) -> str:
+        calls.append(self.hive_url)
+        return original(self)
+
+    monkeypatch.setattr(HiveClient, "get_hive_version", counting_get_hive_version)
+    cache_path = tmp_path / "versions.json"
+    for _ in range(2):
+        with HiveClient(
+            **get_client_params(), version_cache_ttl=60, version_cache_path=cache_path
+        ):
+            pass
+    assert len(calls) == 1
+
+
+def test_hive_version_is_remembered(client: HiveClient):
+    version = client.get_hive_version()
+    assert client.get_hive_version() is version
+
+
+def test_token_store_skips_password_login(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    from pyhive.src.token_store import TokenStore
+
+    store = TokenStore(tmp_path / "tokens.json")
+    with HiveClient(**get_client_params(), token_store=store) as first:
+        first_token = first._access_token  # pyright: ignore[reportPrivateUsage]
+    assert (tmp_path / "tokens.json").stat().st_mode & 0o077 == 0
+
+    def fail_login(self: HiveClient, username: str, password: str) -> None:
+        raise AssertionError("Expected the stored token to be reused")
+
+    monkeypatch.setattr(HiveClient, "_login", fail_login)
+    with HiveClient(**get_client_params(), token_store=store) as second:
+        assert second._access_token == first_token  # pyright: ignore[reportPrivateUsage]
+        assert list(second.get_programs()) is not None
+
+
+def test_streamed_list_pages_match(client: HiveClient):
+    with HiveClient(**get_client_params(), stream_list_pages=True) as streaming:
+        assert [u.to_dict() for u in streaming.get_users()] == [
+            u.to_dict() for u in client.get_users()
+        ]
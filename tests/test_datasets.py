@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from pyhive.testing import Dataset, DatasetScale, generate_dataset
+
+
+def test_same_seed_same_dataset():
+    assert generate_dataset("tiny", seed=7) == generate_dataset("tiny", seed=7)
+    assert generate_dataset("tiny", seed=7) != generate_dataset("tiny", seed=8)
+
+
+def test_scale_controls_counts():
+    scale = DatasetScale(
+        subjects_per_program=2, modules_per_subject=2, exercises_per_module=2,
+        checkers=2, students=10, assignments_per_student=3, help_requests=4,
+    )
+    counts = generate_dataset(scale).counts()
+    assert counts["exercises"] == 8
+    assert counts["users"] == 2 + 1 + 10
+    assert 10 <= counts["assignments"] <= 30
+    assert counts["help"] == 4
+
+
+def test_every_record_parses(tmp_path: Path):
+    dataset = generate_dataset("tiny", seed=1)
+    dataset.write_json(tmp_path)
+    client = Dataset.read_json(tmp_path).to_fake_hive(page_size=25).client()
+    for method in (
+        "get_programs", "get_subjects", "get_modules", "get_exercises", "get_users",
+        "get_classes", "get_queues", "get_assignments", "get_help_requests",
+    ):
+        table = method.removeprefix("get_").removesuffix("_requests")
+        assert len(list(getattr(client, method)())) == len(dataset.tables[table])
+    for assignment_id, responses in list(dataset.nested["assignment_responses"].items())[:20]:
+        assert len(list(client.get_assignment_responses(assignment_id))) == len(responses)
+    student = next(iter(client.get_students()))
+    assert student.mentor.mentee_ids.count(student.id) == 1
+    assert student.id in student.classes[0].user_ids
+
+
+def test_unknown_scale():
+    with pytest.raises(ValueError):
+        generate_dataset("huge")
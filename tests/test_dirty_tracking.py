@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from pyhive.testing import FakeHive
+from pyhive.types import Class, ClearanceEnum, User
+
+
+@pytest.fixture
+def fake() -> FakeHive:
+    fake = FakeHive()
+    program = fake.add("programs", {"name": "Program"})
+    fake.add("queues", {"name": "Queue"})
+    fake.add("classes", {"name": "Class", "program": program["id"]})
+    fake.add_many(
+        "users",
+        [
+            {"username": f"student{i}", "clearance": ClearanceEnum.HANICH, "program": 1}
+            for i in range(3)
+        ],
+    )
+    return fake
+
+
+def sent_bodies(cassette) -> list[tuple[str, dict]]:
+    return [
+        (i.method, json.loads(i.request_body))
+        for i in cassette.interactions
+        if i.method not in ("GET", "POST")
+    ]
+
+
+def test_loaded_models_are_clean(fake: FakeHive):
+    client = fake.client()
+    user = client.get_user(1)
+    assert user.dirty_fields == frozenset()
+    user.first_name = "Ada"
+    user.queue_id = 1
+    user.class_ids.append(1)
+    user.mark_dirty("class_ids")
+    assert user.dirty_fields == {"first_name", "queue_id", "class_ids"}
+    assert user.changes() == {"first_name": "Ada", "queue": 1, "classes": [1]}
+
+
+def test_save_patches_only_changed_fields(fake: FakeHive):
+    client = fake.client()
+    user = client.get_user(1)
+    class_ = client.get_class(1)
+    with client.record() as cassette:
+        user.first_name = "Ada"
+        user.queue_id = 1
+        user.save()
+        user.save()  # Nothing changed since: no request
+        class_.name = "Renamed"
+        class_.save()
+    assert sent_bodies(cassette) == [
+        ("PATCH", {"first_name": "Ada", "queue": 1}),
+        ("PATCH", {"name": "Renamed"}),
+    ]
+    assert user.dirty_fields == frozenset()
+    assert fake.get("users", 1)["first_name"] == "Ada"
+    assert client.get_class(1).name == "Renamed"
+
+
+def test_set_users_queue_sends_one_patch(fake: FakeHive):
+    client = fake.client()
+    user = client.get_user(2)
+    with client.record() as cassette:
+        updated = client.set_users_queue(user, 1)
+        client.set_users_queue(3, 1)
+    assert [i.method for i in cassette.interactions] == ["PATCH", "PATCH"]
+    assert sent_bodies(cassette)[0] == ("PATCH", {"queue": 1})
+    assert updated.queue_id == user.queue_id == 1
+    assert user.dirty_fields == frozenset()
+    assert fake.get("users", 3)["queue"] == 1
+
+
+def test_api_names():
+    assert User.api_name("mentor_id") == "mentor"
+    assert User.api_name("first_name") == "first_name"
+    assert Class.api_name("user_ids") == "users"
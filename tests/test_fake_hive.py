@@ -0,0 +1,87 @@
+import pytest
+from httpx import HTTPStatusError
+
+from pyhive import HiveClient
+from pyhive.testing import FAKE_HIVE_URL, FakeHive
+from pyhive.types import GenderEnum
+
+
+@pytest.fixture
+def fake() -> FakeHive:
+    fake = FakeHive(page_size=2)
+    program = fake.add("programs", {"name": "Program"})
+    subject = fake.add(
+        "subjects", {"name": "Subject", "symbol": "S", "parent_program": program["id"]}
+    )
+    module = fake.add("modules", {"name": "Module", "parent_subject": subject["id"]})
+    fake.add_many(
+        "exercises",
+        [{"name": f"Exercise {i}", "parent_module": module["id"], "order": i} for i in range(5)],
+    )
+    return fake
+
+
+def test_course_tree_round_trip(fake: FakeHive):
+    client = fake.client()
+    exercises = list(client.get_exercises())
+    assert [e.name for e in exercises] == [f"Exercise {i}" for i in range(5)]
+    assert exercises[0].parent_module.parent_subject.parent_program.name == "Program"
+    assert fake.request_counts[("GET", "/api/core/course/exercises/")] == 3  # Paginated by 2
+
+
+def test_create_filter_and_delete(fake: FakeHive):
+    client = fake.client()
+    program = next(iter(client.get_programs()))
+    class_ = client.create_class("Class", program=program)
+    student = client.create_student(
+        "student", "secret", GenderEnum.FEMALE, number=1, program=program, classes=[class_]
+    )
+    client.create_student("other", "secret", GenderEnum.MALE, number=2, program=program)
+    assert [u.username for u in client.get_users(classes__id__in=[class_.id])] == ["student"]
+    exercise = next(iter(client.get_exercises()))
+    fake.add("assignments", {"user": student.id, "exercise": exercise.id})
+    assert len(list(client.get_assignments(user__classes__id=class_.id))) == 1
+    client.delete_user(student)
+    with pytest.raises(HTTPStatusError):
+        client.get_user(student.id)
+
+
+def test_writes_refresh_filters_through_related_tables(fake: FakeHive):
+    client = fake.client()
+    student = fake.add("users", {"username": "student", "classes": []})
+    fake.add("assignments", {"user": student["id"], "exercise": 1})
+    assert list(client.get_exercises())  # Cached listings of unrelated tables stay valid
+    assert not list(client.get_assignments(user__classes__id=7))
+    fake.add("users", {**student, "username": "renamed", "classes": [7]})
+    assert len(list(client.get_assignments(user__classes__id=7))) == 1
+    program = client.get_program(1)
+    client.create_student("student", "secret", GenderEnum.MALE, number=3, program=program)
+    with pytest.raises(ValueError, match="already exists"):
+        client.create_student("renamed", "secret", GenderEnum.MALE, number=4, program=program)
+
+
+def test_ordering_and_range_filters(fake: FakeHive):
+    client = fake.client()
+    for minute in (5, 1, 3):
+        fake.add(
+            "assignments",
+            {"user": 1, "exercise": 1, "last_staff_updated": f"2025-01-01T00:0{minute}:00+00:00"},
+        )
+    newest_first = list(client.get_assignments(ordering="-last_staff_updated"))
+    assert [a.last_staff_updated.minute for a in newest_first] == [5, 3, 1]
+    recent = client.get_assignments_updated_since(newest_first[1].last_staff_updated)
+    assert sorted(a.last_staff_updated.minute for a in recent) == [3, 5]
+
+
+def test_injected_errors_are_retried_and_tokens_refreshed(fake: FakeHive):
+    client = fake.client()
+    fake.fail_next(502)
+    fake.expire_tokens()
+    assert client.get_program(1).name == "Program"
+    assert fake.request_counts[("POST", "/api/core/token/refresh/")] == 1
+
+
+def test_wrong_password_is_rejected():
+    fake = FakeHive(password="right")
+    with pytest.raises(HTTPStatusError):
+        HiveClient("admin", "wrong", FAKE_HIVE_URL, transport=fake.transport)
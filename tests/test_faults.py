@@ -0,0 +1,52 @@
+import httpx
+import pytest
+
+from pyhive.client.faults import FaultInjectionTransport
+from pyhive.src import authenticated_hive_client
+from pyhive.testing import FakeHive
+
+
+@pytest.fixture
+def fake(monkeypatch) -> FakeHive:
+    monkeypatch.setattr(authenticated_hive_client, "INITIAL_BACKOFF_SECONDS", 0.001)
+    fake = FakeHive(page_size=1)
+    fake.add_many("programs", [{"name": f"Program {i}"} for i in range(20)])
+    return fake
+
+
+def test_retries_and_refreshes_are_reported(fake: FakeHive):
+    client = fake.client()
+    with client.inject_faults(status_rates={502: 0.2}, expired_token_rate=0.1, seed=2) as report:
+        assert len(list(client.get_programs())) == 20
+    assert report.calls == 20  # One page per program
+    assert report.retries == report.injected["502"] > 0
+    assert report.token_refreshes == report.injected["expired token"] > 0
+    # Each retry repeats one request; each refresh adds the refresh and the repeat.
+    assert report.requests == report.calls + report.retries + 2 * report.token_refreshes
+    assert report.amplification > 1
+    assert report.backoff_seconds > 0
+
+
+def test_persistent_errors_surface(fake: FakeHive):
+    client = fake.client()
+    with client.inject_faults(status_rates={502: 1.0}) as report:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_program(1)
+    assert report.retries == authenticated_hive_client.MAX_RETRIES_ON_SERVER_ERRORS - 1
+    with client.inject_faults(reset_rate=1.0):
+        with pytest.raises(httpx.ReadError):
+            client.get_program(1)
+    assert client.get_program(1).name == "Program 0"
+
+
+def test_invalid_rates(fake: FakeHive):
+    with pytest.raises(ValueError, match="at most 1"):
+        FaultInjectionTransport(fake.transport, status_rates={502: 0.6, 503: 0.6})
+
+
+def test_faults_are_injected_through_a_proxy(fake: FakeHive):
+    client = fake.client(proxy="http://proxy.invalid:3128")
+    with client.inject_faults(status_rates={502: 1.0}) as report:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_program(1)
+    assert report.injected["502"] == authenticated_hive_client.MAX_RETRIES_ON_SERVER_ERRORS
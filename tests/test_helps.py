@@ -1,9 +1,15 @@
 from pyhive.client import HiveClient
+from pyhive.client.help_watcher import (
+    DEFAULT_MAX_INTERVAL_SECONDS,
+    DEFAULT_MIN_INTERVAL_SECONDS,
+    HelpEventType,
+)
 from pyhive.src.types.enums.clearance_enum import ClearanceEnum
 from pyhive.src.types.enums.help_type_enum import HelpTypeEnum
 from pyhive.src.types.enums.visibility_enum import VisibilityEnum
 from pyhive.src.types.help_ import Help
 from pyhive.src.types.help_response import HelpResponse
+from pyhive.testing import FakeHive
 from tests.common import get_client_params
 
 
@@ -67,3 +73,38 @@ def test_create_and_delete_new_chat() -> None:
             assert chat.title == CHAT_TITLE
         finally:
             client.delete_chat(chat)
+
+
+def test_help_watcher_reports_new_chat() -> None:
+    with HiveClient(**get_client_params()) as client:
+        watcher = client.watch_help_requests(min_interval=0.1, max_interval=0.4)
+        assert watcher.poll() == []
+        assert watcher.interval == 0.2, "Idle poll should back off"
+
+        student = list(client.get_students())[0]
+        chat = client.create_chat(with_user=student, title="Watcher test chat")
+        try:
+            events = watcher.poll()
+            assert any(
+                e.type_ == HelpEventType.CREATED and e.help.id == chat.id
+                for e in events
+            )
+            assert watcher.interval == watcher.min_interval
+        finally:
+            client.delete_chat(chat)
+
+        events = watcher.poll()
+        assert any(
+            e.type_ == HelpEventType.RESOLVED and e.help.id == chat.id for e in events
+        )
+
+
+def test_watch_help_requests_forwards_watcher_options() -> None:
+    client = FakeHive().client()
+    watcher = client.watch_help_requests(
+        backoff=3.0, fetch_responses=False, emit_initial=True, user__id=1
+    )
+    assert watcher.min_interval == DEFAULT_MIN_INTERVAL_SECONDS
+    assert watcher.max_interval == DEFAULT_MAX_INTERVAL_SECONDS
+    assert (watcher.backoff, watcher.fetch_responses, watcher.emit_initial) == (3.0, False, True)
+    assert watcher.filters == {"current": True, "user__id": 1}
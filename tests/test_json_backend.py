@@ -0,0 +1,24 @@
+import pytest
+
+from pyhive.src import json_backend
+
+PAYLOAD = {"name": "Zoë", "ids": [1, 2], "nested": {"ok": True, "none": None}}
+
+
+@pytest.mark.parametrize("name", ["stdlib", "orjson"])
+def test_backends_round_trip(name: str):
+    if name == "orjson":
+        pytest.importorskip("orjson")
+    previous = json_backend.set_json_backend(name)
+    try:
+        assert json_backend.get_json_backend().name == name
+        encoded = json_backend.dumps(PAYLOAD)
+        assert isinstance(encoded, bytes)
+        assert json_backend.loads(encoded) == PAYLOAD
+    finally:
+        json_backend.set_json_backend(previous)
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        json_backend.set_json_backend("no-such-codec")
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from pyhive.src.json_stream import (
+    find_json_value,
+    iter_json_events,
+    iter_json_list_items,
+)
+
+DOCUMENT = {
+    "openapi": "3.0.3",
+    "info": {"title": 'Hive "API" \\', "version": "6.2.0"},
+    "paths": {"/a/": [1, -2.5e3, True, None, {"x": "é"}]},
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+def test_events_do_not_depend_on_chunking(chunk_size: int):
+    raw = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+    chunks = [raw[i : i + chunk_size] for i in range(0, len(raw), chunk_size)]
+    assert list(iter_json_events(chunks)) == list(iter_json_events([raw]))
+    assert find_json_value(chunks, ("info", "version")) == "6.2.0"
+
+
+def test_find_json_value_stops_early():
+    consumed: list[bytes] = []
+
+    def chunks():
+        for chunk in (b'{"info": {"version": "1.2.3"}', b', "paths": {', b"}}"):
+            consumed.append(chunk)
+            yield chunk
+
+    assert find_json_value(chunks(), ("info", "version")) == "1.2.3"
+    assert len(consumed) == 1
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b'{"a": ',
+        b'{"a": "x',
+        b"[1, tru]",
+        b"[1x]",
+        b"[1 2]",
+        b"[1,,2]",
+        b"[1,]",
+        b'{"a" 1}',
+        b'{"a": 1 "b": 2}',
+        b'{"a": 1,}',
+        b'{1: 2}',
+        b"[1]]",
+        b"[1] 2",
+        b"",
+    ],
+)
+def test_malformed_json_raises(raw: bytes):
+    with pytest.raises(ValueError):
+        list(iter_json_events([raw]))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_list_items_of_paginated_page(chunk_size: int):
+    page = {"count": 3, "next": "http://hive/?offset=2", "results": [{"id": 1}, {"id": -2.5e3}]}
+    raw = json.dumps(page).encode()
+    chunks = [raw[i : i + chunk_size] for i in range(0, len(raw), chunk_size)]
+    fields: dict[str, object] = {}
+    assert list(iter_json_list_items(chunks, fields=fields)) == page["results"]
+    assert fields == {"count": 3, "next": "http://hive/?offset=2"}
+
+
+def test_list_items_of_plain_array():
+    assert list(iter_json_list_items([b'[1, "a", ', b"null, [2]]"])) == [1, "a", None, [2]]
+
+
+@pytest.mark.parametrize(
+    "raw", [b"[1 2]", b"[1,]", b'{"results" [1]}', b'{"count": 1 "results": []}', b"[1] 2"]
+)
+def test_list_items_of_malformed_page_raise(raw: bytes):
+    with pytest.raises(ValueError):
+        list(iter_json_list_items([raw]))
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from pyhive.client import HiveClient
+from pyhive.src.instrumentation import endpoint_template
+from pyhive.src.metrics import MetricsRegistry
+from pyhive.testing import FakeHive
+
+
+def test_endpoint_template_collapses_ids():
+    assert (
+        endpoint_template("https://hive.org/api/core/help/12/responses/7/?x=1")
+        == "/api/core/help/{id}/responses/{id}/"
+    )
+
+
+def test_metrics_registry_records_requests(client: HiveClient, tmp_path: Path):
+    metrics = MetricsRegistry()
+    client.add_request_observer(metrics)
+    try:
+        users = list(client.get_users())
+        client.get_user(users[0].id)
+    finally:
+        client.remove_request_observer(metrics)
+
+    snapshot = metrics.snapshot()
+    endpoints = {r["endpoint"]: r for r in snapshot["requests"]}
+    assert endpoints["/api/core/management/users/{id}/"]["count"] == 1
+    assert endpoints["/api/core/management/users/"]["bytes_in"] > 0
+    assert snapshot["parses"]["User"]["count"] == len(users)
+
+    path = tmp_path / "pyhive.prom"
+    metrics.write_prometheus(path)
+    assert 'endpoint="/api/core/management/users/{id}/"' in path.read_text()
+
+
+def test_token_refreshes_are_recorded_per_endpoint():
+    fake = FakeHive()
+    fake.add("programs", {"name": "Program"})
+    client = fake.client()
+    metrics = MetricsRegistry()
+    client.add_request_observer(metrics)
+    fake.expire_tokens()
+    client.get_program(1)
+    fake.expire_tokens()
+    list(client.get_programs())
+
+    snapshot = metrics.snapshot()
+    assert snapshot["token_refreshes"] == 2
+    assert snapshot["token_refreshes_by_endpoint"] == {
+        "/api/core/course/programs/": 1,
+        "/api/core/course/programs/{id}/": 1,
+    }
+    assert (
+        'pyhive_token_refreshes_total{endpoint="/api/core/course/programs/{id}/"} 1'
+        in metrics.to_prometheus()
+    )
+
+
+def test_single_object_getters_record_parse_times():
+    fake = FakeHive()
+    fake.add("programs", {"name": "Program"})
+    client = fake.client()
+    metrics = MetricsRegistry()
+    client.add_request_observer(metrics)
+    client.get_program(1)
+    list(client.get_programs())
+
+    assert metrics.snapshot()["parses"]["Program"]["count"] == 2
@@ -0,0 +1,41 @@
+import pytest
+
+from pyhive.client import HiveClient
+from pyhive.client.n_plus_one import NPlusOneError, NPlusOneWarning
+from pyhive.testing import FakeHive
+from pyhive.types import Program
+
+
+def test_lazy_property_in_loop_warns(client: HiveClient, large_program: Program):
+    users = list(client.get_users(program__id__in=[large_program.id]))
+    assert len(users) > 2
+    with pytest.warns(NPlusOneWarning, match="User.program"):
+        with client.detect_n_plus_one(threshold=2) as detector:
+            for user in users:
+                assert user.program is not None
+    assert detector.findings()[0].count == len(users)
+    assert "get_programs" in detector.findings()[0].suggestion
+
+
+def test_lazy_property_in_loop_raises(client: HiveClient, large_program: Program):
+    users = list(client.get_users(program__id__in=[large_program.id]))
+    with pytest.raises(NPlusOneError):
+        with client.detect_n_plus_one(threshold=1, action="raise"):
+            for user in users:
+                _ = user.program
+
+
+def test_raise_stops_the_fetch_before_it_is_sent():
+    fake = FakeHive()
+    fake.add_many("programs", [{"name": f"Program {i}"} for i in range(3)])
+    fake.add_many(
+        "users", [{"username": f"u{i}", "clearance": 1, "program": i + 1} for i in range(3)]
+    )
+    client = fake.client()
+    users = list(client.get_users())
+    with pytest.raises(NPlusOneError, match="User.program would fetch more than 2"):
+        with client.detect_n_plus_one(threshold=2, action="raise") as detector:
+            for user in users:
+                _ = user.program
+    assert fake.request_counts[("GET", "/api/core/course/programs/{id}/")] == 2
+    assert detector.findings() == []
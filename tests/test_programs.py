@@ -3,7 +3,9 @@ import time
 import pytest
 from httpx import HTTPStatusError
 
+from pyhive.client import HiveClient
 from pyhive.src.types.program import Program
+from tests.common import get_client_params
 
 
 def test_get_programs(client):
@@ -67,3 +69,24 @@ def test_create_and_delete_program(client, delete_method):
 
     # Ensure no longer listed
     assert not list(client.get_programs(program_name=name))
+
+
+def test_cached_programs_are_reused():
+    with HiveClient(**get_client_params(), cache_soft_ttl=60) as client:
+        first = list(client.get_programs())
+        second = list(client.get_programs())
+        assert len(first) == len(second)
+        assert all(a is b for a, b in zip(first, second)), "Expected cached objects"
+
+        client.clear_reference_cache()
+        third = list(client.get_programs())
+        assert all(a is not b for a, b in zip(first, third))
+
+
+def test_stale_programs_are_served_while_refreshing():
+    with HiveClient(
+        **get_client_params(), cache_soft_ttl=0, cache_hard_ttl=60
+    ) as client:
+        first = list(client.get_programs())
+        stale = list(client.get_programs())
+        assert all(a is b for a, b in zip(first, stale)), "Expected the stale value"
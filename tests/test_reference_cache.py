@@ -0,0 +1,65 @@
+import threading
+
+from pyhive.client.reference_cache import ReferenceCache
+from pyhive.testing import FakeHive
+
+KEY = ("get_users", (), ())
+
+
+def join_refreshes() -> None:
+    for thread in threading.enumerate():
+        if thread.name == "pyhive-cache-refresh":
+            thread.join()
+
+
+def test_refresh_started_before_invalidate_is_not_stored():
+    now = [0.0]
+    cache = ReferenceCache(soft_ttl=10, clock=lambda: now[0])
+    cache.put(KEY, ["old"])
+    now[0] = 15.0
+    release = threading.Event()
+
+    def slow_loader() -> list[str]:
+        release.wait()
+        return ["before write"]
+
+    assert cache.get(KEY, slow_loader) == ["old"]  # Stale: refreshed in the background
+    cache.invalidate("get_users")  # A write lands while the refresh is in flight
+    release.set()
+    join_refreshes()
+    assert cache.get(KEY, lambda: ["after write"]) == ["after write"]
+
+
+def test_loaded_entries_are_stamped_with_the_load_start():
+    now = [0.0]
+    cache = ReferenceCache(soft_ttl=10, clock=lambda: now[0])
+
+    def loader() -> list[str]:
+        now[0] += 8.0  # A slow load
+        return ["value"]
+
+    cache.get(KEY, loader)
+    assert [fetched_at for *_, fetched_at in cache.items()] == [0.0]
+
+
+def test_parent_writes_drop_dependent_listings():
+    fake = FakeHive()
+    program = fake.add("programs", {"name": "Program"})
+    subject = fake.add(
+        "subjects", {"name": "Subject", "symbol": "S", "parent_program": program["id"]}
+    )
+    module = fake.add("modules", {"name": "Module", "parent_subject": subject["id"]})
+    fake.add("exercises", {"name": "Exercise", "parent_module": module["id"]})
+    client = fake.client(cache_soft_ttl=60)
+    for method in ("get_programs", "get_subjects", "get_modules", "get_exercises"):
+        list(getattr(client, method)())
+    fake.request_counts.clear()
+
+    client.delete_program(program["id"])
+    for method, path in (
+        ("get_subjects", "/api/core/course/subjects/"),
+        ("get_modules", "/api/core/course/modules/"),
+        ("get_exercises", "/api/core/course/exercises/"),
+    ):
+        list(getattr(client, method)())
+        assert fake.request_counts[("GET", path)] == 1  # Refetched, not served from cache
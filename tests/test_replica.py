@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from pyhive.client import HiveClient
+from pyhive.replica import HiveReplica
+from pyhive.types import Program, User
+
+
+def test_replica_sync_and_query(client: HiveClient, tmp_path: Path):
+    with HiveReplica(client, tmp_path / "hive.sqlite3") as replica:
+        stats = {s.resource: s for s in replica.sync(["programs", "users"])}
+        assert stats["programs"].fetched == stats["programs"].inserted
+
+        programs = list(replica.get_programs())
+        assert len(programs) == stats["programs"].fetched
+        assert all(isinstance(p, Program) for p in programs)
+
+        user = next(iter(client.get_users()))
+        replicated = replica.get_user(user.id)
+        assert isinstance(replicated, User)
+        assert replicated.to_dict() == user.to_dict()
+        assert [u.id for u in replica.get_users(username=user.username)] == [user.id]
+
+
+def test_replica_resync_only_writes_changes(client: HiveClient, tmp_path: Path):
+    with HiveReplica(client, tmp_path / "hive.sqlite3") as replica:
+        replica.sync(["programs"])
+        (stats,) = replica.sync(["programs"])
+        assert stats.inserted == stats.updated == stats.deleted == 0
+        assert replica.last_synced("programs") is not None
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from pyhive.client import HiveClient
+from pyhive.testing import FakeHive
+from tests.common import get_client_params
+
+
+def test_snapshot_round_trip(client: HiveClient, tmp_path: Path):
+    path = tmp_path / "hive.snapshot"
+    client.save_snapshot(path)
+
+    params = get_client_params()
+    with HiveClient.from_snapshot(
+        path, params["username"], params["password"], verify=params["verify"]
+    ) as warm:
+        assert warm.hive_url == client.hive_url
+        users = list(warm.get_users())
+        assert [u.to_dict() for u in users] == [u.to_dict() for u in client.get_users()]
+        assert all(u.hive_client is warm for u in users)
+        assert list(warm.get_users()) == users
+        assert [q.id for q in warm.get_queues()] == [q.id for q in client.get_queues()]
+
+
+def test_snapshot_rejects_other_files(tmp_path: Path):
+    path = tmp_path / "not-a-snapshot"
+    path.write_bytes(b"garbage")
+    params = get_client_params()
+    with pytest.raises(ValueError):
+        HiveClient.from_snapshot(path, params["username"], params["password"])
+
+
+def test_snapshot_loads_offline(tmp_path: Path):
+    fake = FakeHive()
+    fake.add("programs", {"name": "Program"})
+    fake.add_many("queues", [{"name": "Queue A"}, {"name": "Queue B"}])
+    client = fake.client(cache_soft_ttl=60)
+    queues = [q.name for q in client.get_queues()]
+    path = tmp_path / "hive.snapshot"
+    client.save_snapshot(path)
+
+    warm = HiveClient.from_snapshot(
+        path, fake.username, "admin", transport=fake.transport, skip_version_check=True
+    )
+    path.unlink()  # Blocks were read while loading
+    fake.add("queues", {"name": "Queue C"})
+    assert [q.name for q in warm.get_queues()] == queues
@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+from pyhive.client import HiveClient
+from pyhive.types import Program
+
+
+def test_trace_links_method_request_and_attempt(client: HiveClient, program: Program):
+    with client.trace() as tracer:
+        client.get_program(program.id)
+    method, request, attempt = tracer.spans()
+    assert method.name == "get_program" and method.parent_id is None
+    assert request.name == "GET /api/core/course/programs/{id}/"
+    assert request.parent_id == method.span_id
+    assert attempt.parent_id == request.span_id
+    assert attempt.attributes["status_code"] == 200
+    assert attempt.attributes["bytes_in"] > 0
+
+
+def test_trace_generator_span_covers_iteration(client: HiveClient):
+    with client.trace() as tracer:
+        users = client.get_users()
+        next(iter(users))
+    spans = tracer.spans()
+    assert spans[0].name == "get_users"
+    assert all(span.parent_id is not None for span in spans[1:])
+
+
+def test_trace_export(client: HiveClient, program: Program, tmp_path: Path):
+    with client.trace(tmp_path / "trace.json"):
+        client.get_program(program.id)
+    with client.trace(tmp_path / "trace.jsonl"):
+        client.get_program(program.id)
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {event["ph"] for event in events} == {"X"}
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines][0] == "get_program"
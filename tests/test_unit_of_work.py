@@ -0,0 +1,124 @@
+import json
+
+import httpx
+import pytest
+
+from pyhive.testing import FakeHive
+from pyhive.types import ClearanceEnum
+
+
+@pytest.fixture
+def fake() -> FakeHive:
+    fake = FakeHive()
+    program = fake.add("programs", {"name": "Program"})
+    fake.add_many("queues", [{"name": "Queue A"}, {"name": "Queue B"}])
+    fake.add("classes", {"name": "Class", "program": program["id"]})
+    fake.add_many(
+        "users",
+        [
+            {"username": f"student{i}", "clearance": ClearanceEnum.HANICH, "program": 1}
+            for i in range(20)
+        ],
+    )
+    return fake
+
+
+def patches(cassette) -> dict[str, dict]:
+    return {
+        httpx.URL(i.url).path: json.loads(i.request_body)
+        for i in cassette.interactions
+        if i.method == "PATCH"
+    }
+
+
+def test_changes_are_coalesced_per_object(fake: FakeHive):
+    client = fake.client()
+    users = list(client.get_users())
+    first = users[0]
+    again = client.get_user(first.id)  # A second instance of the same user
+    class_ = client.get_class(1)
+    with client.record() as cassette, client.unit_of_work(concurrency=4) as uow:
+        for user in users:
+            uow.set_users_queue(user, 1)
+        first.first_name = "Ada"  # Collected by assignment
+        again.last_name = "Lovelace"
+        uow.set_users_mentor(first.id, users[1])  # By id only
+        class_.name = "Renamed"
+        assert len(uow) == 21
+
+    sent = patches(cassette)
+    assert len(sent) == 21
+    assert sent[f"/api/core/management/users/{first.id}/"] == {
+        "mentor": users[1].id,
+        "queue": 1,
+        "first_name": "Ada",
+        "last_name": "Lovelace",
+    }
+    assert sent["/api/core/management/classes/1/"] == {"name": "Renamed"}
+    assert uow.report.counts() == {"saved": 21}
+    assert uow.report.ok
+    assert first.dirty_fields == again.dirty_fields == frozenset()
+    assert all(fake.get("users", user.id)["queue"] == 1 for user in users)
+    assert client.get_class(1).name == "Renamed"
+
+
+def test_failures_are_reported_per_object(fake: FakeHive):
+    client = fake.client()
+    user, other = client.get_user(1), client.get_user(2)
+    with client.unit_of_work(concurrency=1) as uow:
+        uow.set_users_queue(user, 1)
+        uow.set_users_queue(other, 2)
+        uow.set_users_queue(999, 1)  # No such user
+        uow.add(client.get_user(3))  # Nothing changed
+    assert [(r.id, r.status) for r in uow.report.results] == [
+        (1, "saved"),
+        (2, "saved"),
+        (999, "failed"),
+        (3, "unchanged"),
+    ]
+    assert "user 999" in str(uow.report)
+
+
+def test_nothing_is_sent_when_the_block_raises(fake: FakeHive):
+    client = fake.client()
+    user = client.get_user(1)
+    with pytest.raises(RuntimeError):
+        with client.unit_of_work() as uow:
+            user.queue_id = 2
+            raise RuntimeError
+    assert uow.report is None
+    assert fake.get("users", 1).get("queue") != 2
+    assert user.dirty_fields == {"queue_id"}
+    user.queue_id = 1  # Outside the block: not collected
+    assert len(uow) == 1
+
+
+def test_objects_saved_directly_are_not_reported(fake: FakeHive):
+    client = fake.client()
+    user, other = client.get_user(1), client.get_user(2)
+    with client.unit_of_work() as uow:
+        user.first_name = "Ada"
+        user.save()  # Sent at once: nothing left for the unit of work
+        client.set_users_queue(other, 1)
+    assert uow.report.results == []
+
+
+def test_unexpected_errors_are_reported_per_object(fake: FakeHive, monkeypatch):
+    client = fake.client()
+    patch = client.patch
+
+    def flaky_patch(endpoint, data, *args, **kwargs):
+        if endpoint.endswith("/2/"):
+            raise RuntimeError("boom")
+        return patch(endpoint, data, *args, **kwargs)
+
+    monkeypatch.setattr(client, "patch", flaky_patch)
+    with client.unit_of_work(concurrency=1) as uow:
+        for user_id in (1, 2, 3):
+            uow.set_users_queue(user_id, 1)
+    assert [(r.id, r.status) for r in uow.report.results] == [
+        (1, "saved"),
+        (2, "failed"),
+        (3, "saved"),
+    ]
+    assert "user 2: boom" in str(uow.report)